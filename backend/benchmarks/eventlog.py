@@ -0,0 +1,89 @@
+# benchmarks/eventlog.py
+"""
+이벤트 로그 기록/복구/replay 처리량 (events/s).
+
+방 여러 개에서 game_1 판을 진행하며 action + 상태 패치를 기록한 뒤
+1. 시작 시 복구처럼 전체 로그를 mmap으로 읽어 살아 있는 방을 모두 복원하고
+2. 방 하나를 임의의 seq까지 스냅샷부터 다시 만듭니다.
+
+실행: cd backend && python -m benchmarks.eventlog [--rooms 500] [--hands 40]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from eventlog import ACTION, CREATED, STATE, EventLog
+from games.game_1.logic import handle_action, initialize_game, next_round, reveal_winner
+
+
+def write_log(log: EventLog, rooms: int, hands: int) -> int:
+    tables = {}
+    for index in range(rooms):
+        room_id = f"room-{index}"
+        table = tables[room_id] = initialize_game(["a", "b"])
+        log.record_state(room_id, CREATED, {"room_id": room_id, "status": "playing", "game_state": table.to_dict()})
+
+    for _ in range(hands):
+        for room_id, table in tables.items():
+            first = table.current_turn
+            for seat, action, bet in ((first, "bet", 1), (1 - first, "call", 0), (None, "reveal", 0), (None, "next_round", 0)):
+                if action == "reveal":
+                    reveal_winner(table)
+                elif action == "next_round":
+                    if min(s.chips for s in table.seats) < 2:
+                        for s in table.seats:
+                            s.chips = 30
+                    next_round(table)
+                else:
+                    handle_action(table, seat, action, bet)
+                log.append(room_id, ACTION, {"seat": seat, "action": action, "amount": bet})
+                log.record_state(room_id, STATE, {"room_id": room_id, "status": "playing", "game_state": table.to_dict()})
+        log.flush()
+    return sum(shard.seq for shard in log.shards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--hands", type=int, default=40)
+    parser.add_argument("--replays", type=int, default=200)
+    args = parser.parse_args()
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        log = EventLog(workdir)
+        log.open()
+        started = time.perf_counter()
+        events = write_log(log, args.rooms, args.hands)
+        written = time.perf_counter() - started
+        size = sum(shard.size for shard in log.shards)
+        for shard in log.shards:
+            shard.buffer.clear()
+        asyncio.run(log.close())  # 디렉터리 락을 놓아야 복구하는 로그가 같은 디렉터리를 읽음
+
+        recovered_log = EventLog(workdir)
+        started = time.perf_counter()
+        live = recovered_log.open()
+        recovery = time.perf_counter() - started
+        assert len(live) == args.rooms
+
+        # 임의의 방을 임의의 seq까지 replay
+        started = time.perf_counter()
+        replayed = 0
+        for _ in range(args.replays):
+            room_id = f"room-{random.randrange(args.rooms)}"
+            shard = recovered_log.shard_of(room_id)
+            state, _ = recovered_log.replay(room_id, random.randint(1, shard.seq))
+            replayed += 1
+        replay = time.perf_counter() - started
+
+        print(f"{events} events, {size / events:.0f} bytes/event on disk")
+        print(f"record (game logic + diff + encode): {events / written:10.0f} events/s")
+        print(f"startup recovery (all rooms):        {events / recovery:10.0f} events/s ({recovery * 1000:.0f} ms)")
+        print(f"point-in-time replay of one room:    {replay / replayed * 1000:10.2f} ms/replay")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/game_registry.py
+"""
+게임 수가 늘어날 때 서버 시작 시간과 메모리(RSS): 지연 로딩(games/registry.py) vs 시작할 때 모두 import.
+
+games/game_1을 N개 복사해 game_type/prefix만 바꾼 가짜 게임 패키지를 임시 디렉터리에 만들고,
+매번 새 프로세스에서 main을 import 합니다.
+- lazy: 선언만 하고 시작 (게임은 첫 방 생성 때 로드 → 첫 로드 시간도 함께 측정)
+- eager: 예전 main.py처럼 시작할 때 모든 게임 패키지를 import하고 승률 표를 미리 계산
+
+실행: cd backend && python -m benchmarks.game_registry [--games 1 5 20]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+from games.registry import declare_game, get_game
+for index in range({games}):
+    declare_game(f"bench-{{index}}", f"bench_games.game_{{index}}", prefix=f"/bench_{{index}}")
+if "{mode}" == "eager":
+    for index in range({games}):
+        get_game(f"bench-{{index}}").warmup()
+startup = time.perf_counter() - started
+first = time.perf_counter()
+get_game("bench-0")
+first_load = time.perf_counter() - first
+print(json.dumps({{
+    "startup": startup,
+    "first_load": first_load,
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def make_games(directory: str, games: int):
+    package = os.path.join(directory, "bench_games")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    source = os.path.join(BACKEND, "games", "game_1")
+    for index in range(games):
+        target = os.path.join(package, f"game_{index}")
+        shutil.copytree(source, target, ignore=shutil.ignore_patterns("__pycache__"))
+        init = os.path.join(target, "__init__.py")
+        with open(init) as file:
+            code = file.read()
+        code = code.replace('"indian-poker"', f'"bench-{index}"').replace('"/game_1"', f'"/bench_{index}"')
+        with open(init, "w") as file:
+            file.write(code)
+
+
+def run(directory: str, games: int, mode: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([BACKEND, directory]), EVENT_LOG_DIR=os.path.join(directory, "eventlog"))
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(games=games, mode=mode)],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        make_games(directory, max(args.games))
+        for games in args.games:
+            for mode in ("lazy", "eager"):
+                result = run(directory, games, mode)
+                print(
+                    f"{games:3} games {mode:5}: startup {result['startup'] * 1000:7.1f} ms  "
+                    f"RSS {result['rss'] / 1024:6.1f} MiB  modules {result['modules']:5}  "
+                    f"first room load {result['first_load'] * 1000:6.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
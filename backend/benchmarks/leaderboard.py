@@ -0,0 +1,58 @@
+# benchmarks/leaderboard.py
+"""
+리더보드 조회/갱신 비용: 증분 정렬 인덱스(leaderboard/index.py) vs 조회마다 전체 플레이어를 정렬.
+
+실행: cd backend && python -m benchmarks.leaderboard [--players 100000 --top 10]
+"""
+import argparse
+import heapq
+import random
+import time
+
+from leaderboard.index import LeaderboardIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--hands", type=int, default=200_000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    names = [f"player-{index}" for index in range(args.players)]
+
+    index = LeaderboardIndex()
+    index.load((name, 0, 0, 0) for name in names)
+    settlements = []
+    for _ in range(args.hands):
+        winner, loser = rng.sample(names, 2)
+        amount = rng.randint(1, 30)
+        settlements.append((winner, loser, amount))
+
+    started = time.perf_counter()
+    for winner, loser, amount in settlements:
+        index.record(winner, amount, True)
+        index.record(loser, -amount, False)
+    update = (time.perf_counter() - started) / args.hands * 1e6
+
+    started = time.perf_counter()
+    for _ in range(args.reads):
+        top = index.top(args.top)
+    indexed = (time.perf_counter() - started) / args.reads * 1e6
+
+    stats = list(index.players.values())
+    started = time.perf_counter()
+    for _ in range(args.reads // 10 or 1):
+        scanned = heapq.nsmallest(args.top, stats, key=lambda player: (-player.net, player.player_name))
+    scan = (time.perf_counter() - started) / (args.reads // 10 or 1) * 1e6
+
+    assert [row["player_name"] for row in top] == [player.player_name for player in scanned]
+    print(f"{args.players} players, {args.hands} settled hands")
+    print(f"settlement update (2 players): {update:8.2f} us")
+    print(f"top {args.top} from index:        {indexed:8.2f} us")
+    print(f"top {args.top} by full scan:      {scan:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# benchmarks/loadtest.py
+"""
+로컬 WebSocket 부하 테스트.
+
+uvicorn 서버를 하위 프로세스로(또는 --in-process 로 같은 이벤트 루프에서) 띄운 뒤
+1. 방을 만들고 (rooms/sec)
+2. 두 번째 플레이어가 참여하고 (join 지연)
+3. 방마다 구독자 여러 명이 /room/{room_id}/ws 에 붙고
+4. 플레이어가 방 WebSocket으로 game_1 행동을 보내면, 모든 구독자에게 patch가 도착할 때까지의
+   지연(broadcast delivery p50/p95/p99)을 잽니다.
+결과는 JSON으로 출력/저장하므로 rooms/routes.py 변경 전후를 비교할 수 있습니다.
+
+실행: cd backend && python -m benchmarks.loadtest [--rooms 200] [--subscribers 4] [--output result.json]
+(httpx, websockets 필요)
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+import websockets
+
+HOST = "127.0.0.1"
+# 한 판: 선 bet → 후 raise → 선 fold → 다음 판 (모든 행동이 상태를 바꿔 patch가 나감)
+# 판마다 선 플레이어가 바뀜 (logic.next_round)
+HAND = [("first", "bet", 1), ("second", "bet", 1), ("first", "fold", 0), ("first", "next_round", 0)]
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(pct):
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(pick(50), 3),
+        "p95_ms": round(pick(95), 3),
+        "p99_ms": round(pick(99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+class RoomProbe:
+    """
+    한 방의 구독자들과, 마지막 행동을 보낸 시각 / 도착한 구독자 수
+    """
+    def __init__(self, room_id: str, subscribers: int):
+        self.room_id = room_id
+        self.expected = subscribers
+        self.sockets = []
+        self.sent_at = 0.0
+        self.arrived = 0
+        self.errors = 0
+        self.done = asyncio.Event()
+
+    def arm(self):
+        self.arrived = 0
+        self.done.clear()
+        self.sent_at = time.perf_counter()
+
+    def on_patch(self, latencies):
+        latencies.append((time.perf_counter() - self.sent_at) * 1000)
+        self.arrived += 1
+        if self.arrived >= self.expected:
+            self.done.set()
+
+
+async def subscribe(probe: RoomProbe, ws_base: str, latencies, ready: asyncio.Event):
+    async with websockets.connect(f"{ws_base}/room/{probe.room_id}/ws", max_queue=None) as socket:
+        probe.sockets.append(socket)
+        await socket.recv()  # 처음 받는 snapshot
+        if len(probe.sockets) == probe.expected:
+            ready.set()
+        async for raw in socket:
+            message = json.loads(raw)
+            if message.get("type") == "patch":
+                probe.on_patch(latencies)
+            elif message.get("type") == "error":
+                probe.errors += 1  # 거절된 행동은 브로드캐스트가 없으므로 기다리지 않음
+                probe.done.set()
+            elif message.get("type") == "room_deleted":
+                return
+
+
+async def run_load(base: str, args) -> dict:
+    ws_base = base.replace("http://", "ws://")
+    limits = httpx.Limits(max_connections=args.concurrency)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    run_id = uuid.uuid4().hex[:6]
+    room_ids = [f"load-{run_id}-{index}" for index in range(args.rooms)]
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+        async def limited(coro):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await coro
+                response.raise_for_status()
+                return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            limited(client.post("/room/", json={"room_id": room_id, "game_type": "indian-poker", "player_name": "host"}))
+            for room_id in room_ids
+        ))
+        create_elapsed = time.perf_counter() - started
+
+        join_latency = await asyncio.gather(*(
+            limited(client.post(f"/room/{room_id}/join", json={"player_name": "guest"}))
+            for room_id in room_ids
+        ))
+
+        latencies = []
+        probes = [RoomProbe(room_id, args.subscribers) for room_id in room_ids]
+        readiness = [asyncio.Event() for _ in probes]
+        subscriber_tasks = [
+            asyncio.create_task(subscribe(probe, ws_base, latencies, ready))
+            for probe, ready in zip(probes, readiness)
+            for _ in range(args.subscribers)
+        ]
+        started = time.perf_counter()
+        await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in readiness)), timeout=120)
+        connect_elapsed = time.perf_counter() - started
+
+        timeouts = 0
+
+        async def drive(probe: RoomProbe):
+            nonlocal timeouts
+            sender = probe.sockets[0]
+            for hand in range(args.hands):
+                seats = {"first": "host", "second": "guest"} if hand % 2 == 0 else {"first": "guest", "second": "host"}
+                for role, action, amount in HAND:
+                    player = seats[role]
+                    probe.arm()
+                    await sender.send(json.dumps({"type": "action", "player": player, "action": action, "amount": amount}))
+                    try:
+                        await asyncio.wait_for(probe.done.wait(), timeout=args.timeout)
+                    except asyncio.TimeoutError:
+                        timeouts += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(probe) for probe in probes))
+        drive_elapsed = time.perf_counter() - started
+
+        await asyncio.gather(*(limited(client.delete(f"/room/{room_id}")) for room_id in room_ids))
+        await asyncio.wait(subscriber_tasks, timeout=10)
+        for task in subscriber_tasks:
+            task.cancel()
+
+    actions = args.rooms * args.hands * len(HAND)
+    return {
+        "config": {
+            "rooms": args.rooms, "subscribers_per_room": args.subscribers, "hands": args.hands,
+            "concurrency": args.concurrency, "sockets": args.rooms * args.subscribers,
+        },
+        "rooms_per_sec": round(args.rooms / create_elapsed, 1),
+        "join_latency": percentiles(join_latency),
+        "ws_connects_per_sec": round(args.rooms * args.subscribers / connect_elapsed, 1),
+        "actions_per_sec": round(actions / drive_elapsed, 1),
+        "broadcast_latency": percentiles(latencies),
+        "deliveries": len(latencies),
+        "expected_deliveries": actions * args.subscribers,
+        "rejected_actions": sum(probe.errors for probe in probes),
+        "timeouts": timeouts,
+    }
+
+
+def start_server(port: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{workdir}/load.db")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", HOST, "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/room/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run_in_process(port: int, args) -> dict:
+    import logging
+
+    import uvicorn
+
+    logging.disable(logging.CRITICAL)
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host=HOST, port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    base = f"http://{HOST}:{port}"
+    try:
+        await wait_ready(base)
+        return await run_load(base, args)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--subscribers", type=int, default=4, help="WebSocket clients per room")
+    parser.add_argument("--hands", type=int, default=2, help="hands played per room")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent HTTP requests")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds to wait for a broadcast")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--url", help="use an already running server instead of starting one")
+    parser.add_argument("--in-process", action="store_true", help="serve the app on this process's event loop")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args()
+
+    if args.url:
+        result = asyncio.run(run_load(args.url.rstrip("/"), args))
+    elif args.in_process:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/load.db"
+            result = asyncio.run(run_in_process(args.port, args))
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            server = start_server(args.port, workdir)
+            try:
+                base = f"http://{HOST}:{args.port}"
+                asyncio.run(wait_ready(base))
+                result = asyncio.run(run_load(base, args))
+            finally:
+                server.terminate()
+                server.wait()
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
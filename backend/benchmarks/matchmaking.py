@@ -0,0 +1,127 @@
+# benchmarks/matchmaking.py
+"""
+매칭 대기열(rooms/matchmaking.py) 처리량과 매칭 품질.
+
+1) 대기 인원 N명이 쌓인 상태에서 등록 1건 비용: 구간별 힙 vs 대기 목록 전체를 훑는 단순 구현
+2) 가상 시계로 초당 --rate명이 들어오는 상황을 --seconds초 동안 돌려 대기 시간과 칩 구간 차이 분포 확인
+   (범위 확장은 서버처럼 widen_interval마다 대기 표별로 다시 확인)
+
+실행: cd backend && python -m benchmarks.matchmaking [--rate 2000 --seconds 60]
+"""
+import argparse
+from collections import deque
+import random
+import statistics
+import time
+
+from rooms.matchmaking import MatchQueue
+
+GAME_TYPES = ["indian-poker", "game-b", "game-c"]
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class LinearQueue:
+    """
+    비교용: 대기 목록을 처음부터 훑어 허용 범위 안의 가장 오래 기다린 상대를 찾음
+    """
+    def __init__(self, bracket_size=10, widen_interval=5.0, max_widen=3, clock=time.monotonic):
+        self.bracket_size = bracket_size
+        self.widen_interval = widen_interval
+        self.max_widen = max_widen
+        self.clock = clock
+        self.waiting = []
+
+    def enqueue(self, player_name, game_type, chips):
+        now = self.clock()
+        bracket = chips // self.bracket_size
+        for index, (name, waiting_type, waiting_bracket, enqueued) in enumerate(self.waiting):
+            widen = min(self.max_widen, int((now - enqueued) / self.widen_interval))
+            if waiting_type == game_type and abs(waiting_bracket - bracket) <= widen:
+                del self.waiting[index]
+                return name
+        self.waiting.append((player_name, game_type, bracket, now))
+        return None
+
+
+def chips_sample(rng: random.Random) -> int:
+    return int(rng.lognormvariate(4, 1))  # 대부분 수십~수백 칩, 가끔 큰 스택
+
+
+def bench_enqueue(factory, standing: int, operations: int) -> float:
+    rng = random.Random(1)
+    clock = VirtualClock()
+    queue = factory(clock)
+    # 서로 매칭되지 않도록 구간을 띄워 대기 인원을 채움
+    for index in range(standing):
+        queue.enqueue(f"standing-{index}", rng.choice(GAME_TYPES), index * queue.bracket_size * (queue.max_widen + 1) * 2)
+    names = [f"player-{index}" for index in range(operations)]
+    started = time.perf_counter()
+    for name in names:
+        queue.enqueue(name, rng.choice(GAME_TYPES), chips_sample(rng))
+    return (time.perf_counter() - started) / operations * 1e6
+
+
+def simulate(rate: float, seconds: float):
+    rng = random.Random(2)
+    clock = VirtualClock()
+    queue = MatchQueue(clock=clock)
+    pending = deque()  # (다음 확인 시각, 표), 확장 간격이 일정해 들어온 순서 = 만료 순서
+    waits, gaps = [], []
+    arrivals = 0
+    started = time.perf_counter()
+    while clock.now < seconds:
+        clock.now += rng.expovariate(rate)
+        arrivals += 1
+        ticket, partner = queue.enqueue(f"player-{arrivals}", rng.choice(GAME_TYPES), chips_sample(rng))
+        if partner is not None:
+            waits.append(clock.now - partner.enqueued)
+            gaps.append(abs(ticket.bracket - partner.bracket))
+        else:
+            pending.append((clock.now + queue.widen_interval, ticket))
+        # 확장 타이머 (앞에서부터 만료된 것만)
+        while pending and pending[0][0] <= clock.now:
+            _, waiting = pending.popleft()
+            partner = queue.rematch(waiting)
+            if partner is not None:
+                waits.append(clock.now - min(waiting.enqueued, partner.enqueued))
+                gaps.append(abs(waiting.bracket - partner.bracket))
+            elif waiting.player_name in queue.waiting and queue.widen(waiting, clock.now) < queue.max_widen:
+                pending.append((clock.now + queue.widen_interval, waiting))
+    elapsed = time.perf_counter() - started
+    return arrivals, elapsed, waits, gaps, len(queue)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=2000, help="초당 매칭 요청 수")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--operations", type=int, default=5000)
+    args = parser.parse_args()
+
+    for standing in (100, 1000, 10000):
+        heap = bench_enqueue(lambda clock: MatchQueue(clock=clock), standing, args.operations)
+        linear = bench_enqueue(lambda clock: LinearQueue(clock=clock), standing, args.operations)
+        print(f"{standing:6} waiting: heap {heap:7.2f} us/enqueue   linear scan {linear:9.2f} us/enqueue")
+
+    arrivals, elapsed, waits, gaps, left = simulate(args.rate, args.seconds)
+    waits.sort()
+    print(
+        f"simulated {arrivals} arrivals ({args.rate:.0f}/s for {args.seconds:.0f}s) in {elapsed:.2f}s "
+        f"→ {arrivals / elapsed:,.0f} enqueues/s of queue CPU"
+    )
+    print(
+        f"matched {len(waits)} pairs, {left} still waiting; wait p50 {waits[len(waits) // 2]:.2f}s "
+        f"p95 {waits[int(len(waits) * 0.95)]:.2f}s max {waits[-1]:.2f}s; "
+        f"bracket gap mean {statistics.mean(gaps):.2f}, same bracket {gaps.count(0) / len(gaps):.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
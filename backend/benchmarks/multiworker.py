@@ -0,0 +1,146 @@
+# benchmarks/multiworker.py
+"""
+ROOM_STORE=sqlite 로 uvicorn 워커 수를 늘려가며 처리량을 측정합니다.
+
+각 워커 수마다 새 SQLite 파일로 서버를 띄우고, 여러 부하 프로세스가 방 생성/조회/참여를 반복합니다.
+마지막으로 한 방에 여러 WebSocket을 붙여(서로 다른 워커에 분산) 참여 알림이 모두에게 도착하는지 확인합니다.
+
+실행: cd backend && python -m benchmarks.multiworker [--workers 1 2 4] [--duration 5]
+(httpx, websockets 필요)
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+import websockets
+
+HOST = "127.0.0.1"
+
+
+def start_server(workers: int, port: int, workdir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        ROOM_STORE="sqlite",
+        DATABASE_URL=f"sqlite+aiosqlite:///{workdir}/bench.db",
+        ROOM_HUB_PATH=f"{workdir}/hub.sock",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", HOST, "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(port: int, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://{HOST}:{port}/room/").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def client_loop(base: str, duration: float, concurrency: int, reads_per_room: int) -> int:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+        deadline = time.monotonic() + duration
+        done = 0
+
+        async def worker():
+            nonlocal done
+            while time.monotonic() < deadline:
+                room_id = uuid.uuid4().hex[:12]
+                await client.post("/room/", json={"room_id": room_id, "game_type": "indian-poker", "player_name": "a"})
+                for _ in range(reads_per_room):
+                    await client.get(f"/room/{room_id}")
+                await client.post(f"/room/{room_id}/join", json={"player_name": "b"})
+                done += 2 + reads_per_room
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return done
+
+
+def load_process(base, duration, concurrency, reads_per_room, results):
+    results.put(asyncio.run(client_loop(base, duration, concurrency, reads_per_room)))
+
+
+async def check_fanout(port: int, sockets: int) -> int:
+    base = f"http://{HOST}:{port}"
+    room_id = uuid.uuid4().hex[:12]
+    async with httpx.AsyncClient(base_url=base) as client:
+        await client.post("/room/", json={"room_id": room_id, "game_type": "indian-poker", "player_name": "a"})
+        # 연결마다 새 TCP 소켓 → 커널이 워커들에 분산
+        conns = [await websockets.connect(f"ws://{HOST}:{port}/room/{room_id}/ws") for _ in range(sockets)]
+        for conn in conns:
+            await conn.recv()  # snapshot
+        await client.post(f"/room/{room_id}/join", json={"player_name": "b"})
+
+    async def receive(conn):
+        try:
+            message = json.loads(await asyncio.wait_for(conn.recv(), timeout=5))
+            return message.get("type") == "patch"
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            await conn.close()
+
+    return sum(await asyncio.gather(*(receive(conn) for conn in conns)))
+
+
+def run(workers: int, port: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(workers, port, workdir)
+        try:
+            wait_ready(port)
+            results = multiprocessing.Queue()
+            loaders = [
+                multiprocessing.Process(
+                    target=load_process,
+                    args=(f"http://{HOST}:{port}", args.duration, args.concurrency, args.reads, results),
+                )
+                for _ in range(args.load_processes)
+            ]
+            for loader in loaders:
+                loader.start()
+            ops = sum(results.get() for _ in loaders)
+            for loader in loaders:
+                loader.join()
+            delivered = asyncio.run(check_fanout(port, args.sockets))
+        finally:
+            server.terminate()
+            server.wait()
+    return {"workers": workers, "ops_per_sec": ops / args.duration, "fanout_delivered": delivered, "fanout_sockets": args.sockets}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--load-processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--reads", type=int, default=8, help="GET /room/{id} per created room")
+    parser.add_argument("--sockets", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        result = run(workers, args.port, args)
+        print(
+            f"workers={result['workers']}: {result['ops_per_sec']:8.1f} ops/s, "
+            f"cross-worker fan-out {result['fanout_delivered']}/{result['fanout_sockets']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
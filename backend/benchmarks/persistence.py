@@ -0,0 +1,58 @@
+# benchmarks/persistence.py
+"""
+게임 이벤트 저장 처리량: write-behind 배치 커밋 vs 이벤트마다 커밋.
+
+실행: cd backend && python -m benchmarks.persistence [--events 20000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+
+async def run(events: int, max_batch: int):
+    import database
+
+    await database.init_db()
+    rows = [
+        {"room_id": f"r{i % 100}", "game_round": i, "player_name": f"p{i % 2}", "delta": 1, "reason": "bench"}
+        for i in range(events)
+    ]
+
+    started = time.perf_counter()
+    for values in rows[: events // 10]:  # 이벤트마다 커밋은 느리므로 1/10만 측정
+        async with database.write_transaction() as conn:
+            await conn.execute(database.chip_ledger_table.insert(), [values])
+    per_event = (events // 10) / (time.perf_counter() - started)
+
+    writer = database.WriteBehindQueue(max_batch=max_batch)
+    await writer.start()
+    started = time.perf_counter()
+    for values in rows:
+        writer.submit(database.chip_ledger_table, values)
+        if writer.pending >= max_batch:
+            await asyncio.sleep(0)  # 요청 처리 사이사이에 writer가 돌 기회를 주는 상황을 흉내
+    await writer.close()
+    batched = writer.written / (time.perf_counter() - started)
+
+    await database.engine.dispose()
+    print(f"one commit per event: {per_event:10.0f} events/s")
+    print(f"write-behind batches: {batched:10.0f} events/s ({writer.batches} transactions, x{batched / per_event:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--max-batch", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as workdir:
+        # database 모듈을 import 하기 전에 임시 DB로 지정
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+        asyncio.run(run(args.events, args.max_batch))
+
+
+if __name__ == "__main__":
+    main()
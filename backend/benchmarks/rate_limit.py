@@ -0,0 +1,207 @@
+# benchmarks/rate_limit.py
+"""
+악성 클라이언트가 방 WebSocket으로 메시지를 쏟아낼 때 정상 방들의 행동 처리 지연.
+
+--rooms개의 정상 방에서 플레이어가 --interval초마다 행동을 보내고, 다른 방에 붙은 --flooders개의 연결은
+쉬지 않고 행동 메시지를 보냅니다(수신 버퍼에 쌓인 --chunk개를 한 번에 읽는 것처럼 그 사이 양보 없이).
+행동 하나는 엔진에서 --work초의 CPU를 쓴다고 보고, 보낸 시각부터 엔진이 받은 시각까지를 잽니다.
+- 제한 없음: 연결/플레이어 버킷을 무한대로
+- 에러 프레임만: 버킷은 켜고 연결은 끊지 않음
+- 기본 설정: WS_RATE_LIMIT_STRIKES번 연속 넘기면 1008로 종료
+
+실행: cd backend && python -m benchmarks.rate_limit [--rooms 200 --flooders 20 --seconds 3]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections import deque
+
+from fastapi import APIRouter
+
+from core import ratelimit
+from core.ratelimit import RateLimiter
+from games.registry import GamePlugin, register_game
+from rooms import routes
+
+GAME_TYPE = "stress"
+UNLIMITED = float("inf")
+
+
+class StressEngine:
+    """
+    행동마다 work초 동안 CPU를 쓰고, 정상 방의 행동은 보낸 시각과 비교해 지연을 기록
+    """
+    def __init__(self, work: float):
+        self.work = work
+        self.sent = {}  # room_id → 보낸 시각 큐
+        self.latencies = []
+        self.flood_actions = 0
+
+    def bind_rooms(self, publish, load, room_exists):
+        pass
+
+    def sync_table(self, room_id, state):
+        pass
+
+    async def submit_by_name(self, room_id, player_name, action, bet_amount=0):
+        deadline = time.perf_counter() + self.work
+        while time.perf_counter() < deadline:
+            pass
+        sent = self.sent.get(room_id)
+        if sent:
+            self.latencies.append(time.perf_counter() - sent.popleft())
+        else:
+            self.flood_actions += 1
+        return _Result()
+
+
+class _Result:
+    error = None
+
+
+class FakeSocket:
+    def __init__(self):
+        self.scope = {"subprotocols": []}
+        self.close_code = None
+        self.errors = 0
+        self.open = True
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+        self.open = False
+
+    async def send_text(self, message):
+        if '"error"' in message:
+            self.errors += 1
+
+    async def send_bytes(self, message):
+        pass
+
+    def disconnect(self):
+        return {"type": "websocket.disconnect", "code": 1000}
+
+
+class PlayerSocket(FakeSocket):
+    def __init__(self, engine, room_id, interval, stop):
+        super().__init__()
+        self.engine = engine
+        self.room_id = room_id
+        self.interval = interval
+        self.stop = stop
+        self.message = json.dumps({"type": "action", "player": "a", "action": "bet", "amount": 1})
+
+    async def receive(self):
+        await asyncio.sleep(self.interval)
+        if self.stop.is_set() or not self.open:
+            return self.disconnect()
+        self.engine.sent.setdefault(self.room_id, deque()).append(time.perf_counter())
+        return {"type": "websocket.receive", "text": self.message}
+
+
+class FloodSocket(FakeSocket):
+    def __init__(self, chunk, stop):
+        super().__init__()
+        self.chunk = chunk
+        self.stop = stop
+        self.sent = 0
+        self.message = json.dumps({"type": "action", "player": "a", "action": "bet", "amount": 1})
+
+    async def receive(self):
+        self.sent += 1
+        if self.sent % self.chunk == 0:
+            await asyncio.sleep(0)
+        if self.stop.is_set() or not self.open:
+            return self.disconnect()
+        return {"type": "websocket.receive", "text": self.message}
+
+
+def open_bench_room(room_id):
+    routes.update_room_state(room_id, {
+        "room_id": room_id,
+        "game_type": GAME_TYPE,
+        "players": [{"player_name": "a"}],
+        "game_started": True,
+        "game_state": {},
+        "status": "playing",
+    }, 1)
+
+
+async def run(name, args, engine, connection_rate, player_rate, strikes):
+    routes.connection_limits = RateLimiter(*connection_rate)
+    ratelimit.player_actions = RateLimiter(*player_rate)
+    routes.player_actions = ratelimit.player_actions
+    routes.WS_RATE_LIMIT_STRIKES = strikes
+    engine.sent.clear()
+    engine.latencies.clear()
+    engine.flood_actions = 0
+    stop = asyncio.Event()
+
+    tasks, players, flooders = [], [], []
+    for index in range(args.rooms):
+        room_id = f"{name}-room-{index}"
+        open_bench_room(room_id)
+        socket = PlayerSocket(engine, room_id, args.interval, stop)
+        players.append(socket)
+        tasks.append(asyncio.create_task(routes.room_websocket(socket, room_id)))
+    for index in range(args.flooders):
+        room_id = f"{name}-abuse-{index}"
+        open_bench_room(room_id)
+        socket = FloodSocket(args.chunk, stop)
+        flooders.append(socket)
+        tasks.append(asyncio.create_task(routes.room_websocket(socket, room_id)))
+
+    started = time.perf_counter()
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(engine.latencies)
+    expected = args.rooms * args.seconds / args.interval
+    closed = sum(1 for socket in flooders if socket.close_code == routes.RATE_LIMIT_CLOSE_CODE)
+    flooded = sum(socket.sent for socket in flooders)
+    print(
+        f"{name:12} good actions {len(latencies):6} (~{expected:.0f} sent) "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms p99 {latencies[int(len(latencies) * 0.99)] * 1000:8.2f} ms; "
+        f"good rejected {sum(socket.errors for socket in players)}; "
+        f"flood {flooded / elapsed:9,.0f} msg/s, {engine.flood_actions} reached engine, {closed}/{len(flooders)} closed with 1008"
+    )
+
+
+async def main_async(args):
+    logging.disable(logging.CRITICAL)
+    engine = StressEngine(args.work)
+    register_game(GamePlugin(GAME_TYPE, "/stress", APIRouter(), engine, lambda names: {}))
+    connection_rate = (routes.WS_MESSAGE_RATE, routes.WS_MESSAGE_BURST)
+    player_rate = (ratelimit.player_actions.rate, ratelimit.player_actions.burst)
+    strikes = routes.WS_RATE_LIMIT_STRIKES
+    flooders = args.flooders
+
+    args.flooders = 0
+    await run("no flood", args, engine, connection_rate, player_rate, strikes)
+    args.flooders = flooders
+    await run("unlimited", args, engine, (UNLIMITED, UNLIMITED), (UNLIMITED, UNLIMITED), 1 << 62)
+    await run("errors only", args, engine, connection_rate, player_rate, 1 << 62)
+    await run("limited", args, engine, connection_rate, player_rate, strikes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.25, help="정상 플레이어의 행동 간격(초)")
+    parser.add_argument("--flooders", type=int, default=20)
+    parser.add_argument("--chunk", type=int, default=100, help="악성 연결이 양보 없이 연달아 보내는 메시지 수")
+    parser.add_argument("--work", type=float, default=0.0001, help="행동 하나를 처리하는 엔진 CPU 시간(초)")
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/response_encoding.py
+"""
+방 응답 인코딩 비용: 예전 경로(dict 반환 → FastAPI jsonable_encoder → JSONResponse) vs
+core/models.py의 TypeAdapter.dump_json()으로 bytes를 바로 만드는 경로.
+
+- join/create 응답 (메시지 + 방 상태)
+- 로비 목록 한 페이지 (요약 100개)
+- GET /room/{id} 프레임 (버전마다 한 번: 예전 json.dumps vs dump_json)
+  + 캐시에 타입 모델을 넣을 때 버전마다 한 번 드는 검증 비용은 따로 출력
+
+실행: cd backend && python -m benchmarks.response_encoding [--repeat 20000]
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.models import ROOM, ROOM_RESPONSE, ROOM_SUMMARIES, RoomResponse
+from games.game_1.logic import initialize_game
+from rooms.lobby import room_summary
+from rooms.routes import validate_room
+
+
+def room_state(index: int):
+    names = [f"player-{index}-a", f"player-{index}-b"]
+    return {
+        "room_id": f"room-{index}",
+        "game_type": "indian-poker",
+        "players": [{"player_name": name} for name in names],
+        "game_started": True,
+        "game_state": initialize_game(names).to_dict(),
+        "status": "playing",
+    }
+
+
+def timed(repeat: int, function) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+    repeat = args.repeat
+
+    state = room_state(0)
+    room = validate_room(state)
+    summaries = [room_summary(ROOM.validate_python(room_state(index))) for index in range(100)]
+    assert json.loads(ROOM_RESPONSE.dump_json(RoomResponse("joined", room))) == {"message": "joined", "room": state}
+
+    cases = [
+        (
+            "join/create response",
+            lambda: JSONResponse(jsonable_encoder({"message": "joined", "room": state})).body,
+            lambda: ROOM_RESPONSE.dump_json(RoomResponse("joined", room)),
+        ),
+        (
+            "lobby page (100 rooms)",
+            lambda: JSONResponse(jsonable_encoder(summaries)).body,
+            lambda: ROOM_SUMMARIES.dump_json(summaries),
+        ),
+        (
+            "room frame per version",
+            lambda: json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            lambda: ROOM.dump_json(room),
+        ),
+    ]
+    for name, before, after in cases:
+        count = repeat // 10 if "lobby" in name else repeat
+        old, new = timed(count, before), timed(count, after)
+        print(f"{name:24} before {old:8.2f} us   after {new:8.2f} us   x{old / new:5.1f}")
+    print(f"{'validate per version':24} {timed(repeat, lambda: validate_room(state)):8.2f} us (update_room_state)")
+
+
+if __name__ == "__main__":
+    main()
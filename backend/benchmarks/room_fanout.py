@@ -0,0 +1,99 @@
+# benchmarks/room_fanout.py
+"""
+느린 클라이언트가 섞여 있어도 다른 방의 REST/브로드캐스트 지연이 일정한지 측정합니다.
+
+실행: cd backend && python -m benchmarks.room_fanout [--rooms 50] [--slow-rooms 5]
+(httpx 필요)
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from main import app
+from rooms import routes
+from rooms.codec import JSON_CODEC
+
+
+class FakeSocket:
+    """
+    send_text에 지정한 지연을 주는 가짜 WebSocket
+    """
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = 0
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    await coro
+    return (time.perf_counter() - started) * 1000
+
+
+async def run(rooms: int, slow_rooms: int, sockets_per_room: int, slow_delay: float):
+    logging.disable(logging.CRITICAL)
+    routes.SEND_TIMEOUT = 0.5
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for index in range(rooms):
+            await client.post("/room/", json={"room_id": f"r{index}", "game_type": "indian-poker", "player_name": "host"})
+            delay = slow_delay if index < slow_rooms else 0.0
+            for _ in range(sockets_per_room):
+                routes.register_client(f"r{index}", FakeSocket(delay), routes.player_view("host"), JSON_CODEC)
+
+        # 느린 방들의 브로드캐스트가 진행 중인 상태에서 나머지 방에 요청을 보냄
+        slow_broadcasts = [asyncio.create_task(routes.broadcast_room_state(f"r{i}")) for i in range(slow_rooms)]
+        await asyncio.sleep(0)
+
+        join_latency = await asyncio.gather(*(
+            timed(client.post(f"/room/r{index}/join", json={"player_name": "guest"}))
+            for index in range(slow_rooms, rooms)
+        ))
+        broadcast_latency = await asyncio.gather(*(
+            timed(routes.broadcast_room_state(f"r{index}"))
+            for index in range(slow_rooms, rooms)
+        ))
+        create_latency = await timed(client.post("/room/", json={"room_id": "late", "game_type": "indian-poker", "player_name": "host"}))
+        await asyncio.gather(*slow_broadcasts)
+        await asyncio.sleep(routes.SEND_TIMEOUT + 0.2)  # 느린 소켓의 writer가 제한 시간을 넘겨 제거될 때까지
+
+    evicted = sum(sockets_per_room - len(routes.connections.get(f"r{i}", [])) for i in range(slow_rooms))
+    print(f"rooms={rooms} slow_rooms={slow_rooms} sockets/room={sockets_per_room} slow_delay={slow_delay}s")
+    for name, samples in (("join", join_latency), ("broadcast", broadcast_latency)):
+        print(
+            f"{name:>9}: p50={statistics.median(samples):7.2f}ms "
+            f"p99={percentile(samples, 99):7.2f}ms max={max(samples):7.2f}ms"
+        )
+    print(f"   create: {create_latency:7.2f}ms")
+    print(f"  evicted: {evicted} slow sockets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--slow-rooms", type=int, default=5)
+    parser.add_argument("--sockets", type=int, default=20)
+    parser.add_argument("--slow-delay", type=float, default=30.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.rooms, args.slow_rooms, args.sockets, args.slow_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/simulator.py
+"""
+인디언 포커 시뮬레이터: NumPy 일괄 처리 vs 엔진 규칙을 한 판씩 호출하는 스칼라 루프의 초당 판 수,
+그리고 등록된 베팅 정책끼리의 판당 평균 손익 비교.
+
+실행: cd backend && python -m benchmarks.simulator [--hands 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from games.game_1.simulator import STRATEGIES, compare_strategies, simulate, simulate_scalar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--scalar-hands", type=int, default=50_000)
+    parser.add_argument("--first", default="equity", choices=sorted(STRATEGIES))
+    parser.add_argument("--second", default="threshold", choices=sorted(STRATEGIES))
+    args = parser.parse_args()
+
+    first, second = STRATEGIES[args.first](), STRATEGIES[args.second]()
+
+    started = time.perf_counter()
+    simulate_scalar(first, second, args.scalar_hands, seed=0)
+    scalar = args.scalar_hands / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    simulate(first, second, args.hands, rng=np.random.default_rng(0))
+    vectorized = args.hands / (time.perf_counter() - started)
+
+    print(f"{args.first} vs {args.second}")
+    print(f"  scalar loop: {scalar:12,.0f} hands/s")
+    print(f"  numpy batch: {vectorized:12,.0f} hands/s (x{vectorized / scalar:.0f})")
+
+    names = sorted(STRATEGIES)
+    matrix = compare_strategies(names, args.hands, seed=0)
+    print("\nEV per hand for the first player (rows) against the second (columns)")
+    print(" " * 12 + "".join(f"{name:>12}" for name in names))
+    for first_name in names:
+        print(f"{first_name:>12}" + "".join(f"{matrix[first_name][name]:12.3f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
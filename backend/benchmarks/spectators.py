@@ -0,0 +1,132 @@
+# benchmarks/spectators.py
+"""
+관전자가 많은 방 하나의 브로드캐스트 비용: 연결별 송신 큐(현재) vs 모든 소켓에 직접 전송을 기다리는 방식(예전 fan_out).
+
+관전자 N명 중 일부는 느린 소켓(전송마다 --slow-delay초)이고, 상태를 --updates번 바꾸며
+- broadcast_room_state() 한 번이 방 락을 잡고 있는 시간
+- 빠른 소켓이 마지막 상태를 받기까지 걸린 시간
+- 보기(플레이어/관전자)×코덱별 인코딩 횟수
+를 잽니다.
+
+실행: cd backend && python -m benchmarks.spectators [--spectators 100 1000 5000]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from rooms import routes
+from rooms.codec import JSON_CODEC, Outbound
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = 0
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class CountingCodec:
+    """
+    JSON 코덱과 같지만 인코딩 횟수를 셈
+    """
+    subprotocol = JSON_CODEC.subprotocol
+
+    def __init__(self):
+        self.encodes = 0
+
+    def encode(self, message):
+        self.encodes += 1
+        return JSON_CODEC.encode(message)
+
+
+async def run(spectators: int, slow: int, updates: int, slow_delay: float):
+    room_id = f"featured-{spectators}"
+    state = {
+        "room_id": room_id,
+        "game_type": "indian-poker",
+        "players": [{"player_name": "a"}, {"player_name": "b"}],
+        "game_started": True,
+        "game_state": {
+            "players": {"a": {"chips": 30, "card": 3}, "b": {"chips": 30, "card": 9}},
+            "current_turn": "a", "pot": 0, "round_completed": False, "game_round": 1, "winner": None,
+        },
+        "status": "playing",
+    }
+    routes.update_room_state(room_id, state, 1)
+    codec = CountingCodec()
+    fast = []
+    for index in range(spectators):
+        socket = FakeSocket(slow_delay if index < slow else 0.0)
+        routes.register_client(room_id, socket, routes.SPECTATOR, codec)
+        if index >= slow:
+            fast.append(socket)
+    for name in ("a", "b"):
+        routes.register_client(room_id, FakeSocket(), routes.player_view(name), codec)
+    await asyncio.sleep(0.01)
+
+    held = []
+    started = time.perf_counter()
+    for version in range(2, updates + 2):
+        state["game_state"]["pot"] = version
+        state["game_state"]["players"]["a"]["chips"] = 30 - version
+        routes.update_room_state(room_id, state, version)
+        begin = time.perf_counter()
+        await routes.broadcast_room_state(room_id)
+        held.append((time.perf_counter() - begin) * 1000)
+        await asyncio.sleep(0)
+    # 방 broadcaster도 같은 변경을 보내 받은 개수는 updates와 다를 수 있으므로, 빠른 연결의 큐가 빌 때까지
+    clients = [routes.client_connections[socket] for socket in fast]
+    while any(client.queue for client in clients):
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0)
+    delivered = (time.perf_counter() - started) * 1000
+    queued = await direct_fan_out(spectators, slow, slow_delay)
+
+    print(
+        f"{spectators:5} spectators ({slow} slow): broadcast holds lock p50 {statistics.median(held):6.3f} ms "
+        f"max {max(held):6.3f} ms; fast sockets drained {updates} updates in {delivered:7.1f} ms; "
+        f"{codec.encodes} encodes; direct fan_out per update {queued:7.1f} ms"
+    )
+    for socket in list(routes.connections.get(room_id, [])):
+        routes.unregister_client(room_id, socket)
+    routes.connections.pop(room_id, None)
+
+
+async def direct_fan_out(spectators: int, slow: int, slow_delay: float) -> float:
+    """
+    예전 방식: 모든 소켓 전송이 끝날 때까지(느린 소켓은 SEND_TIMEOUT까지) 기다림
+    """
+    sockets = [FakeSocket(slow_delay if index < slow else 0.0) for index in range(spectators)]
+    started = time.perf_counter()
+    await routes.fan_out("bench", sockets, Outbound({"type": "patch"}))
+    return (time.perf_counter() - started) * 1000
+
+
+async def main_async(args):
+    logging.disable(logging.CRITICAL)
+    routes.SEND_TIMEOUT = args.send_timeout
+    for spectators in args.spectators:
+        await run(spectators, max(1, spectators // 100), args.updates, args.slow_delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spectators", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--slow-delay", type=float, default=0.2)
+    parser.add_argument("--send-timeout", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
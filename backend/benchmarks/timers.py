@@ -0,0 +1,100 @@
+# benchmarks/timers.py
+"""
+타이머 N개 등록/재등록 비용과 메모리: 타이밍 휠 vs 타이머마다 asyncio.sleep 태스크.
+
+타이밍 휠은 가상 시계로 60초를 바로 돌려 모든 타이머가 늦지도 이르지도 않게 실행되는지 함께 확인합니다.
+
+실행: cd backend && python -m benchmarks.timers [--timers 50000]
+"""
+import argparse
+import asyncio
+from math import ceil
+import random
+import time
+import tracemalloc
+
+from core.timers import TimerWheel
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def bench_wheel(delays):
+    clock = VirtualClock()
+    wheel = TimerWheel(clock=clock)
+    fired = []  # (타이머 번호, 실행된 tick)
+
+    def fire(index):
+        fired.append((index, wheel.current))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    handles = [wheel.schedule(delay, fire, i) for i, delay in enumerate(delays)]
+    schedule = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # heartbeat처럼 모든 타이머를 한 번씩 취소 후 다시 등록
+    started = time.perf_counter()
+    for i, delay in enumerate(delays):
+        wheel.cancel(handles[i])
+        handles[i] = wheel.schedule(delay, fire, i)
+    reschedule = time.perf_counter() - started
+
+    started = time.perf_counter()
+    clock.now = max(delays) + 1
+    wheel.advance()
+    advance = time.perf_counter() - started
+
+    assert sorted(index for index, _ in fired) == list(range(len(delays))), "every timer fires exactly once"
+    expected = [max(1, ceil(delay / wheel.tick)) for delay in delays]
+    assert all(tick == expected[index] for index, tick in fired), "every timer fires on its own tick"
+    ticks = [tick for _, tick in fired]
+    assert ticks == sorted(ticks), "timers fire in expiry order"
+    assert wheel.pending == 0
+    return schedule, reschedule, advance, memory
+
+
+async def bench_tasks(delays):
+    tracemalloc.start()
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(asyncio.sleep(delay)) for delay in delays]
+    await asyncio.sleep(0)  # 태스크가 실제로 sleep 타이머를 등록하도록 한 번 실행
+    schedule = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for task in tasks:
+        task.cancel()
+    tasks = [asyncio.create_task(asyncio.sleep(delay)) for delay in delays]
+    await asyncio.sleep(0)
+    reschedule = time.perf_counter() - started
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return schedule, reschedule, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timers", type=int, default=50000)
+    args = parser.parse_args()
+
+    delays = [random.uniform(1, 60) for _ in range(args.timers)]
+    schedule, reschedule, advance, memory = bench_wheel(delays)
+    print(f"timing wheel:   schedule {schedule * 1000:7.1f} ms, reschedule {reschedule * 1000:7.1f} ms, "
+          f"fire all {advance * 1000:7.1f} ms, memory {memory / 2**20:6.1f} MiB")
+    schedule, reschedule, memory = asyncio.run(bench_tasks(delays))
+    print(f"asyncio tasks:  schedule {schedule * 1000:7.1f} ms, reschedule {reschedule * 1000:7.1f} ms, "
+          f"{'':21} memory {memory / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/wire_formats.py
+"""
+방 WebSocket 메시지 형식별 크기와 인코딩 CPU: JSON 텍스트 vs msgpack vs msgpack+deflate.
+
+실제 game_1 로직으로 판을 진행하며 만든 방 상태로 snapshot/patch 메시지를 만들고
+rooms/codec.py의 코덱으로 인코딩합니다. (--players로 방 크기를 키워 큰 스냅샷도 비교)
+
+실행: cd backend && python -m benchmarks.wire_formats [--hands 2000]
+"""
+import argparse
+import copy
+import random
+import time
+
+from core.delta import diff
+from games.game_1.logic import handle_action, initialize_game, next_round, reveal_winner
+from rooms.codec import CODECS
+
+
+def room_states(hands: int, players: int):
+    """
+    행동 하나마다 바뀐 방 상태를 차례로 반환
+    """
+    names = [f"player-{i}" for i in range(players)]
+    table = initialize_game(names[:2])
+    room = {
+        "room_id": "bench-room",
+        "game_type": "indian-poker",
+        "players": [{"player_name": name} for name in names],
+        "game_started": True,
+        "game_state": table.to_dict(),
+        "status": "playing",
+    }
+    yield copy.deepcopy(room)
+    for _ in range(hands):
+        first = table.current_turn
+        for index, action, bet in ((first, "bet", 1), (1 - first, "call", 0)):
+            handle_action(table, index, action, bet)
+            room["game_state"] = table.to_dict()
+            yield copy.deepcopy(room)
+        reveal_winner(table)
+        room["game_state"] = table.to_dict()
+        yield copy.deepcopy(room)
+        if min(seat.chips for seat in table.seats) < 2:
+            for seat in table.seats:
+                seat.chips = 30
+        next_round(table)
+        room["game_state"] = table.to_dict()
+        yield copy.deepcopy(room)
+
+
+def build_messages(hands: int, players: int):
+    snapshots, patches = [], []
+    previous = None
+    for seq, state in enumerate(room_states(hands, players), start=1):
+        snapshots.append({"type": "snapshot", "seq": seq, "state": state})
+        if previous is not None:
+            ops = diff(previous, state)
+            if ops:
+                patches.append({"type": "patch", "base": seq - 1, "seq": seq, "ops": ops})
+        previous = state
+    return snapshots, patches
+
+
+def measure(codec, messages):
+    started = time.perf_counter()
+    payloads = [codec.encode(message) for message in messages]
+    elapsed = time.perf_counter() - started
+    sizes = [len(payload.encode("utf-8")) if isinstance(payload, str) else len(payload) for payload in payloads]
+    return sum(sizes) / len(sizes), elapsed / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hands", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=2, help="방 players 목록 길이 (게임은 앞의 두 명이 진행)")
+    args = parser.parse_args()
+    random.seed(0)
+
+    snapshots, patches = build_messages(args.hands, args.players)
+    print(f"{len(snapshots)} snapshots, {len(patches)} patches")
+    for kind, messages in (("snapshot", snapshots), ("patch", patches)):
+        for subprotocol, codec in CODECS.items():
+            size, micros = measure(codec, messages)
+            print(f"{kind:9} {subprotocol:24} {size:8.1f} bytes/msg  {micros:6.2f} us/encode")
+
+
+if __name__ == "__main__":
+    main()
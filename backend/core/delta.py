@@ -0,0 +1,59 @@
+# core/delta.py
+"""
+JSON Patch(RFC 6902) 부분집합(add / remove / replace)으로 방 상태의 차이를 계산합니다.
+"""
+from typing import Any, Dict, List
+
+def escape_pointer(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """
+    old → new로 바꾸는 패치 연산 목록, 값이 같으면 빈 리스트
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{escape_pointer(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            ops.extend(diff(before, after, f"{path}/{index}"))
+        return ops
+
+    # 리스트 길이 변경은 드물고 작으므로 통째로 교체
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+def unescape_pointer(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+def apply(state: Any, ops: List[Dict]) -> Any:
+    """
+    diff()가 만든 패치를 state에 적용해 반환 (state를 직접 수정, 루트 교체면 새 값을 반환)
+    """
+    for op in ops:
+        if op["path"] == "":
+            state = op["value"]
+            continue
+        *parents, last = [unescape_pointer(token) for token in op["path"].split("/")[1:]]
+        target = state
+        for key in parents:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+        if isinstance(target, list):
+            last = int(last)
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return state
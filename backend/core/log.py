@@ -0,0 +1,53 @@
+"""
+이벤트 루프에서 로그 I/O를 하지 않도록 QueueHandler → 별도 스레드의 QueueListener로 보내고,
+요청마다 찍히는 접근 로그는 샘플링합니다.
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import logging
+import os
+import queue
+import random
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class SamplingFilter(logging.Filter):
+    """
+    WARNING 미만 레코드는 rate 비율만 통과 (경고/에러는 항상 기록)
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: int = logging.INFO):
+    """
+    root 로거는 큐에만 넣고, 포맷팅과 stderr 쓰기는 리스너 스레드가 처리
+    """
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    # 요청/WebSocket 메시지마다 찍히는 로거는 샘플링
+    rate = float(os.getenv("HOT_LOG_SAMPLE_RATE", "0.01"))
+    for name in ("main.access", "room.hot"):
+        logging.getLogger(name).addFilter(SamplingFilter(rate))
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,186 @@
+"""
+외부 의존성 없는 가벼운 메트릭 (Prometheus text format 0.0.4).
+
+핫 패스에서는 dict 조회와 정수/실수 덧셈만 하고, 문자열 렌더링은 /metrics 요청 때만 합니다.
+"""
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+def _labels(names: Sequence[str], values: Tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, key)} {value}" for key, value in self.values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels):
+        self.values[labels] = value
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+class CallbackGauge:
+    """
+    스크레이프 시점에 값을 계산하는 게이지 (태스크 수, 큐 길이 등)
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.callback()}"]
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple, List] = {}  # labels → [bucket별 개수..., +Inf 개수, 합]
+
+    def observe(self, value: float, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                labels = _labels(self.label_names + ("le",), key + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def callback_gauge(self, name: str, help: str, callback: Callable[[], float]) -> CallbackGauge:
+        return self.register(CallbackGauge(name, help, callback))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+access_logger = logging.getLogger("main.access")  # 요청마다 찍히므로 샘플링됨
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"),
+)
+broadcast_fanout_size = REGISTRY.histogram(
+    "room_broadcast_fanout_size", "Sockets targeted per room broadcast", buckets=SIZE_BUCKETS,
+)
+broadcast_duration = REGISTRY.histogram("room_broadcast_duration_seconds", "Time to fan a frame out to a room")
+broadcast_updates = REGISTRY.counter(
+    "room_broadcast_updates_total", "Room updates seen by broadcasters by outcome", ("outcome",),
+)
+evicted_sockets = REGISTRY.counter("room_evicted_sockets_total", "Sockets dropped after a failed or slow send")
+dropped_frames = REGISTRY.counter("room_dropped_frames_total", "State frames shed from slow clients' send queues")
+slow_consumers = REGISTRY.counter(
+    "room_slow_consumers_total", "Send queue overflows by slow-consumer policy applied", ("policy",),
+)
+rate_limited = REGISTRY.counter(
+    "rate_limited_total", "Inbound messages and requests rejected by rate limits", ("scope",),
+)
+inbound_batch_size = REGISTRY.histogram(
+    "room_inbound_batch_size", "Room WebSocket messages parsed per event loop tick", buckets=SIZE_BUCKETS,
+)
+lock_wait = REGISTRY.histogram("room_lock_wait_seconds", "Time spent waiting for a room lock", ("lock",))
+REGISTRY.callback_gauge("asyncio_tasks", "Tasks alive on the event loop", lambda: len(asyncio.all_tasks()))
+
+@asynccontextmanager
+async def timed_lock(lock: asyncio.Lock, name: str = "room"):
+    """
+    락 대기 시간을 기록하면서 획득
+    """
+    started = time.perf_counter()
+    async with lock:
+        lock_wait.observe(time.perf_counter() - started, name)
+        yield
+
+class RequestMetricsMiddleware:
+    """
+    순수 ASGI 미들웨어: 라우트 템플릿(/room/{room_id})별 지연 시간 히스토그램과 접근 로그
+    (경로 그대로 라벨에 넣으면 방마다 시계열이 생기므로 템플릿 사용)
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 최신 FastAPI는 include_router의 prefix를 effective_route_context에만 담아 둠
+            context = scope.get("fastapi", {}).get("effective_route_context")
+            route = scope.get("route")
+            template = getattr(context, "path", None) or getattr(route, "path_format", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], template, status)
+            access_logger.info("%s %s -> %d", scope["method"], scope["path"], status)
@@ -1,19 +1,70 @@
-from typing import List, Optional
-from pydantic import BaseModel
+# core/models.py
+"""
+방/게임 상태의 타입 모델과 미리 만들어 둔 직렬화기.
 
-class Player(BaseModel):
+저장소, 이벤트 로그, JSON Patch는 JSON 형태의 dict를 그대로 다루고, 각 워커의 방 캐시는
+버전이 바뀔 때 한 번 ROOM.validate_python()으로 만든 slots 모델을 가집니다.
+game_state는 game_type마다 모양이 다르므로 Room은 dict 그대로 두고, 게임 플러그인이 등록한
+state_model(인디언 포커는 GAME_STATE)이 있으면 방 모듈이 그 모델로 따로 검증합니다.
+응답은 TypeAdapter.dump_json()으로 바로 bytes를 만들어 FastAPI의 jsonable_encoder를 거치지 않습니다.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+@dataclass(slots=True)
+class Player:
     player_name: str
+
+@dataclass(slots=True)
+class PlayerHand:
     chips: int
+    card: Optional[int] = None
 
-class GameState(BaseModel):
-    current_turn: int
+@dataclass(slots=True)
+class GameState:
+    """
+    인디언 포커 테이블 상태 (games/game_1/state.py의 TableState.to_dict() 형태)
+    """
+    players: Dict[str, PlayerHand]
+    current_turn: Optional[str]  # 차례인 플레이어 이름
     pot: int
     round_completed: bool
+    game_round: int = 1
+    winner: Optional[str] = None
+    settled_chips: Dict[str, int] = field(default_factory=dict)  # 마지막 정산 직후의 플레이어별 칩
+    bets: Dict[str, int] = field(default_factory=dict)  # 이번 판에 플레이어별로 건 칩
 
-class Room(BaseModel):
+@dataclass(slots=True)
+class Room:
     room_id: str
-    players: List[Player]  # 플레이어들의 리스트
+    game_type: str
+    players: List[Player]
     game_started: bool
-    game_type: Optional[str] = None  # 게임 타입 추가 (선택적)
-    game_state: Optional[GameState] = None  # 게임 상태 추가 (선택적)
-    status: Optional[str] = "waiting"  # 방 상태 추가 (선택적)
\ No newline at end of file
+    game_state: Any  # game_type의 state_model로 검증한 모델, 모델이 없는 게임은 dict 그대로
+    status: str = "waiting"
+
+@dataclass(slots=True)
+class RoomResponse:
+    message: str
+    room: Room
+
+class RoomSummary(TypedDict):
+    """
+    로비 목록 한 줄 (로비 WebSocket으로도 그대로 보내므로 dict)
+    """
+    room_id: str
+    game_type: str
+    status: str
+    players: List[str]
+
+ROOM = TypeAdapter(Room)
+GAME_STATE = TypeAdapter(GameState)
+ROOM_RESPONSE = TypeAdapter(RoomResponse)
+ROOM_SUMMARIES = TypeAdapter(List[RoomSummary])
+
+def json_response(adapter: TypeAdapter, value: Any, **kwargs) -> Response:
+    return Response(content=adapter.dump_json(value), media_type="application/json", **kwargs)
@@ -0,0 +1,84 @@
+# core/ratelimit.py
+"""
+토큰 버킷 속도 제한.
+
+버킷은 초당 rate개씩 burst개까지 토큰이 차고, 메시지/요청 하나가 토큰 하나를 씁니다.
+태스크나 타이머 없이 take()를 부를 때 지난 시간만큼 한 번에 채우므로 버킷 하나는 float 두 개입니다.
+RateLimiter는 키(연결, (room_id, 플레이어) 등)별 버킷을 가지며, 키가 max_keys를 넘으면 가득 찬(한동안 조용한) 버킷을 버립니다.
+"""
+from typing import Callable, Dict, Hashable
+import os
+import time
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> bool:
+        self._refill(now)
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def retry_after(self, now: float, cost: float = 1.0) -> float:
+        """
+        토큰이 cost만큼 찰 때까지 남은 시간(초)
+        """
+        self._refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.max_keys = max_keys
+        self.buckets: Dict[Hashable, TokenBucket] = {}
+
+    def bucket(self) -> TokenBucket:
+        """
+        키 없이 쓰는 버킷 (연결 하나가 자기 버킷을 직접 들고 있을 때)
+        """
+        return TokenBucket(self.rate, self.burst, self.clock())
+
+    def allow(self, key: Hashable, cost: float = 1.0) -> bool:
+        now = self.clock()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self.prune(now)
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst, now)
+        return bucket.take(now, cost)
+
+    def retry_after(self, key: Hashable, cost: float = 1.0) -> float:
+        bucket = self.buckets.get(key)
+        return bucket.retry_after(self.clock(), cost) if bucket is not None else 0.0
+
+    def forget(self, key: Hashable):
+        self.buckets.pop(key, None)
+
+    def prune(self, now: float):
+        """
+        가득 찬 버킷은 새로 만든 버킷과 같으므로 지워도 동작이 바뀌지 않음
+        """
+        for key in [key for key, bucket in self.buckets.items() if bucket.retry_after(now, bucket.burst) == 0.0]:
+            del self.buckets[key]
+
+# 플레이어별 게임 행동 제한: 방 WebSocket과 게임 REST API(/game_1/player_action 등)가 같은 버킷을 씀
+player_actions = RateLimiter(
+    rate=float(os.getenv("PLAYER_ACTION_RATE", "5")),
+    burst=float(os.getenv("PLAYER_ACTION_BURST", "10")),
+)
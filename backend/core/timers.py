@@ -0,0 +1,131 @@
+"""
+계층형 타이밍 휠 스케줄러.
+
+타이머마다 asyncio.sleep 태스크를 두지 않고, 백그라운드 태스크 하나가 tick마다 휠을 돌려
+만료된 콜백을 실행합니다. 등록/취소는 O(1)이고 tick당 비용은 만료된 타이머 수에만 비례합니다.
+
+clock을 주입할 수 있어서 가상 시계로 advance()를 직접 호출하면 실제로 기다리지 않고 검증할 수 있습니다.
+"""
+from math import ceil
+from typing import Callable, List, Optional, Sequence
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("core.timers")
+
+class Timer:
+    __slots__ = ("expires", "callback", "args", "cancelled")
+
+    def __init__(self, expires: int, callback: Callable, args: tuple):
+        self.expires = expires  # 만료 tick 번호
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+class TimerWheel:
+    """
+    wheel_sizes=(256, 64, 64, 64), tick=0.1초 → 0단은 25.6초, 1단은 27분, 2단은 29시간까지 담고
+    그보다 먼 타이머는 최상위 단의 마지막 칸에 두었다가 회전할 때 다시 배치합니다.
+    상위 단의 칸이 현재 시각에 도달하면 그 칸의 타이머를 하위 단으로 내립니다(cascade).
+    """
+    def __init__(
+        self,
+        tick: float = 0.1,
+        wheel_sizes: Sequence[int] = (256, 64, 64, 64),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tick = tick
+        self.clock = clock
+        self.sizes = tuple(wheel_sizes)
+        self.spans: List[int] = []  # 단별 한 칸이 차지하는 tick 수
+        span = 1
+        for size in self.sizes:
+            self.spans.append(span)
+            span *= size
+        self.levels: List[List[List[Timer]]] = [[[] for _ in range(size)] for size in self.sizes]
+        self.current = int(clock() / tick)
+        self.pending = 0
+        self.fired = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def now(self) -> float:
+        return self.clock()
+
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        """
+        delay초 뒤(다음 tick 이후) callback(*args) 실행, 반환된 Timer로 취소
+        """
+        timer = Timer(self.current + max(1, ceil(delay / self.tick)), callback, args)
+        self._insert(timer)
+        self.pending += 1
+        return timer
+
+    def cancel(self, timer: Optional[Timer]):
+        # 칸에서 바로 빼지 않고 표시만 함 (만료나 cascade 때 버려짐)
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self.pending -= 1
+
+    def _insert(self, timer: Timer):
+        for level, size, span in zip(self.levels, self.sizes, self.spans):
+            if timer.expires // span - self.current // span < size:
+                level[(timer.expires // span) % size].append(timer)
+                return
+        span, size = self.spans[-1], self.sizes[-1]
+        self.levels[-1][(self.current // span + size - 1) % size].append(timer)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        now(기본: clock())까지 휠을 돌리며 만료된 타이머를 실행하고, 실행한 개수를 반환
+        """
+        target = int((self.clock() if now is None else now) / self.tick)
+        fired = 0
+        while self.current < target:
+            self.current += 1
+            tick = self.current
+            # 상위 단부터 내려야 같은 tick에 여러 단을 거쳐 내려오는 타이머도 이번 tick에 처리됨
+            for level in range(len(self.levels) - 1, 0, -1):
+                span = self.spans[level]
+                if tick % span:
+                    continue
+                bucket = self.levels[level][(tick // span) % self.sizes[level]]
+                timers, bucket[:] = list(bucket), []
+                for timer in timers:
+                    if not timer.cancelled:
+                        self._insert(timer)
+
+            bucket = self.levels[0][tick % self.sizes[0]]
+            expired, bucket[:] = list(bucket), []
+            for timer in expired:
+                if timer.cancelled:
+                    continue
+                timer.cancelled = True
+                self.pending -= 1
+                fired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception:
+                    logger.exception(f"Timer callback {timer.callback!r} failed")
+        self.fired += fired
+        return fired
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            self.advance()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+timers = TimerWheel()
@@ -1,14 +1,185 @@
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
 
-DATABASE_URL = "sqlite:///./test.db"  # SQLite 사용 예시
-engine = create_engine(DATABASE_URL)
-metadata = MetaData(bind=engine)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, event, func
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
 
-def get_db():
-    db = SessionLocal()
-    try:
+logger = logging.getLogger("database")
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./test.db")  # SQLite 사용 예시
+engine = create_async_engine(DATABASE_URL, pool_size=5, max_overflow=10, pool_pre_ping=True)
+metadata = MetaData()
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+rooms_table = Table(
+    "rooms", metadata,
+    Column("id", Integer, primary_key=True),  # 같은 room_id가 삭제 후 재사용될 수 있어 대리키 사용
+    Column("room_id", String, nullable=False, index=True),
+    Column("game_type", String, nullable=False),
+    Column("created_by", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+players_table = Table(
+    "players", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("room_id", String, nullable=False, index=True),
+    Column("player_name", String, nullable=False, index=True),
+    Column("joined_at", DateTime, server_default=func.now()),
+)
+
+hands_table = Table(
+    "hands", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("room_id", String, nullable=False, index=True),
+    Column("game_round", Integer),
+    Column("winner", String),
+    Column("pot", Integer, nullable=False, default=0),
+    Column("settled_at", DateTime, server_default=func.now()),
+)
+
+chip_ledger_table = Table(
+    "chip_ledger", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("room_id", String, nullable=False, index=True),
+    Column("game_round", Integer),
+    Column("player_name", String, nullable=False, index=True),
+    Column("delta", Integer, nullable=False),
+    Column("reason", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    여러 워커 프로세스가 같은 파일을 공유하므로 WAL 모드 사용 (읽기와 쓰기가 서로 막지 않음)
+    """
+    # 트랜잭션 시작을 직접 제어 (쓰기는 BEGIN IMMEDIATE로 시작해 쓰기 락 경합을 피함)
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+@asynccontextmanager
+async def write_transaction():
+    """
+    BEGIN IMMEDIATE로 시작하는 쓰기 트랜잭션 (여러 워커가 동시에 읽고-수정-쓰기 할 때 직렬화)
+    예외가 나면 롤백하고 그대로 전파
+    """
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+
+async def init_db():
+    # 워커들이 동시에 시작하므로 테이블 생성도 쓰기 트랜잭션 안에서 직렬화
+    async with write_transaction() as conn:
+        await conn.run_sync(metadata.create_all)
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+class WriteBehindQueue:
+    """
+    게임 이벤트(INSERT)를 모아 한 트랜잭션으로 기록합니다.
+
+    요청 경로에서는 submit()으로 큐에 넣기만 하고, 백그라운드 태스크가
+    max_batch개가 모이거나 flush_interval초가 지나면 테이블별 executemany로 한 번에 커밋합니다.
+    """
+    def __init__(self, max_batch: int = 500, flush_interval: float = 0.05, max_pending: int = 100_000):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        아직 기록되지 않고 큐에 남은 이벤트 수
+        """
+        return self._queue.qsize()
+
+    def submit(self, table: Table, values: Dict):
+        try:
+            self._queue.put_nowait((table, values))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"Write-behind queue full, dropping {table.name} event")
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """
+        남은 이벤트를 모두 기록한 뒤 종료 (lifespan 종료 시 호출)
+        """
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            await self.flush(batch)
+
+    async def flush(self, batch: List[Tuple[Table, Dict]]):
+        grouped: Dict[Table, List[Dict]] = {}
+        for table, values in batch:
+            grouped.setdefault(table, []).append(values)
+        try:
+            async with write_transaction() as conn:
+                await self._insert(conn, grouped)
+        except Exception:
+            logger.exception(f"Failed to persist batch of {len(batch)} events, retrying one by one")
+            await self._flush_individually(batch)
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _insert(self, conn: AsyncConnection, grouped: Dict[Table, List[Dict]]):
+        for table, rows in grouped.items():
+            await conn.execute(table.insert(), rows)
+
+    async def _flush_individually(self, batch: List[Tuple[Table, Dict]]):
+        for table, values in batch:
+            try:
+                async with write_transaction() as conn:
+                    await conn.execute(table.insert(), [values])
+                self.written += 1
+            except Exception:
+                self.dropped += 1
+                logger.exception(f"Dropping {table.name} event: {values}")
+
+event_writer = WriteBehindQueue()
@@ -0,0 +1,394 @@
+# eventlog.py
+"""
+방/게임 이벤트를 바이너리 append-only 로그로 남깁니다.
+
+- 방 ID 해시로 샤드를 정하고, 샤드마다 segment 파일(segment-000000.log, ...)에 순서대로 추가
+- 레코드 = 헤더(crc32, 본문 길이, 샤드 내 seq, 방 ID 해시) + msgpack 본문 [시각(ms), room_id, 종류, 내용]
+- 상태 변경은 직전에 기록한 상태와의 JSON Patch로, snapshot_every개마다 전체 상태 스냅샷을 남김
+- 읽기는 mmap으로 하고, 방 ID 해시가 다른 레코드는 본문을 풀지 않고 건너뜀
+
+append()는 메모리 버퍼에 넣기만 하고 백그라운드 태스크가 flush_interval마다 샤드별로 한 번에 write 합니다.
+한 디렉터리에는 한 프로세스만 씁니다: open()이 디렉터리의 락 파일을 잡고, 다른 워커가 이미 잡았으면
+그 아래 worker-N 디렉터리 중 비어 있는 첫 칸을 씁니다. (워커 수가 같으면 재시작 후에도 같은 칸들을 다시 읽음)
+한 방의 변경이 여러 워커의 로그에 나뉘어 있을 수 있으므로 replay_version()은 모든 칸을 합쳐 저장소 버전 순으로 봅니다.
+"""
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import msgpack
+
+from core.delta import apply, diff
+
+logger = logging.getLogger("eventlog")
+
+HEADER = struct.Struct("<IIQI")  # crc32(본문), 본문 길이, seq, crc32(room_id)
+
+# 레코드 종류
+CREATED, JOINED, STATE, DELETED, ACTION, SNAPSHOT = "created", "joined", "state", "deleted", "action", "snapshot"
+
+class Event(NamedTuple):
+    seq: int
+    timestamp: int  # ms
+    room_id: str
+    kind: str
+    data: Dict
+
+class RecordPosition(NamedTuple):
+    seq: int
+    segment: int
+    offset: int
+
+def room_hash(room_id: str) -> int:
+    return zlib.crc32(room_id.encode("utf-8"))
+
+def clone(state: Any) -> Any:
+    # deepcopy보다 빠른 복사 (상태는 JSON 호환 값만 가짐)
+    return msgpack.unpackb(msgpack.packb(state), raw=False)
+
+class Shard:
+    __slots__ = ("path", "segment", "fd", "size", "seq", "buffer")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.segment = 0
+        self.fd: Optional[int] = None
+        self.size = 0
+        self.seq = 0
+        self.buffer: List[bytes] = []
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"segment-{segment:06d}.log")
+
+    def segments(self) -> List[int]:
+        return sorted(
+            int(name[len("segment-"):-len(".log")])
+            for name in os.listdir(self.path)
+            if name.startswith("segment-") and name.endswith(".log")
+        )
+
+class EventLog:
+    def __init__(
+        self,
+        directory: str,
+        shards: int = 4,
+        segment_size: int = 64 * 2**20,
+        snapshot_every: int = 64,
+        flush_interval: float = 0.01,
+    ):
+        self.root = directory
+        self.directory = directory  # open()이 락을 잡은 실제 디렉터리
+        self.shard_count = shards
+        self.segment_size = segment_size
+        self.snapshot_every = snapshot_every
+        self.flush_interval = flush_interval
+        self.shards = self._make_shards(directory)
+        self.last_state: Dict[str, Dict] = {}  # 방별로 마지막에 기록한 상태 (다음 패치의 기준)
+        self.since_snapshot: Dict[str, int] = {}
+        self.snapshots: Dict[str, List[RecordPosition]] = {}  # 방별 스냅샷 위치 (replay 시작점)
+        self.max_version = 0  # 기록된 저장소 버전 중 가장 큰 값 (재시작 후 버전/ETag가 겹치지 않도록)
+        self.written = 0
+        self._task: Optional[asyncio.Task] = None
+        self._lock_file = None
+
+    def _make_shards(self, directory: str) -> List[Shard]:
+        return [Shard(os.path.join(directory, f"shard-{index:02d}")) for index in range(self.shard_count)]
+
+    def shard_of(self, room_id: str) -> Shard:
+        return self.shards[room_hash(room_id) % len(self.shards)]
+
+    # 쓰기
+
+    def append(self, room_id: str, kind: str, data: Dict):
+        shard = self.shard_of(room_id)
+        shard.seq += 1
+        body = msgpack.packb([int(time.time() * 1000), room_id, kind, data], use_bin_type=True)
+        record = HEADER.pack(zlib.crc32(body), len(body), shard.seq, room_hash(room_id)) + body
+        if kind == SNAPSHOT or kind == CREATED:
+            # 버퍼에 남은 레코드 뒤에 붙으므로 flush 후의 파일 위치를 미리 계산
+            # (flush는 버퍼 전체를 한 segment에 쓰고, 현재 segment가 가득 찼으면 먼저 새 segment로 넘어감)
+            rolled = shard.size >= self.segment_size
+            segment = shard.segment + 1 if rolled else shard.segment
+            offset = (0 if rolled else shard.size) + sum(len(pending) for pending in shard.buffer)
+            self.snapshots.setdefault(room_id, []).append(RecordPosition(shard.seq, segment, offset))
+        shard.buffer.append(record)
+
+    def record_state(self, room_id: str, kind: str, state: Dict, version: Optional[int] = None, **data):
+        """
+        방 상태 변경 기록: 처음이면 전체 상태, 이후에는 직전 기록과의 패치 (snapshot_every개마다 스냅샷 추가)
+        version: 이 상태의 저장소 버전 (상태가 같아도 기록해서 재시작 후 버전 카운터를 그 위에서 시작)
+        """
+        if version is not None:
+            data["version"] = version
+            self.max_version = max(self.max_version, version)
+        previous = self.last_state.get(room_id)
+        current = clone(state)
+        if previous is None or kind == CREATED:
+            self.append(room_id, CREATED if kind == CREATED else SNAPSHOT, {"state": current, **data})
+            self.since_snapshot[room_id] = 0
+        else:
+            ops = diff(previous, current)
+            if not ops and not data:
+                return
+            self.append(room_id, kind, {"ops": ops, **data})
+            self.since_snapshot[room_id] += 1
+            if self.since_snapshot[room_id] >= self.snapshot_every:
+                self.append(room_id, SNAPSHOT, {"state": current})
+                self.since_snapshot[room_id] = 0
+        self.last_state[room_id] = current
+
+    def record_deleted(self, room_id: str):
+        # 매칭 방처럼 ID가 매번 새로 만들어지는 방의 기록이 쌓이지 않도록 방별 상태를 모두 지움
+        # (지워진 방을 replay()하면 스냅샷 없이 segment 처음부터 읽음)
+        self.append(room_id, DELETED, {})
+        self.last_state.pop(room_id, None)
+        self.since_snapshot.pop(room_id, None)
+        self.snapshots.pop(room_id, None)
+
+    def flush(self):
+        for shard in self.shards:
+            if not shard.buffer:
+                continue
+            records, shard.buffer = shard.buffer, []
+            data = b"".join(records)
+            if shard.size >= self.segment_size:
+                self._roll(shard)
+            os.write(shard.fd, data)
+            shard.size += len(data)
+            self.written += len(records)
+
+    def _roll(self, shard: Shard):
+        os.close(shard.fd)
+        shard.segment += 1
+        shard.fd = os.open(shard.segment_path(shard.segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        shard.size = 0
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Failed to flush event log")
+
+    def open(self) -> Dict[str, Dict]:
+        """
+        로그를 끝까지 읽어 seq/스냅샷 위치/마지막 상태를 복원하고, 삭제되지 않은 방의 상태를 반환
+        (마지막 segment 끝의 깨진 레코드는 잘라냄)
+        """
+        self._lock_directory()
+        live: Dict[str, Dict] = {}
+        for shard in self.shards:
+            os.makedirs(shard.path, exist_ok=True)
+            segments = shard.segments() or [0]
+            for segment in segments:
+                valid_end = 0
+                for position, valid_end, event in self._scan(shard, segment):
+                    shard.seq = event.seq
+                    self._restore(live, event, position)
+                path = shard.segment_path(segment)
+                if os.path.exists(path) and os.path.getsize(path) > valid_end:
+                    logger.warning(f"Truncating torn tail of {path} at {valid_end}")
+                    os.truncate(path, valid_end)
+            shard.segment = segments[-1]
+            shard.fd = os.open(shard.segment_path(shard.segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            shard.size = os.fstat(shard.fd).st_size
+        return live
+
+    def _lock_directory(self):
+        slot = 0
+        while True:
+            directory = self.root if slot == 0 else os.path.join(self.root, f"worker-{slot}")
+            os.makedirs(directory, exist_ok=True)
+            lock_file = open(os.path.join(directory, ".lock"), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                slot += 1
+                continue
+            break
+        self._lock_file = lock_file
+        if directory != self.directory:
+            logger.info(f"Event log {self.root} is in use by another process, writing to {directory}")
+            self.directory = directory
+            self.shards = self._make_shards(directory)
+
+    def _restore(self, live: Dict[str, Dict], event: Event, position: RecordPosition):
+        room_id = event.room_id
+        self.max_version = max(self.max_version, event.data.get("version", 0))
+        if event.kind in (CREATED, SNAPSHOT):
+            live[room_id] = event.data["state"]
+            self.since_snapshot[room_id] = 0
+            self.snapshots.setdefault(room_id, []).append(position)
+        elif event.kind == DELETED:
+            live.pop(room_id, None)
+            self.since_snapshot.pop(room_id, None)
+            self.snapshots.pop(room_id, None)
+        elif "ops" in event.data and room_id in live:
+            live[room_id] = apply(live[room_id], event.data["ops"])
+            self.since_snapshot[room_id] = self.since_snapshot.get(room_id, 0) + 1
+
+    async def start(self) -> Dict[str, Dict]:
+        live = self.open()
+        self.last_state = {room_id: clone(state) for room_id, state in live.items()}
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return live
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+        for shard in self.shards:
+            if shard.fd is not None:
+                os.fsync(shard.fd)
+                os.close(shard.fd)
+                shard.fd = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    # 읽기
+
+    def _scan(
+        self, shard: Shard, segment: int, offset: int = 0, room_id: Optional[str] = None,
+    ) -> Iterator[Tuple[RecordPosition, int, Event]]:
+        """
+        segment 하나를 mmap으로 읽으며 (레코드 위치, 레코드 끝 offset, 이벤트)를 순서대로 반환, 깨진 레코드에서 멈춤
+        room_id를 주면 해시가 다른 레코드는 본문을 풀지 않고 건너뜀
+        """
+        path = shard.segment_path(segment)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        wanted = room_hash(room_id) if room_id is not None else None
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            end = len(view)
+            while offset + HEADER.size <= end:
+                crc, length, seq, hashed = HEADER.unpack_from(view, offset)
+                record, start = offset, offset + HEADER.size
+                if start + length > end:
+                    return
+                offset = start + length
+                if wanted is not None and hashed != wanted:
+                    continue
+                body = view[start:offset]
+                if zlib.crc32(body) != crc:
+                    return
+                timestamp, event_room, kind, data = msgpack.unpackb(body, raw=False)
+                if room_id is not None and event_room != room_id:
+                    continue  # 해시 충돌
+                yield RecordPosition(seq, segment, record), offset, Event(seq, timestamp, event_room, kind, data)
+
+    def events(self, room_id: str, start: Optional[RecordPosition] = None) -> Iterator[Event]:
+        """
+        파일에 쓰인 이벤트만 읽음 (버퍼에 남은 레코드가 필요하면 호출하는 쪽에서 먼저 flush)
+        """
+        shard = self.shard_of(room_id)
+        first_segment, offset = (start.segment, start.offset) if start is not None else (0, 0)
+        for segment in shard.segments():
+            if segment < first_segment:
+                continue
+            for _, _, event in self._scan(shard, segment, offset if segment == first_segment else 0, room_id):
+                yield event
+
+    def replay(self, room_id: str, upto: Optional[int] = None) -> Tuple[Optional[Dict], int]:
+        """
+        이 로그만 읽어 room_id의 상태를 seq upto(포함)까지 다시 만들어 (상태, 마지막 적용 seq)로 반환
+        seq는 방별이 아니라 샤드 안의 순번이고, 다른 워커의 로그에 있는 변경은 포함하지 않음
+        upto 이하의 가장 가까운 스냅샷부터 읽기 시작 (방이 그 시점에 없었으면 상태는 None)
+        """
+        start = None
+        for position in self.snapshots.get(room_id, ()):
+            if upto is not None and position.seq > upto:
+                break
+            start = position
+
+        self.flush()
+        state, applied = None, 0
+        for event in self.events(room_id, start):
+            if upto is not None and event.seq > upto:
+                break
+            if event.kind in (CREATED, SNAPSHOT):
+                state = event.data["state"]
+            elif event.kind == DELETED:
+                state = None
+            elif "ops" in event.data and state is not None:
+                state = apply(state, event.data["ops"])
+            applied = event.seq
+        return state, applied
+
+    def log_directories(self) -> List[str]:
+        """
+        같은 루트를 쓰는 모든 워커의 로그 디렉터리 (루트와 worker-N)
+        """
+        if not os.path.isdir(self.root):
+            return []
+        slots = sorted(
+            int(name[len("worker-"):])
+            for name in os.listdir(self.root)
+            if name.startswith("worker-") and name[len("worker-"):].isdigit()
+        )
+        return [self.root] + [os.path.join(self.root, f"worker-{slot}") for slot in slots]
+
+    def _versions(self, directory: str, room_id: str) -> Iterator[Tuple[int, Optional[int], Optional[Dict]]]:
+        """
+        directory의 로그에서 room_id의 (시각, 저장소 버전, 상태)를 순서대로 반환 (삭제는 버전과 상태가 None)
+        패치는 같은 로그의 직전 기록이 기준이므로 로그마다 따로 상태를 다시 만듦 (반환한 상태는 다음 패치에서 바뀜)
+        """
+        shard = Shard(os.path.join(directory, f"shard-{room_hash(room_id) % len(self.shards):02d}"))
+        if not os.path.isdir(shard.path):
+            return
+        state = None
+        for segment in shard.segments():
+            for _, _, event in self._scan(shard, segment, 0, room_id):
+                if event.kind in (CREATED, SNAPSHOT):
+                    state = event.data["state"]
+                elif event.kind == DELETED:
+                    state = None
+                    yield event.timestamp, None, None
+                elif "ops" in event.data and state is not None:
+                    state = apply(state, event.data["ops"])
+                if state is not None and "version" in event.data:
+                    yield event.timestamp, event.data["version"], state
+
+    def replay_version(self, room_id: str, version: Optional[int] = None) -> Tuple[Optional[Dict], int]:
+        """
+        모든 워커의 로그를 합쳐 저장소 버전 version(포함, 기본: 마지막)까지의 가장 새 상태를 (상태, 그 버전)으로 반환
+        삭제 기록에는 버전이 없으므로 시각으로 비교: 마지막 상태보다 늦게 지워진 방은 (None, 0)
+        버퍼에 남은 이 로그의 레코드가 필요하면 호출하는 쪽에서 먼저 flush
+        """
+        found, found_version, found_at, deleted_at = None, 0, 0, -1
+        for directory in self.log_directories():
+            for timestamp, recorded, state in self._versions(directory, room_id):
+                if recorded is None:
+                    deleted_at = max(deleted_at, timestamp)
+                elif recorded > found_version and (version is None or recorded <= version):
+                    found, found_version, found_at = clone(state), recorded, timestamp
+        if found is None or (version is None and deleted_at >= found_at):
+            return None, 0
+        return found, found_version
+
+    async def replay_version_async(self, room_id: str, version: Optional[int] = None) -> Tuple[Optional[Dict], int]:
+        """
+        replay_version()을 스레드에서 실행 (이벤트 루프를 막지 않도록)
+        버퍼/fd는 이벤트 루프에서만 건드리므로 flush는 여기서 하고, 스레드는 파일만 읽음
+        """
+        self.flush()
+        return await asyncio.get_running_loop().run_in_executor(None, self.replay_version, room_id, version)
+
+event_log = EventLog(
+    os.getenv("EVENT_LOG_DIR", "./eventlog"),
+    shards=int(os.getenv("EVENT_LOG_SHARDS", "4")),
+)
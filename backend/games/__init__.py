@@ -1,3 +1,5 @@
-from .game_1 import router as game_1_router
+# games/__init__.py
+# game_type → 게임 패키지 선언만 하고, 패키지는 그 게임이 처음 필요할 때 import (registry.get_game)
+from .registry import declare_game
 
-__all__ = ["game_1_router"]
+declare_game("indian-poker", "games.game_1", prefix="/game_1")
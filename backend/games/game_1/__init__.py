@@ -1 +1,18 @@
+from core.models import GAME_STATE
+from games.registry import GamePlugin, register_game
+from .engine import game_engine
+from .logic import initialize_game, private_view
 from .routes import router
+from .simulator import equity_rows
+
+register_game(GamePlugin(
+    game_type="indian-poker",
+    prefix="/game_1",
+    router=router,
+    engine=game_engine,
+    initialize=lambda players: initialize_game(players).to_dict(),
+    max_players=2,
+    warmup=equity_rows,  # 승률 표를 미리 계산해 캐시
+    private_view=private_view,
+    state_model=GAME_STATE,
+))
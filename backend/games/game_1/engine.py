@@ -0,0 +1,273 @@
+"""
+방(room_id)마다 하나의 테이블 액터를 두는 게임 엔진.
+
+액터는 자기 큐의 행동을 하나씩 꺼내 원자적으로 적용하고, 결과 상태를 방 브로드캐스트로 발행합니다.
+워커마다 자기 액터를 가지므로 발행은 저장소의 game_state가 액터의 기준 상태(base)와 같을 때만 성공하고,
+다른 워커가 먼저 바꿨으면 그 행동은 버리고 저장된 상태로 다시 맞춥니다 (판 결과/원장/이벤트 로그 기록은 발행 성공 후).
+큐가 비면 처리 태스크가 종료되므로 한가한 테이블은 태스크를 점유하지 않습니다.
+차례인 플레이어가 TURN_TIMEOUT초 동안 행동하지 않으면 타이밍 휠이 자동으로 체크(팟이 비었을 때)나 폴드를 넣습니다.
+"""
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+import asyncio
+import logging
+import os
+
+from core.timers import Timer, timers
+from database import event_writer, hands_table
+from eventlog import ACTION, event_log
+from games.registry import GameActionError
+from leaderboard.ledger import record_settlement
+from .logic import handle_action, initialize_game, next_round, reveal_winner
+from .state import TableState
+
+logger = logging.getLogger("game_1.engine")
+
+TURN_TIMEOUT = float(os.getenv("TURN_TIMEOUT", "30"))  # 차례당 제한 시간(초)
+
+# (room_id, 새 game_state, 기준 game_state) → 저장된 game_state가 기준과 달라 발행하지 않았으면 그 상태, 아니면 None
+Publisher = Callable[[str, Dict, Dict], Awaitable[Optional[Dict]]]
+Loader = Callable[[str], Optional[Dict]]  # room_id → 저장된 game_state (없으면 None)
+RoomCheck = Callable[[str], Awaitable[bool]]  # room_id → 방 모듈의 방인지
+
+STALE_TABLE = "Table changed on another worker, try again"
+
+class Hand(NamedTuple):
+    """
+    정산된 판 하나 (발행에 성공한 뒤 판 결과/원장에 기록)
+    """
+    game_round: int
+    winner: Optional[str]
+    pot: int
+    deltas: Dict[str, int]
+
+class ActionResult(NamedTuple):
+    state: Dict
+    error: Optional[str] = None
+    winner: Optional[str] = None
+    hand: Optional[Hand] = None
+
+class TableActor:
+    __slots__ = ("room_id", "state", "base", "queue", "task", "publish", "turn_timer", "timeouts", "recorded_round")
+
+    def __init__(self, room_id: str, state: TableState, publish: Publisher, base: Optional[Dict] = None):
+        self.room_id = room_id
+        self.state = state
+        self.base = base if base is not None else state.to_dict()  # 저장소에 있다고 보는 game_state
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.publish = publish
+        self.turn_timer: Optional[Timer] = None
+        self.timeouts = 0  # 연속으로 시간 초과된 차례 수
+        self.recorded_round = state.game_round if state.winner is not None else 0  # 이미 정산된 판은 다시 기록하지 않음
+
+    def submit(self, player_index: int, action: str, bet_amount: int, timed_out: bool = False) -> "asyncio.Future[ActionResult]":
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((player_index, action, bet_amount, timed_out, future))
+        if self.task is None:
+            self.task = asyncio.create_task(self._drain())
+        return future
+
+    async def _drain(self):
+        try:
+            while not self.queue.empty():
+                player_index, action, bet_amount, timed_out, future = self.queue.get_nowait()
+                try:
+                    result = self.apply(player_index, action, bet_amount)
+                except Exception:
+                    # 처리 태스크가 죽으면 이 행동과 뒤에 쌓인 행동의 호출자가 영원히 기다리게 됨
+                    logger.exception(f"Failed to apply {action} for seat {player_index} in room {self.room_id}")
+                    result = ActionResult(self.state.to_dict(), "Action could not be applied")
+                if result.error is None:
+                    result = await self._publish(result)
+                if result.error is None:
+                    event_log.append(self.room_id, ACTION, {
+                        "seat": player_index, "action": action, "amount": bet_amount,
+                        "timed_out": timed_out, "winner": result.winner,
+                    })
+                    if result.hand is not None:
+                        self.record_hand(result.hand)
+                    if not timed_out:
+                        self.timeouts = 0
+                    self.arm_turn_timer()
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.task = None
+
+    async def _publish(self, result: ActionResult) -> ActionResult:
+        try:
+            current = await self.publish(self.room_id, result.state, self.base)
+        except Exception:
+            logger.exception(f"Failed to publish game state for room {self.room_id}")
+            current = None
+        if current is not None:
+            logger.info(f"Room {self.room_id} changed on another worker, discarding action")
+            self.resync(current)
+            return ActionResult(current, STALE_TABLE)
+        self.base = result.state
+        return result
+
+    def resync(self, game_state: Dict):
+        """
+        저장소의 game_state로 테이블을 다시 만듦 (다른 워커가 이 방의 테이블을 바꾼 경우)
+        """
+        self.state = TableState.from_dict(game_state)
+        self.base = game_state
+        self.recorded_round = self.state.game_round if self.state.winner is not None else 0
+        self.timeouts = 0
+        self.arm_turn_timer()
+
+    def apply(self, player_index: int, action: str, bet_amount: int) -> ActionResult:
+        state = self.state
+        if action == "reveal":
+            try:
+                winner = reveal_winner(state)
+            except ValueError as e:
+                return ActionResult(state.to_dict(), str(e))
+            hand = self.settle_hand()
+            return ActionResult(state.to_dict(), winner=winner, hand=hand)
+        if action == "next_round":
+            if not state.round_completed:
+                return ActionResult(state.to_dict(), "Round not completed")
+            next_round(state)
+            return ActionResult(state.to_dict())
+
+        error = handle_action(state, player_index, action, bet_amount)
+        hand = self.settle_hand() if error is None and state.winner is not None else None  # 폴드로 정산된 판
+        return ActionResult(state.to_dict(), error, state.winner, hand)
+
+    def arm_turn_timer(self):
+        """
+        현재 차례에 대한 제한 시간을 다시 설정 (이전 타이머는 취소)
+        """
+        timers.cancel(self.turn_timer)
+        self.turn_timer = None
+        state = self.state
+        if state.round_completed or self.timeouts >= len(state.seats):
+            return  # 공개/다음 판 대기 중이거나, 모든 플레이어가 연속으로 자리를 비운 테이블
+        self.turn_timer = timers.schedule(TURN_TIMEOUT, self.turn_expired, state.game_round, state.current_turn)
+
+    def turn_expired(self, game_round: int, player_index: int):
+        self.turn_timer = None
+        state = self.state
+        if state.round_completed or state.game_round != game_round or state.current_turn != player_index:
+            return
+        self.timeouts += 1
+        action = "check" if state.pot == 0 else "fold"
+        logger.info(f"Turn timed out in room {self.room_id}, auto-{action} for seat {player_index}")
+        self.submit(player_index, action, 0, timed_out=True)
+
+    def cancel_timers(self):
+        timers.cancel(self.turn_timer)
+        self.turn_timer = None
+        if self.task is not None:
+            self.task.cancel()
+
+    def settle_hand(self) -> Optional[Hand]:
+        """
+        끝난 판의 손익을 계산하고 정산 기준(settled_chips)을 옮김 (발행할 상태에 함께 들어가도록 발행 전에 호출)
+        """
+        state = self.state
+        if self.recorded_round == state.game_round:
+            return None  # 폴드로 이미 정산된 판에 reveal이 다시 들어온 경우
+        self.recorded_round = state.game_round
+        pot = sum(max(delta, 0) for delta in state.last_payouts.values())
+        if state.winner is None:
+            return Hand(state.game_round, None, pot, {})  # 무승부: 팟이 다음 판으로 넘어가므로 다음 정산에 함께 반영
+        # 판 시작 이후 베팅과 받은 팟을 합친 칩 변화 (무승부로 넘어온 팟에 건 칩 포함)
+        deltas = {seat.name: seat.chips - state.settled_chips.get(seat.name, seat.chips) for seat in state.seats}
+        state.settled_chips = {seat.name: seat.chips for seat in state.seats}
+        return Hand(state.game_round, state.winner, pot, deltas)
+
+    def record_hand(self, hand: Hand):
+        event_writer.submit(hands_table, {
+            "room_id": self.room_id,
+            "game_round": hand.game_round,
+            "winner": hand.winner,
+            "pot": hand.pot,
+        })
+        if hand.winner is not None:
+            record_settlement(self.room_id, hand.game_round, hand.winner, hand.deltas)
+
+class GameEngine:
+    def __init__(self):
+        self.tables: Dict[str, TableActor] = {}
+        self.publish: Publisher = _discard
+        self.load: Loader = _no_state
+        self.room_exists: RoomCheck = _no_room
+
+    def bind_rooms(self, publish: Publisher, load: Loader, room_exists: RoomCheck):
+        """
+        방 모듈과 연결: 결과 상태를 방 브로드캐스트로 발행하고, 테이블이 없을 때 방 상태에서 복원
+        room_exists는 /game_1/start_game이 방의 room_id로 별개의 테이블을 열지 않도록 확인할 때 씀
+        """
+        self.publish = publish
+        self.load = load
+        self.room_exists = room_exists
+
+    def open_table(self, room_id: str, players: List[str]) -> TableState:
+        state = initialize_game(players)
+        self._seat(room_id, state)
+        return state
+
+    def restore_table(self, room_id: str, state: Dict) -> TableActor:
+        """
+        저장된 방 상태에서 테이블을 다시 만듦 (재시작이나 다른 워커가 연 테이블)
+        """
+        return self._seat(room_id, TableState.from_dict(state), state)
+
+    def sync_table(self, room_id: str, state: Dict):
+        """
+        다른 워커가 바꾼 방의 game_state를 이 워커의 테이블에 반영 (테이블이 없으면 다음 행동 때 방 상태에서 복원)
+        행동을 처리 중인 테이블은 그대로 둠: 발행할 때 저장소의 상태가 기준과 달라 어차피 다시 맞춰짐
+        """
+        actor = self.tables.get(room_id)
+        if actor is not None and actor.task is None and actor.base != state:
+            actor.resync(state)
+
+    def _seat(self, room_id: str, state: TableState, base: Optional[Dict] = None) -> TableActor:
+        previous = self.tables.get(room_id)
+        if previous is not None:
+            timers.cancel(previous.turn_timer)  # 교체된 테이블의 제한 시간이 새 테이블에 행동을 넣지 않도록
+        actor = self.tables[room_id] = TableActor(room_id, state, self.publish, base)
+        actor.arm_turn_timer()
+        return actor
+
+    def close_table(self, room_id: str):
+        actor = self.tables.pop(room_id, None)
+        if actor is not None:
+            actor.cancel_timers()
+
+    def get(self, room_id: str) -> Optional[TableActor]:
+        actor = self.tables.get(room_id)
+        if actor is None:
+            state = self.load(room_id)
+            if state is not None:
+                actor = self.restore_table(room_id, state)
+        return actor
+
+    async def submit(self, room_id: str, player_index: int, action: str, bet_amount: int = 0) -> ActionResult:
+        actor = self.get(room_id)
+        if actor is None:
+            raise GameActionError("Game not started")
+        return await actor.submit(player_index, action, bet_amount or 0)
+
+    async def submit_by_name(self, room_id: str, player_name: str, action: str, bet_amount: int = 0) -> ActionResult:
+        actor = self.get(room_id)
+        if actor is None:
+            raise GameActionError("Game not started")
+        player_index = actor.state.seat_index(player_name)
+        if player_index is None:
+            raise GameActionError("Player not seated at this table")
+        return await actor.submit(player_index, action, bet_amount or 0)
+
+async def _discard(room_id: str, state: Dict, base: Dict) -> Optional[Dict]:
+    return None
+
+def _no_state(room_id: str) -> Optional[Dict]:
+    return None
+
+async def _no_room(room_id: str) -> bool:
+    return False
+
+game_engine = GameEngine()
@@ -1,57 +1,130 @@
-from typing import List, Dict, Optional
+from random import randint
+from typing import Dict, List, Optional
 
-def initialize_game(players: List[str]) -> Dict:
+from .state import Seat, TableState
+
+CARD_MIN, CARD_MAX = 1, 10
+FOLD_TEN_PENALTY = 10  # 10을 들고 포기하면 상대에게 추가로 주는 칩
+
+def deal_card() -> int:
+    return randint(CARD_MIN, CARD_MAX)
+
+def initialize_game(players: List[str]) -> TableState:
     """
-    게임 상태 초기화
+    게임 상태 초기화 (각자 카드 한 장씩 받고 0번 자리부터 시작)
     """
-    return {
-        "players": {index: {"name": player, "chips": 30, "card": None} for index, player in enumerate(players)},
-        "current_turn": 0,
-        "pot": 0,
-        "round_completed": False
-    }
+    state = TableState(seats=[Seat(name) for name in players])
+    for seat in state.seats:
+        seat.card = deal_card()
+    state.settled_chips = {seat.name: seat.chips for seat in state.seats}
+    return state
 
-def handle_action(state: Dict, player_index: int, action: str, bet_amount: Optional[int] = 0) -> Dict:
+def handle_action(state: TableState, player_index: int, action: str, bet_amount: Optional[int] = 0) -> Optional[str]:
     """
-    플레이어 행동 처리
+    플레이어 행동 처리, 실패하면 에러 메시지를 반환하고 상태는 바꾸지 않음
     """
-    if player_index != state["current_turn"]:
-        return {"error": "Not your turn"}
-    
+    if state.round_completed:
+        return "Round is already completed"
+    if player_index != state.current_turn:
+        return "Not your turn"
+
+    player = state.seats[player_index]
+    opponent = state.seats[1 - player_index]
+
+    owed = amount_to_call(state, player_index)
     if action == "check":
-        pass  # Check 로직
-    elif action == "bet":
-        if bet_amount <= 0:
-            return {"error": "Bet amount must be greater than zero"}
-        state["pot"] += bet_amount
+        if owed:
+            return "Cannot check, call or fold the current bet"
+    elif action in ("bet", "raise"):
+        if not bet_amount or bet_amount <= 0:
+            return "Bet amount must be greater than zero"
+        if bet_amount > player.chips:
+            return f"Not enough chips to {action}"
+        if bet_amount < owed:
+            return f"Bet must be at least {owed} to match the current bet"
+        put_in(state, player, bet_amount)
     elif action == "fold":
-        state["round_completed"] = True
-        state["winner"] = 1 - player_index
-    elif action == "raise":
-        state["pot"] += bet_amount
+        # 포기 시 상대방이 팟을 가져가고, 10을 들고 포기했으면 벌칙 칩을 추가로 줌
+        penalty = min(FOLD_TEN_PENALTY, player.chips) if player.card == CARD_MAX else 0
+        player.chips -= penalty
+        settle(state, opponent, state.pot + penalty, {player.name: -penalty})
+        return None
     elif action == "call":
-        state["round_completed"] = True
+        # 상대가 더 건 만큼 맞춤, 칩이 모자라면 올인하고 맞추지 못한 상대의 칩은 돌려줌
+        paid = min(owed, player.chips)
+        put_in(state, player, paid)
+        if paid < owed:
+            put_in(state, opponent, paid - owed)
+        state.round_completed = True
     else:
-        return {"error": "Invalid action"}
+        return "Invalid action"
 
     # 턴 변경
-    state["current_turn"] = 1 - player_index
-    return state
+    state.current_turn = 1 - player_index
+    return None
 
-def reveal_winner(state: Dict) -> Dict:
+def amount_to_call(state: TableState, player_index: int) -> int:
     """
-    카드 공개 및 승자 계산
+    이번 판에 상대가 더 건 칩 (call하려면 내야 하는 금액)
     """
-    if not state["round_completed"]:
-        return {"error": "Round not completed"}
+    own = state.bets.get(state.seats[player_index].name, 0)
+    return max(0, max(state.bets.values(), default=0) - own)
+
+def put_in(state: TableState, seat: Seat, amount: int):
+    seat.chips -= amount
+    state.pot += amount
+    state.bets[seat.name] = state.bets.get(seat.name, 0) + amount
 
-    # 각 플레이어의 카드를 랜덤으로 할당 (1 ~ 10)
-    import random
-    for player in state["players"].values():
-        if player["card"] is None:
-            player["card"] = random.randint(1, 10)
-    
-    players = state["players"]
-    winner = max(players.items(), key=lambda x: x[1]["card"])[0]
-    state["winner"] = winner
-    return {"winner": winner}
+def reveal_winner(state: TableState) -> Optional[str]:
+    """
+    카드 공개 및 승자 계산, 무승부면 팟은 다음 판으로 넘어가고 None 반환
+    """
+    if not state.round_completed:
+        raise ValueError("Round not completed")
+    if state.winner is not None:
+        return state.winner  # 폴드로 이미 정산된 판
+
+    for seat in state.seats:
+        if seat.card is None:
+            seat.card = deal_card()
+
+    first, second = state.seats
+    if first.card == second.card:
+        state.last_payouts = {}
+        return None
+    settle(state, first if first.card > second.card else second, state.pot, {})
+    return state.winner
+
+def settle(state: TableState, winner: Seat, amount: int, payouts: dict):
+    winner.chips += amount
+    payouts[winner.name] = payouts.get(winner.name, 0) + amount
+    state.pot = 0
+    state.winner = winner.name
+    state.round_completed = True
+    state.last_payouts = payouts
+
+def next_round(state: TableState):
+    """
+    새 카드를 나눠주고 다음 판 시작 (무승부로 남은 팟은 유지)
+    """
+    state.game_round += 1
+    state.round_completed = False
+    state.winner = None
+    state.last_payouts = {}
+    state.bets = {}
+    state.current_turn = (state.game_round - 1) % len(state.seats)
+    for seat in state.seats:
+        seat.card = deal_card()
+
+def private_view(game_state: Dict, viewer: Optional[str]) -> Dict:
+    """
+    보는 사람별 게임 상태: 베팅이 끝나기 전에는 플레이어에게 자기 카드를, 관전자(viewer=None)에게는 모든 카드를 가림
+    (인디언 포커에서 유일한 비밀은 자기 카드, 관전자가 플레이어에게 알려줄 수도 없게)
+    """
+    if game_state["round_completed"]:
+        return game_state
+    players = {
+        name: {**player, "card": None} if viewer is None or name == viewer else player
+        for name, player in game_state["players"].items()
+    }
+    return {**game_state, "players": players}
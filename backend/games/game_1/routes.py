@@ -1,49 +1,115 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import Dict, Optional
-from .logic import initialize_game, handle_action, reveal_winner
+from typing import List, Optional
+from math import ceil
+from core import metrics
+from core.ratelimit import player_actions
+from .engine import GameActionError, game_engine
+from .logic import CARD_MAX, CARD_MIN, private_view
+from .simulator import MAX_TABLE_BET, equity_rows
 
 router = APIRouter()
 
-# 전역 데이터 (데모용)
-game_states: Dict[str, Dict] = {}
+DEFAULT_TABLE = "game_1"  # room_id 없이 호출하던 기존 클라이언트용 테이블
 
 # 요청 모델
+class StartGameRequest(BaseModel):
+    room_id: str = DEFAULT_TABLE
+    players: List[str] = ["Player 1", "Player 2"]
+
 class ActionRequest(BaseModel):
+    room_id: str = DEFAULT_TABLE
     player_index: int
     action: str
     bet_amount: Optional[int] = 0
 
+class RevealRequest(BaseModel):
+    room_id: str = DEFAULT_TABLE
+
 @router.post("/start_game")
-def start_game():
+async def start_game(request: Optional[StartGameRequest] = None):
     """
     새로운 게임 시작
     """
-    if "game_1" in game_states:
+    request = request or StartGameRequest()
+    if len(request.players) != 2 or request.players[0] == request.players[1]:
+        raise HTTPException(status_code=400, detail="Indian poker needs exactly 2 players with distinct names")
+    if game_engine.get(request.room_id) is not None:
         raise HTTPException(status_code=400, detail="Game already started")
-    game_states["game_1"] = initialize_game(["Player 1", "Player 2"])
-    return {"message": "Game started", "state": game_states["game_1"]}
+    if await game_engine.room_exists(request.room_id):
+        # 아직 시작하지 않은 방: 방과 상관없는 테이블이 그 방에 game_state를 발행하게 됨
+        raise HTTPException(status_code=400, detail="Room id belongs to a lobby room; join the room instead")
+    state = game_engine.open_table(request.room_id, request.players)
+    # 누가 보는지 모르는 응답이므로 관전자처럼 두 카드 모두 가림
+    return {"message": "Game started", "state": private_view(state.to_dict(), None)}
+
+def seat_name(room_id: str, player_index: int) -> Optional[str]:
+    actor = game_engine.get(room_id)
+    if actor is None or not 0 <= player_index < len(actor.state.seats):
+        return None
+    return actor.state.seats[player_index].name
+
+def check_action_rate(room_id: str, player_name: Optional[str]):
+    """
+    방 WebSocket과 같은 플레이어별 버킷 (자리의 플레이어 이름으로 구분), 넘치면 429 + Retry-After
+    """
+    if player_name is None:
+        return  # submit이 400으로 거절
+    key = (room_id, player_name)
+    if not player_actions.allow(key):
+        metrics.rate_limited.inc("player")
+        retry_after = ceil(player_actions.retry_after(key))
+        raise HTTPException(status_code=429, detail="Rate limit exceeded", headers={"Retry-After": str(retry_after)})
 
 @router.post("/player_action")
-def player_action(request: ActionRequest):
+async def player_action(request: ActionRequest):
     """
     플레이어 행동 처리
     """
-    if "game_1" not in game_states:
-        raise HTTPException(status_code=400, detail="Game not started")
-    state = game_states["game_1"]
-    result = handle_action(state, request.player_index, request.action, request.bet_amount)
-    if result.get("error"):
-        raise HTTPException(status_code=400, detail=result["error"])
-    return {"message": "Action processed", "state": state}
+    player_name = seat_name(request.room_id, request.player_index)
+    check_action_rate(request.room_id, player_name)
+    try:
+        result = await game_engine.submit(request.room_id, request.player_index, request.action, request.bet_amount)
+    except GameActionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result.error:
+        raise HTTPException(status_code=400, detail=result.error)
+    # 행동한 플레이어에게는 판이 끝날 때까지 자기 카드를 가린 상태 (방 REST/WebSocket과 같은 규칙)
+    return {"message": "Action processed", "state": private_view(result.state, player_name)}
 
 @router.post("/reveal_cards")
-def reveal_cards():
+async def reveal_cards(request: Optional[RevealRequest] = None):
     """
     카드 공개 및 승자 결정
     """
-    if "game_1" not in game_states:
-        raise HTTPException(status_code=400, detail="Game not started")
-    state = game_states["game_1"]
-    result = reveal_winner(state)
-    return {"message": "Winner revealed", "winner": result["winner"], "state": state}
+    room_id = (request or RevealRequest()).room_id
+    try:
+        result = await game_engine.submit(room_id, 0, "reveal")
+    except GameActionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result.error:
+        raise HTTPException(status_code=400, detail=result.error)
+    # 공개가 성공하면 판이 끝났으므로 모두에게 보이고, 그 전 상태는 관전자 기준으로 가림
+    return {"message": "Winner revealed", "winner": result.winner, "state": private_view(result.state, None)}
+
+@router.get("/equity")
+async def get_equity(
+    visible_card: Optional[int] = Query(None, ge=CARD_MIN, le=CARD_MAX),
+    bet: Optional[int] = Query(None, ge=0, le=MAX_TABLE_BET),
+):
+    """
+    보이는 상대 카드별 승률과 call / fold 기대 손익 (시작 시 계산해 둔 표에서 조회)
+    """
+    rows = equity_rows()
+    if visible_card is None:
+        return rows
+    row = rows[visible_card - CARD_MIN]
+    if bet is None:
+        return row
+    ev_call = row["ev_call"][bet]
+    return {
+        **{key: row[key] for key in ("visible_card", "win", "tie", "lose", "ev_fold")},
+        "bet": bet,
+        "ev_call": ev_call,
+        "recommend": "call" if ev_call >= row["ev_fold"] else "fold",
+    }
@@ -0,0 +1,224 @@
+"""
+NumPy 기반 인디언 포커 일괄 시뮬레이터와 정확한 승률(equity) 표.
+
+한 판의 진행은 엔진과 같은 규칙(logic.handle_action / reveal_winner)을 따릅니다.
+- ante 없이 카드(1~10)를 한 장씩 받음, 각자 상대 카드만 보임
+- 선 플레이어: fold / check / bet, 후 플레이어: bet을 받으면 call(같은 금액을 냄) / fold, check면 call
+- fold하면 상대가 팟을 가져가고, 10을 들고 fold하면 FOLD_TEN_PENALTY를 추가로 줌
+- call이면 카드 공개, 높은 카드가 팟을 가져가며 무승부면 팟은 다음 판으로 넘어감
+손익은 한 판 동안의 칩 변화로 계산하고, 무승부로 넘어간 팟은 다음 판에서 둘 중 하나가 같은 확률로 가져가므로
+절반을 돌려받는 것으로 봅니다 (두 사람이 같은 금액을 냈으므로 무승부의 손익은 0).
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+import random
+
+import numpy as np
+
+from .logic import CARD_MAX, CARD_MIN, FOLD_TEN_PENALTY, handle_action, reveal_winner
+from .state import Seat, TableState
+
+FOLD, CHECK, BET = 0, 1, 2
+CARDS = np.arange(CARD_MIN, CARD_MAX + 1)
+MAX_TABLE_BET = 30  # equity 표에 미리 계산해 두는 최대 베팅 (시작 칩 수)
+
+class Strategy:
+    """
+    베팅 정책 플러그인. 배열 단위로 동작하며 visible은 상대 카드 배열입니다.
+    """
+    name = "base"
+
+    def first_action(self, visible: np.ndarray) -> np.ndarray:
+        """
+        선 플레이어 행동 배열 (FOLD / CHECK / BET)
+        """
+        return np.full(visible.shape, CHECK)
+
+    def bet_size(self, visible: np.ndarray) -> np.ndarray:
+        return np.ones(visible.shape, dtype=np.int64)
+
+    def respond(self, visible: np.ndarray, bet: np.ndarray) -> np.ndarray:
+        """
+        상대 bet에 call 하면 True
+        """
+        return np.ones(visible.shape, dtype=bool)
+
+STRATEGIES: Dict[str, Callable[[], Strategy]] = {}
+
+def register_strategy(name: str):
+    def decorator(factory):
+        factory.name = name
+        STRATEGIES[name] = factory
+        return factory
+    return decorator
+
+@register_strategy("always_call")
+class AlwaysCall(Strategy):
+    pass
+
+@register_strategy("aggressive")
+class Aggressive(Strategy):
+    def first_action(self, visible):
+        return np.full(visible.shape, BET)
+
+    def bet_size(self, visible):
+        return np.full(visible.shape, 3, dtype=np.int64)
+
+@register_strategy("threshold")
+class Threshold(Strategy):
+    """
+    상대 카드가 threshold 이하면 bet/call, 높으면 fold
+    """
+    def __init__(self, threshold: int = 5, bet: int = 2):
+        self.threshold = threshold
+        self.bet = bet
+
+    def first_action(self, visible):
+        return np.where(visible <= self.threshold, BET, FOLD)
+
+    def bet_size(self, visible):
+        return np.full(visible.shape, self.bet, dtype=np.int64)
+
+    def respond(self, visible, bet):
+        return visible <= self.threshold
+
+@register_strategy("equity")
+class EquityStrategy(Strategy):
+    """
+    정확한 equity 표에서 call EV가 fold EV 이상일 때만 call
+    """
+    def first_action(self, visible):
+        table = equity_table()
+        return np.where(table["win"][visible - CARD_MIN] >= 0.5, BET, CHECK)
+
+    def bet_size(self, visible):
+        return np.full(visible.shape, 2, dtype=np.int64)
+
+    def respond(self, visible, bet):
+        table = equity_table()
+        bet = np.minimum(bet, MAX_TABLE_BET)
+        row = visible - CARD_MIN
+        return table["ev_call"][row, bet] >= table["ev_fold"][row]
+
+def deal(rng: np.random.Generator, hands: int) -> np.ndarray:
+    return rng.integers(CARD_MIN, CARD_MAX + 1, size=(2, hands))
+
+def simulate(first: Strategy, second: Strategy, hands: int,
+             rng: Optional[np.random.Generator] = None, cards: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    hands 판을 한꺼번에 시뮬레이션하고 판별 선 플레이어 손익(net)과 결과를 반환
+    """
+    rng = rng or np.random.default_rng()
+    card_a, card_b = deal(rng, hands) if cards is None else cards
+
+    action = first.first_action(card_b)
+    bet = np.where(action == BET, first.bet_size(card_b), 0)
+    called = np.where(action == BET, second.respond(card_a, bet), action == CHECK)
+
+    a_folds = action == FOLD
+    b_folds = (action == BET) & ~called
+    showdown = ~a_folds & ~b_folds
+
+    # 팟에는 선 플레이어의 bet과, call 했다면 같은 금액이 들어감
+    a_paid = bet
+    b_paid = np.where(called, bet, 0)
+    pot = a_paid + b_paid
+
+    a_wins = showdown & (card_a > card_b)
+    b_wins = showdown & (card_b > card_a)
+    net = np.select(
+        [a_folds, b_folds, a_wins, b_wins],
+        [
+            -a_paid - np.where(card_a == CARD_MAX, FOLD_TEN_PENALTY, 0),
+            pot - a_paid + np.where(card_b == CARD_MAX, FOLD_TEN_PENALTY, 0),
+            pot - a_paid,
+            -a_paid,
+        ],
+        default=pot // 2 - a_paid,  # 무승부: 팟은 다음 판으로 넘어가고 그 절반이 기대값
+    )
+    return {"net": net, "showdown": showdown, "a_folds": a_folds, "b_folds": b_folds}
+
+def simulate_scalar(first: Strategy, second: Strategy, hands: int, seed: Optional[int] = None,
+                    cards: Optional[np.ndarray] = None) -> List[int]:
+    """
+    엔진의 handle_action / reveal_winner를 한 판씩 그대로 호출하는 기준 구현 (벤치마크/검증용)
+    """
+    rand = random.Random(seed)
+    results = []
+    for hand in range(hands):
+        if cards is None:
+            card_a, card_b = rand.randint(CARD_MIN, CARD_MAX), rand.randint(CARD_MIN, CARD_MAX)
+        else:
+            card_a, card_b = int(cards[0, hand]), int(cards[1, hand])
+        a, b = Seat("A", 1000, card_a), Seat("B", 1000, card_b)
+        state = TableState(seats=[a, b])
+        before = a.chips
+
+        visible_b = np.array([b.card])
+        action = int(first.first_action(visible_b)[0])
+        if action == FOLD:
+            handle_action(state, 0, "fold")
+        elif action == CHECK:
+            handle_action(state, 0, "check")
+            handle_action(state, 1, "call")
+        else:
+            amount = int(first.bet_size(visible_b)[0])
+            handle_action(state, 0, "bet", amount)
+            if second.respond(np.array([a.card]), np.array([amount]))[0]:
+                handle_action(state, 1, "call")
+            else:
+                handle_action(state, 1, "fold")
+        carried = 0
+        if state.winner is None and reveal_winner(state) is None:
+            carried = state.pot // 2  # 무승부로 다음 판에 넘어간 팟의 절반
+        results.append(a.chips - before + carried)
+    return results
+
+@lru_cache(maxsize=None)
+def equity_table() -> Dict[str, np.ndarray]:
+    """
+    보이는 상대 카드별 정확한 승/무/패 확률과, 상대 bet을 받았을 때 call / fold 기대 손익.
+    내 카드는 1~10 균등 분포 (엔진의 randint와 같음)
+    """
+    visible = CARDS[:, None]
+    own = CARDS[None, :]
+    count = len(CARDS)
+    win = (own > visible).sum(axis=1) / count
+    tie = (own == visible).sum(axis=1) / count
+    lose = (own < visible).sum(axis=1) / count
+
+    # fold: 아직 낸 칩이 없으므로 내 카드가 10일 때의 벌칙만 (내 카드는 모르므로 기대값)
+    ev_fold = -FOLD_TEN_PENALTY / count * np.ones(count)
+    # call: bet만큼 내고 이기면 상대의 bet을 얻음, 무승부는 넘어간 팟의 절반을 돌려받아 0
+    bets = np.arange(MAX_TABLE_BET + 1)[None, :]
+    ev_call = (win - lose)[:, None] * bets
+    return {"win": win, "tie": tie, "lose": lose, "ev_fold": ev_fold, "ev_call": ev_call}
+
+@lru_cache(maxsize=None)
+def equity_rows() -> List[Dict]:
+    table = equity_table()
+    return [
+        {
+            "visible_card": int(card),
+            "win": float(table["win"][index]),
+            "tie": float(table["tie"][index]),
+            "lose": float(table["lose"][index]),
+            "ev_fold": float(table["ev_fold"][index]),
+            "ev_call": [round(float(ev), 4) for ev in table["ev_call"][index]],
+        }
+        for index, card in enumerate(CARDS)
+    ]
+
+def compare_strategies(names: List[str], hands: int, seed: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    정책 쌍마다 선 플레이어의 판당 평균 손익
+    """
+    rng = np.random.default_rng(seed)
+    cards = deal(rng, hands)  # 같은 카드로 비교해 분산을 줄임
+    return {
+        first: {
+            second: float(simulate(STRATEGIES[first](), STRATEGIES[second](), hands, cards=cards)["net"].mean())
+            for second in names
+        }
+        for first in names
+    }
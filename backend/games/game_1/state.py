@@ -0,0 +1,62 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+STARTING_CHIPS = 30
+
+@dataclass(slots=True)
+class Seat:
+    name: str
+    chips: int = STARTING_CHIPS
+    card: Optional[int] = None
+
+@dataclass(slots=True)
+class TableState:
+    """
+    인디언 포커 한 테이블의 상태 (중첩 dict 대신 고정 필드 객체)
+    """
+    seats: List[Seat]
+    current_turn: int = 0  # seats 인덱스
+    pot: int = 0
+    round_completed: bool = False
+    game_round: int = 1
+    winner: Optional[str] = None
+    last_payouts: Dict[str, int] = field(default_factory=dict)  # 마지막 정산에서 플레이어별 칩 변화
+    settled_chips: Dict[str, int] = field(default_factory=dict)  # 마지막 정산 직후의 칩 (원장 손익 기준)
+    bets: Dict[str, int] = field(default_factory=dict)  # 이번 판에 자리별로 건 칩 (call할 금액 계산)
+
+    def seat_index(self, name: str) -> Optional[int]:
+        for index, seat in enumerate(self.seats):
+            if seat.name == name:
+                return index
+        return None
+
+    def to_dict(self) -> Dict:
+        """
+        방 상태(room["game_state"])에 들어가는 기존 dict 형태
+        """
+        return {
+            "players": {seat.name: {"chips": seat.chips, "card": seat.card} for seat in self.seats},
+            "current_turn": self.seats[self.current_turn].name if self.seats else None,
+            "pot": self.pot,
+            "round_completed": self.round_completed,
+            "game_round": self.game_round,
+            "winner": self.winner,
+            "settled_chips": dict(self.settled_chips),
+            "bets": dict(self.bets),  # 테이블을 방 상태에서 복원해도 진행 중인 판의 손익이 이어지도록 저장
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "TableState":
+        seats = [Seat(name, data["chips"], data["card"]) for name, data in state["players"].items()]
+        table = cls(
+            seats=seats,
+            pot=state["pot"],
+            round_completed=state["round_completed"],
+            game_round=state.get("game_round", 1),
+            winner=state.get("winner"),
+            # 기준이 저장되지 않은 이전 상태는 현재 칩부터 (그 판에 이미 건 칩은 손익에서 빠짐)
+            settled_chips=state.get("settled_chips") or {seat.name: seat.chips for seat in seats},
+            bets=dict(state.get("bets") or {}),
+        )
+        table.current_turn = table.seat_index(state["current_turn"]) or 0
+        return table
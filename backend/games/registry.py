@@ -0,0 +1,101 @@
+# games/registry.py
+"""
+게임 플러그인 레지스트리.
+
+games/__init__.py는 game_type → 모듈 경로만 선언하고, 실제 게임 패키지는 그 game_type의 방이 처음
+만들어지거나 그 게임의 REST prefix로 첫 요청이 올 때 import 합니다. import된 패키지는 register_game()으로
+초기화 함수, 행동 처리 엔진, 라우터를 등록하고, 방 모듈과 앱은 on_game_loaded() 콜백으로 연결됩니다.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import asyncio
+import importlib
+import logging
+import time
+
+from fastapi import APIRouter
+from pydantic import TypeAdapter
+
+logger = logging.getLogger("games.registry")
+
+class GameActionError(Exception):
+    """
+    게임 엔진이 행동을 받을 수 없을 때 (테이블 없음, 자리에 없는 플레이어 등)
+    """
+
+class GamePlugin(NamedTuple):
+    game_type: str
+    prefix: str  # REST 라우터 prefix (예: /game_1)
+    router: APIRouter
+    engine: Any  # restore_table / sync_table / close_table / submit_by_name / bind_rooms 제공
+    initialize: Callable[[List[str]], Dict]  # 플레이어 이름 목록 → 방에 저장할 game_state
+    max_players: int = 2
+    warmup: Optional[Callable[[], Any]] = None  # 로드 직후 백그라운드에서 실행할 준비 작업 (캐시 계산 등)
+    # (game_state, 보는 플레이어 이름, 관전자나 이름 없는 요청은 None) → 그 사람에게 보낼 game_state (없으면 모두에게 그대로)
+    private_view: Optional[Callable[[Dict, Optional[str]], Dict]] = None
+    state_model: Optional[TypeAdapter] = None  # game_state 타입 모델 (없으면 방 캐시에 dict 그대로)
+
+GAME_MODULES: Dict[str, str] = {}  # game_type → 모듈 경로 (import 전 선언)
+GAME_PREFIXES: Dict[str, str] = {}  # REST prefix → game_type
+games: Dict[str, GamePlugin] = {}
+_loaded_callbacks: List[Callable[[GamePlugin], None]] = []
+
+def declare_game(game_type: str, module: str, prefix: str):
+    GAME_MODULES[game_type] = module
+    GAME_PREFIXES[prefix] = game_type
+
+def register_game(plugin: GamePlugin):
+    """
+    게임 패키지가 import될 때 호출
+    """
+    games[plugin.game_type] = plugin
+    for callback in _loaded_callbacks:
+        callback(plugin)
+
+def on_game_loaded(callback: Callable[[GamePlugin], None]):
+    """
+    게임이 로드될 때마다 호출할 콜백 등록 (이미 로드된 게임에는 바로 호출)
+    """
+    _loaded_callbacks.append(callback)
+    for plugin in list(games.values()):
+        callback(plugin)
+
+def get_game(game_type: str) -> Optional[GamePlugin]:
+    """
+    game_type의 플러그인, 처음 요청될 때 패키지를 import (선언되지 않은 game_type이면 None)
+    """
+    plugin = games.get(game_type)
+    if plugin is not None:
+        return plugin
+    module = GAME_MODULES.get(game_type)
+    if module is None:
+        return None
+
+    started = time.perf_counter()
+    importlib.import_module(module)
+    plugin = games.get(game_type)
+    if plugin is None:
+        raise RuntimeError(f"{module} did not register game type {game_type}")
+    logger.info(f"Loaded game {game_type} from {module} in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    if plugin.warmup is not None:
+        try:
+            asyncio.get_running_loop().run_in_executor(None, plugin.warmup)
+        except RuntimeError:
+            pass  # 이벤트 루프 밖(스크립트 등)에서는 필요할 때 계산
+    return plugin
+
+class LazyGameRoutesMiddleware:
+    """
+    아직 로드되지 않은 게임의 REST prefix로 요청이 오면 라우팅 전에 그 게임을 로드
+    (방 없이 /game_1/... API를 바로 쓰는 기존 클라이언트용)
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and len(games) < len(GAME_MODULES):
+            path = scope["path"]
+            for prefix, game_type in GAME_PREFIXES.items():
+                if game_type not in games and (path == prefix or path.startswith(prefix + "/")):
+                    get_game(game_type)
+        await self.app(scope, receive, send)
@@ -0,0 +1,4 @@
+# leaderboard/__init__.py
+from .routes import router
+
+__all__ = ["router"]
@@ -0,0 +1,68 @@
+# leaderboard/index.py
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class PlayerStats:
+    __slots__ = ("player_name", "hands", "wins", "net")
+
+    def __init__(self, player_name: str, hands: int = 0, wins: int = 0, net: int = 0):
+        self.player_name = player_name
+        self.hands = hands  # 정산된 판 수 (무승부로 넘어간 판은 다음 정산에 포함)
+        self.wins = wins
+        self.net = net  # 누적 칩 손익
+
+    def to_dict(self, rank: int) -> Dict:
+        return {
+            "rank": rank,
+            "player_name": self.player_name,
+            "net_chips": self.net,
+            "hands": self.hands,
+            "wins": self.wins,
+            "win_rate": self.wins / self.hands if self.hands else 0.0,
+        }
+
+class LeaderboardIndex:
+    """
+    플레이어별 누적 통계와 (-누적 손익, 이름)으로 정렬된 순위 리스트를 정산마다 증분으로 갱신합니다.
+
+    상위 K명은 리스트 앞부분을 잘라 O(K)로, 한 플레이어의 순위는 bisect로 O(log n)에 찾습니다.
+    (조회마다 전체 플레이어를 정렬하지 않음)
+    """
+    def __init__(self):
+        self.players: Dict[str, PlayerStats] = {}
+        self.ranking: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def record(self, player_name: str, delta: int, won: bool):
+        stats = self.players.get(player_name)
+        if stats is None:
+            stats = self.players[player_name] = PlayerStats(player_name)
+        else:
+            index = bisect_left(self.ranking, (-stats.net, player_name))
+            del self.ranking[index]
+        stats.hands += 1
+        stats.wins += won
+        stats.net += delta
+        insort(self.ranking, (-stats.net, player_name))
+
+    def load(self, rows: Iterable[Tuple[str, int, int, int]]):
+        """
+        (player_name, hands, wins, net) 집계 결과로 인덱스를 다시 만듦
+        """
+        self.players = {name: PlayerStats(name, hands, wins, net) for name, hands, wins, net in rows}
+        self.ranking = sorted((-stats.net, name) for name, stats in self.players.items())
+
+    def top(self, limit: int, offset: int = 0) -> List[Dict]:
+        return [
+            self.players[name].to_dict(rank)
+            for rank, (_, name) in enumerate(self.ranking[offset:offset + limit], start=offset + 1)
+        ]
+
+    def get(self, player_name: str) -> Optional[Dict]:
+        stats = self.players.get(player_name)
+        if stats is None:
+            return None
+        return stats.to_dict(bisect_left(self.ranking, (-stats.net, player_name)) + 1)
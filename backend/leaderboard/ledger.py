@@ -0,0 +1,52 @@
+# leaderboard/ledger.py
+"""
+칩 원장과 리더보드.
+
+게임 엔진이 판을 정산할 때마다 record_settlement()를 호출하면 플레이어별 칩 변화를 chip_ledger 테이블에
+(write-behind로) 남기고, 같은 내용으로 메모리의 리더보드 인덱스를 갱신합니다.
+시작할 때는 chip_ledger를 플레이어별로 집계해 인덱스를 다시 만듭니다.
+(인덱스는 워커마다 따로 가지므로 여러 워커면 다른 워커의 정산은 재시작 때 반영됨)
+"""
+from typing import Dict, Optional
+import logging
+
+from sqlalchemy import case, func, select
+
+from core import metrics
+from database import chip_ledger_table, engine, event_writer
+from .index import LeaderboardIndex
+
+logger = logging.getLogger("leaderboard")
+
+WIN, LOSS = "win", "loss"  # chip_ledger.reason
+
+leaderboard = LeaderboardIndex()
+
+metrics.REGISTRY.callback_gauge("leaderboard_players", "Players tracked by the in-memory leaderboard", lambda: len(leaderboard))
+
+def record_settlement(room_id: str, game_round: int, winner: Optional[str], deltas: Dict[str, int]):
+    """
+    정산된 판 하나: deltas = 플레이어별 칩 변화 (판 시작 이후 베팅과 받은 팟을 합친 값)
+    """
+    for player_name, delta in deltas.items():
+        won = player_name == winner
+        event_writer.submit(chip_ledger_table, {
+            "room_id": room_id,
+            "game_round": game_round,
+            "player_name": player_name,
+            "delta": delta,
+            "reason": WIN if won else LOSS,
+        })
+        leaderboard.record(player_name, delta, won)
+
+async def load_leaderboard():
+    query = select(
+        chip_ledger_table.c.player_name,
+        func.count(),
+        func.sum(case((chip_ledger_table.c.reason == WIN, 1), else_=0)),
+        func.sum(chip_ledger_table.c.delta),
+    ).group_by(chip_ledger_table.c.player_name)
+    async with engine.connect() as conn:
+        rows = (await conn.execute(query)).all()
+    leaderboard.load(rows)
+    logger.info(f"Leaderboard rebuilt for {len(leaderboard)} players")
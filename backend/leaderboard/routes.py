@@ -0,0 +1,21 @@
+# leaderboard/routes.py
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .ledger import leaderboard
+
+router = APIRouter()
+
+@router.get("/")
+async def get_leaderboard(limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
+    """
+    누적 칩 손익 순위 (메모리 인덱스에서 limit명만 잘라 반환)
+    """
+    return leaderboard.top(limit, offset)
+
+@router.get("/players/{player_name}")
+async def get_player_stats(player_name: str):
+    stats = leaderboard.get(player_name)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return stats
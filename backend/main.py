@@ -1,18 +1,27 @@
 # main.py
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from rooms.routes import router as rooms_router
-from games.game_1.routes import router as game_1_router
+from fastapi.responses import PlainTextResponse
+from core.log import setup_logging, shutdown_logging
+from core.metrics import REGISTRY, RequestMetricsMiddleware
+from core.timers import timers
+from database import event_writer, init_db
+from eventlog import event_log
+from games.registry import GamePlugin, LazyGameRoutesMiddleware, on_game_loaded
+from leaderboard import router as leaderboard_router
+from leaderboard.ledger import load_leaderboard
+from rooms.routes import router as rooms_router, start_room_store, stop_room_store
 import logging
 from contextlib import asynccontextmanager
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging(logging.INFO)
 
 logger = logging.getLogger("main")
 
+REGISTRY.callback_gauge("event_writer_pending", "Game events waiting for write-behind flush", lambda: event_writer.pending)
+REGISTRY.callback_gauge("event_writer_written", "Game events written by write-behind queue", lambda: event_writer.written)
+REGISTRY.callback_gauge("event_writer_dropped", "Game events dropped because the queue was full", lambda: event_writer.dropped)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
@@ -21,25 +30,48 @@ async def lifespan(app: FastAPI):
             print(f"WebSocket Path: {route.path}")
         elif hasattr(route, "methods"):
             print(f"Path: {route.path}, Methods: {route.methods}")
+    await init_db()
+    await load_leaderboard()  # 칩 원장을 플레이어별로 집계해 순위 인덱스를 다시 만듦
+    await event_writer.start()
+    recovered = await event_log.start()  # 로그를 끝까지 읽어 살아 있는 방 상태를 복원
+    await start_room_store(recovered)
+    timers.start()  # 차례 제한 시간, 유휴 방 정리, WebSocket heartbeat를 하나의 태스크로 처리
     yield
     print("Shutting down...")
+    await timers.close()
+    await stop_room_store()
+    await event_writer.close()  # 남은 게임 이벤트를 모두 기록한 뒤 종료
+    await event_log.close()
+    shutdown_logging()
 
 app = FastAPI(lifespan=lifespan)
 
 # prefix="/room" → 결국 /room/... 형태로 REST, WS 엔드포인트 노출
 app.include_router(rooms_router, prefix="/room", tags=["Room"])
-app.include_router(game_1_router, prefix="/game_1", tags=["Game 1"])
+app.include_router(leaderboard_router, prefix="/leaderboard", tags=["Leaderboard"])
+
+def include_game_router(game: GamePlugin):
+    # 게임 패키지는 처음 쓰일 때 import되므로 그때 라우터를 붙이고 OpenAPI 스키마를 다시 만들게 함
+    app.include_router(game.router, prefix=game.prefix, tags=[game.game_type])
+    app.openapi_schema = None
+
+on_game_loaded(include_game_router)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],  # 브라우저에서 읽을 수 있도록 노출
 )
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"Request path: {request.url.path}, Method: {request.method}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
+# 라우트별 지연 시간 기록 + 샘플링된 접근 로그
+# (BaseHTTPMiddleware 대신 순수 ASGI로 요청당 오버헤드 최소화)
+app.add_middleware(RequestMetricsMiddleware)
+
+# 아직 로드되지 않은 게임의 REST prefix로 요청이 오면 라우팅 전에 로드
+app.add_middleware(LazyGameRoutesMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,76 @@
+# rooms/broadcaster.py
+
+from typing import Awaitable, Callable, Dict, Optional
+import logging
+import asyncio
+
+from core.metrics import broadcast_updates
+
+logger = logging.getLogger("room.broadcaster")
+
+class RoomBroadcaster:
+    """
+    방 하나당 하나의 장기 실행 태스크로 상태를 전송합니다.
+
+    mark_dirty()는 전송을 예약만 하고, window(초) 안에 들어온 변경은 한 번의 전송으로 합칩니다.
+    전송 시점에 최신 상태를 읽으므로 중간 상태는 건너뛰되 마지막 상태는 항상 전달됩니다.
+    """
+    def __init__(self, room_id: str, send: Callable[[str], Awaitable[None]], window: float = 0.0):
+        self.room_id = room_id
+        self.window = window
+        self._send = send
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending = 0  # 마지막 전송 이후 들어온 변경 수
+        self.updates = 0
+        self.sent = 0
+        self.coalesced = 0  # 다른 변경과 합쳐져 별도로 전송되지 않은 변경 수
+        self.dropped = 0  # 전송 전에 방이 닫혀 전달되지 못한 변경 수
+
+    def mark_dirty(self):
+        self.updates += 1
+        self._pending += 1
+        self._dirty.set()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._dirty.wait()
+            if self.window:
+                await asyncio.sleep(self.window)
+            # 전송 도중 들어온 변경은 이벤트를 다시 세워 다음 회차에서 처리
+            self._dirty.clear()
+            merged, self._pending = self._pending, 0
+            self.coalesced += merged - 1
+            if merged > 1:
+                broadcast_updates.inc("coalesced", amount=merged - 1)
+            try:
+                await self._send(self.room_id)
+                self.sent += 1
+                broadcast_updates.inc("sent")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Broadcast failed for room {self.room_id}")
+
+    async def close(self):
+        self.dropped += self._pending
+        if self._pending:
+            broadcast_updates.inc("dropped", amount=self._pending)
+        self._pending = 0
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "updates": self.updates,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,82 @@
+# rooms/codec.py
+
+from typing import Dict, List, Optional, Union
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 JSON 프로토콜만 제공
+    msgpack = None
+
+COMPRESS_MIN_SIZE = 256  # 이보다 작은 메시지는 압축해도 이득이 거의 없어 그대로 전송
+FLAG_RAW, FLAG_DEFLATE = 0, 1  # 바이너리 프레임 첫 바이트: 뒤따르는 msgpack의 압축 여부
+
+class JsonCodec:
+    """
+    기존 클라이언트용 텍스트 JSON (서브프로토콜을 요청하지 않은 연결의 기본값)
+    """
+    subprotocol = "gom.json.v1"
+
+    def encode(self, message: Dict) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    def decode(self, data: Union[str, bytes]) -> Dict:
+        return json.loads(data)
+
+class MsgpackCodec:
+    """
+    바이너리 프레임 = 플래그 1바이트 + msgpack (compress=True면 큰 메시지는 raw deflate로 압축)
+    """
+    def __init__(self, subprotocol: str, compress: bool):
+        self.subprotocol = subprotocol
+        self.compress = compress
+
+    def encode(self, message: Dict) -> bytes:
+        packed = msgpack.packb(message, use_bin_type=True)
+        if self.compress and len(packed) >= COMPRESS_MIN_SIZE:
+            deflater = zlib.compressobj(6, zlib.DEFLATED, -15)  # 헤더 없는 raw deflate (브라우저 "deflate-raw")
+            return bytes((FLAG_DEFLATE,)) + deflater.compress(packed) + deflater.flush()
+        return bytes((FLAG_RAW,)) + packed
+
+    def decode(self, data: Union[str, bytes]) -> Dict:
+        if isinstance(data, str):
+            return json.loads(data)  # 바이너리 프로토콜 클라이언트도 요청은 텍스트 JSON으로 보낼 수 있음
+        body = data[1:]
+        if data[0] == FLAG_DEFLATE:
+            body = zlib.decompress(body, -15)
+        return msgpack.unpackb(body, raw=False)
+
+Codec = Union[JsonCodec, MsgpackCodec]
+
+JSON_CODEC = JsonCodec()
+CODECS: Dict[str, Codec] = {JSON_CODEC.subprotocol: JSON_CODEC}
+if msgpack is not None:
+    for codec in (MsgpackCodec("gom.msgpack.deflate.v1", compress=True), MsgpackCodec("gom.msgpack.v1", compress=False)):
+        CODECS[codec.subprotocol] = codec
+
+def negotiate(offered: List[str]) -> Optional[Codec]:
+    """
+    클라이언트가 선호 순서대로 보낸 서브프로토콜 중 서버가 지원하는 첫 번째 (없으면 None)
+    """
+    for subprotocol in offered:
+        codec = CODECS.get(subprotocol)
+        if codec is not None:
+            return codec
+    return None
+
+class Outbound:
+    """
+    방의 모든 연결에 보낼 메시지 하나, 코덱별 인코딩 결과는 처음 요청될 때 한 번만 만듦
+    """
+    __slots__ = ("message", "encoded")
+
+    def __init__(self, message: Dict):
+        self.message = message
+        self.encoded: Dict[str, Union[str, bytes]] = {}
+
+    def encode(self, codec: Codec) -> Union[str, bytes]:
+        payload = self.encoded.get(codec.subprotocol)
+        if payload is None:
+            payload = self.encoded[codec.subprotocol] = codec.encode(self.message)
+        return payload
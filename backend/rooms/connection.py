@@ -0,0 +1,153 @@
+# rooms/connection.py
+"""
+방 WebSocket 연결 하나의 송신 큐와 writer 태스크.
+
+브로드캐스트는 연결마다 큐에 넣기만 하고(await 없음, 방 락을 오래 잡지 않음), 연결별 writer 태스크가
+순서대로 꺼내 전송합니다. 큐가 limit만큼 쌓이면(느린 클라이언트) policy에 따라
+- "latest": 쌓인 스냅샷/패치를 버리고 다음 전송 때 그 시점의 최신 스냅샷 하나로 대신함
+  (최신 스냅샷이 버린 변경을 모두 담고 있고, 이후 패치는 그 스냅샷을 기준으로 이어짐)
+- "disconnect": 연결을 끊음
+에러/ping 같은 제어 메시지는 버리지 않습니다.
+"""
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple, Union
+import asyncio
+import logging
+
+from fastapi import WebSocket
+
+from core import metrics
+from core.ratelimit import TokenBucket
+from .codec import Codec, Outbound
+
+logger = logging.getLogger("room.connection")
+
+LATEST, DISCONNECT = "latest", "disconnect"
+SLOW_CONSUMER_POLICIES = (LATEST, DISCONNECT)
+
+Message = Union[str, Outbound]
+
+class ClientConnection:
+    __slots__ = (
+        "websocket", "room_id", "view", "codec", "limit", "policy", "send_timeout",
+        "latest", "on_failure", "queue", "wakeup", "task", "resync", "dropped", "inbound", "strikes",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        view: str,
+        codec: Codec,
+        latest: Callable[[], Optional[Outbound]],
+        on_failure: Callable[["ClientConnection"], Awaitable[None]],
+        limit: int = 32,
+        policy: str = LATEST,
+        send_timeout: float = 2.0,
+        inbound: Optional[TokenBucket] = None,
+    ):
+        self.websocket = websocket
+        self.room_id = room_id
+        self.view = view
+        self.codec = codec
+        self.latest = latest  # 이 연결이 보는 방 상태의 최신 스냅샷 메시지
+        self.on_failure = on_failure
+        self.limit = limit
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.queue: Deque[Tuple[Message, bool]] = deque()  # (메시지, 최신 스냅샷으로 대체 가능 여부)
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.resync = False  # 다음 전송을 최신 스냅샷으로
+        self.dropped = 0
+        self.inbound = inbound  # 받는 메시지 속도 제한 (None이면 제한 없음)
+        self.strikes = 0  # 버킷이 빈 상태에서 연속으로 온 메시지 수
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self.queue.clear()
+
+    def push(self, message: Message, replaceable: bool = False):
+        """
+        replaceable: 방 상태 스냅샷/패치 (느린 연결에서는 최신 스냅샷으로 대체될 수 있음)
+        """
+        if self.task is None:
+            return
+        if replaceable and self.resync:
+            self.dropped += 1
+            metrics.dropped_frames.inc()
+            return
+        if len(self.queue) >= self.limit:
+            if not self._shed():
+                return
+            if replaceable:
+                self.dropped += 1  # 재동기화 스냅샷에 포함됨
+                metrics.dropped_frames.inc()
+                return
+        self.queue.append((message, replaceable))
+        self.wakeup.set()
+
+    def _shed(self) -> bool:
+        """
+        큐가 가득 찼을 때 policy 적용, 연결을 유지하면 True
+        """
+        if self.policy == LATEST:
+            kept = deque(item for item in self.queue if not item[1])
+            shed = len(self.queue) - len(kept)
+            if len(kept) < self.limit:
+                self.queue = kept
+                self.dropped += shed
+                metrics.dropped_frames.inc(amount=shed)
+                metrics.slow_consumers.inc(LATEST)
+                self.resync = True
+                self.wakeup.set()
+                return True
+        metrics.slow_consumers.inc(DISCONNECT)
+        logger.info(f"Disconnecting slow client in room {self.room_id} ({len(self.queue)} frames queued)")
+        self._fail()
+        return False
+
+    def _fail(self):
+        task, self.task = self.task, None
+        self.queue.clear()
+        # 자기 태스크 안에서 불릴 수 있으므로 정리는 별도 태스크로 (정리하면서 writer를 취소함)
+        asyncio.get_running_loop().create_task(self.on_failure(self))
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _run(self):
+        while True:
+            if self.resync:
+                self.resync = False
+                message = self.latest()
+                if message is None:
+                    continue
+            elif self.queue:
+                message, _ = self.queue.popleft()
+            else:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            try:
+                await self.send(message)
+            except Exception as e:
+                logger.error(f"Failed to send to client in room {self.room_id}: {e!r}")
+                self._fail()
+                return
+
+    async def send(self, message: Message):
+        """
+        Outbound는 연결이 협상한 코덱으로 인코딩 (같은 코덱·같은 메시지는 인코딩 결과를 공유)
+        """
+        if isinstance(message, Outbound):
+            payload = message.encode(self.codec)
+            send = self.websocket.send_bytes(payload) if isinstance(payload, bytes) else self.websocket.send_text(payload)
+        else:
+            send = self.websocket.send_text(message)
+        await asyncio.wait_for(send, timeout=self.send_timeout)
@@ -0,0 +1,102 @@
+# rooms/lobby.py
+
+from bisect import bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from core.models import Room, RoomSummary
+
+def room_summary(room: Room) -> RoomSummary:
+    """
+    로비 목록에 보여줄 방 요약 (game_state 같은 큰 필드는 제외)
+    """
+    return {
+        "room_id": room.room_id,
+        "game_type": room.game_type,
+        "status": room.status,
+        "players": [player.player_name for player in room.players],
+    }
+
+class LobbyIndex:
+    """
+    방 요약과 status/game_type별 보조 인덱스를 생성·참가·삭제 때마다 증분으로 갱신합니다.
+
+    각 인덱스는 room_id로 정렬된 리스트라서 커서(마지막으로 받은 room_id) 이후 페이지를
+    bisect로 바로 찾고, 필터에 맞는 방만 훑습니다. (목록 요청마다 전체 방을 순회하지 않음)
+    """
+    def __init__(self):
+        self.summaries: Dict[str, RoomSummary] = {}
+        self.ordered: List[str] = []
+        self.by_status: Dict[str, List[str]] = {}
+        self.by_game_type: Dict[str, List[str]] = {}
+
+    def upsert(self, room: Room) -> Optional[Tuple[str, RoomSummary]]:
+        """
+        요약이 바뀐 경우에만 (이벤트 종류, 요약)을 반환 (게임 진행만 바뀐 경우 None)
+        """
+        summary = room_summary(room)
+        room_id = summary["room_id"]
+        previous = self.summaries.get(room_id)
+        if previous == summary:
+            return None
+        if previous is None:
+            insort(self.ordered, room_id)
+            event = "room-added"
+        else:
+            self._unindex(previous)
+            event = "room-changed"
+        self.summaries[room_id] = summary
+        insort(self.by_status.setdefault(summary["status"], []), room_id)
+        insort(self.by_game_type.setdefault(summary["game_type"], []), room_id)
+        return event, summary
+
+    def remove(self, room_id: str) -> Optional[RoomSummary]:
+        summary = self.summaries.pop(room_id, None)
+        if summary is None:
+            return None
+        self._unindex(summary)
+        _discard(self.ordered, room_id)
+        return summary
+
+    def _unindex(self, summary: RoomSummary):
+        room_id = summary["room_id"]
+        for index, key in ((self.by_status, summary["status"]), (self.by_game_type, summary["game_type"])):
+            bucket = index[key]
+            _discard(bucket, room_id)
+            if not bucket:
+                del index[key]
+
+    def page(
+        self,
+        status: Optional[str] = None,
+        game_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[RoomSummary], Optional[str]]:
+        """
+        cursor 이후의 방을 limit개까지 반환하고, 다음 페이지가 있으면 다음 커서도 반환
+        """
+        # 더 작은 인덱스를 훑고 나머지 조건은 요약에서 확인
+        candidates = [self.ordered]
+        if status is not None:
+            candidates.append(self.by_status.get(status, []))
+        if game_type is not None:
+            candidates.append(self.by_game_type.get(game_type, []))
+        ids = min(candidates, key=len)
+
+        start = bisect_right(ids, cursor) if cursor is not None else 0
+        page: List[RoomSummary] = []
+        for i in range(start, len(ids)):
+            summary = self.summaries[ids[i]]
+            if status is not None and summary["status"] != status:
+                continue
+            if game_type is not None and summary["game_type"] != game_type:
+                continue
+            if len(page) == limit:
+                return page, page[-1]["room_id"]
+            page.append(summary)
+        return page, None
+
+def _discard(ids: List[str], room_id: str):
+    i = bisect_right(ids, room_id) - 1
+    if i >= 0 and ids[i] == room_id:
+        del ids[i]
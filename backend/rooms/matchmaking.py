@@ -0,0 +1,124 @@
+# rooms/matchmaking.py
+"""
+자동 매칭 대기열.
+
+대기 중인 플레이어를 (game_type, 칩 구간)별 힙에 들어온 순서대로 넣고, 새 플레이어가 오면
+자기 구간부터 양옆 구간으로 넓혀 가며 각 힙의 맨 앞(가장 오래 기다린 플레이어)만 확인합니다.
+- 칩 구간 = chips // bracket_size
+- 기다린 시간 widen_interval초마다 받아들이는 구간 차이가 1씩 늘어남 (최대 max_widen)
+- 두 플레이어의 구간 차이가 둘 중 더 넓어진 쪽의 허용 범위 안이면 매칭
+
+구간 안에서는 오래 기다린 플레이어일수록 허용 범위가 넓으므로 힙의 맨 앞만 보면 충분하고,
+등록/매칭/취소 모두 O(max_widen · log n) 입니다. 취소된 표는 힙 맨 앞에 올 때 버립니다.
+"""
+from heapq import heappop, heappush
+from typing import Callable, Dict, List, Optional, Tuple
+import itertools
+import time
+
+class Ticket:
+    __slots__ = ("player_name", "game_type", "chips", "bracket", "seq", "enqueued", "cancelled")
+
+    def __init__(self, player_name: str, game_type: str, chips: int, bracket: int, seq: int, enqueued: float):
+        self.player_name = player_name
+        self.game_type = game_type
+        self.chips = chips
+        self.bracket = bracket
+        self.seq = seq
+        self.enqueued = enqueued
+        self.cancelled = False
+
+class MatchQueue:
+    def __init__(
+        self,
+        bracket_size: int = 10,
+        widen_interval: float = 5.0,
+        max_widen: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.bracket_size = bracket_size
+        self.widen_interval = widen_interval
+        self.max_widen = max_widen
+        self.clock = clock
+        self.heaps: Dict[Tuple[str, int], List[Tuple[int, Ticket]]] = {}  # (game_type, 구간) → (seq, 표) 힙
+        self.waiting: Dict[str, Ticket] = {}  # player_name → 대기 중인 표
+        self.matched = 0
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.waiting)
+
+    def widen(self, ticket: Ticket, now: float) -> int:
+        """
+        기다린 시간에 따라 넓어진 허용 구간 차이
+        """
+        return min(self.max_widen, int((now - ticket.enqueued) / self.widen_interval))
+
+    def enqueue(self, player_name: str, game_type: str, chips: int) -> Tuple[Ticket, Optional[Ticket]]:
+        """
+        대기열에 넣고 (표, 상대)를 반환, 바로 상대를 찾으면 두 표 모두 대기열에 남지 않음
+        """
+        if player_name in self.waiting:
+            raise ValueError("Player already in matchmaking queue")
+        now = self.clock()
+        ticket = Ticket(player_name, game_type, chips, max(0, chips) // self.bracket_size, next(self._seq), now)
+        partner = self._find(ticket, now)
+        if partner is not None:
+            self._take(partner)
+            self.matched += 1
+            return ticket, partner
+        heappush(self.heaps.setdefault((game_type, ticket.bracket), []), (ticket.seq, ticket))
+        self.waiting[player_name] = ticket
+        return ticket, None
+
+    def rematch(self, ticket: Ticket) -> Optional[Ticket]:
+        """
+        허용 범위가 넓어진 대기 표로 다시 상대를 찾음 (찾으면 두 표 모두 대기열에서 빠짐)
+        """
+        if ticket.cancelled or self.waiting.get(ticket.player_name) is not ticket:
+            return None
+        partner = self._find(ticket, self.clock())
+        if partner is None:
+            return None
+        self._take(ticket)
+        self._take(partner)
+        self.matched += 1
+        return partner
+
+    def cancel(self, player_name: str) -> Optional[Ticket]:
+        ticket = self.waiting.pop(player_name, None)
+        if ticket is not None:
+            ticket.cancelled = True  # 힙에서는 맨 앞에 올 때 제거
+        return ticket
+
+    def _take(self, ticket: Ticket):
+        self.cancel(ticket.player_name)
+        self._head(ticket.game_type, ticket.bracket)  # 맨 앞이었다면 바로 정리
+
+    def _head(self, game_type: str, bracket: int) -> Optional[Ticket]:
+        key = (game_type, bracket)
+        heap = self.heaps.get(key)
+        if heap is None:
+            return None
+        while heap and heap[0][1].cancelled:
+            heappop(heap)
+        if not heap:
+            del self.heaps[key]
+            return None
+        return heap[0][1]
+
+    def _find(self, ticket: Ticket, now: float) -> Optional[Ticket]:
+        own = self.widen(ticket, now)
+        for distance in range(self.max_widen + 1):
+            best = None
+            for bracket in {ticket.bracket - distance, ticket.bracket + distance}:
+                candidate = self._head(ticket.game_type, bracket)
+                if candidate is None or candidate is ticket:
+                    continue
+                if distance > max(own, self.widen(candidate, now)):
+                    continue
+                if best is None or candidate.seq < best.seq:
+                    best = candidate
+            if best is not None:
+                return best
+        return None
@@ -0,0 +1,124 @@
+# rooms/pubsub.py
+"""
+같은 호스트의 워커 프로세스끼리 방 변경 알림을 주고받는 Unix 소켓 허브.
+
+락 파일을 먼저 잡은 워커가 허브(서버)가 되고, 나머지 워커는 허브에 접속합니다.
+허브 워커가 죽으면 락이 풀리므로 남은 워커 중 하나가 허브를 이어받습니다.
+메시지는 한 줄짜리 JSON이며, 허브는 받은 메시지를 보낸 쪽을 제외한 모두에게 전달합니다.
+"""
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import fcntl
+import json
+import logging
+import os
+
+logger = logging.getLogger("room.pubsub")
+
+Handler = Callable[[Dict], Awaitable[None]]
+
+RECONNECT_DELAY = 0.2
+
+class LocalHub:
+    def __init__(self, path: str, handler: Handler):
+        self.path = path
+        self.handler = handler
+        self.is_hub = False
+        self._lock_file = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: List[asyncio.StreamWriter] = []
+        self._upstream: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for writer in self._peers + ([self._upstream] if self._upstream else []):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+    def publish(self, message: Dict):
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        if self.is_hub:
+            self._relay(line, None)
+        elif self._upstream is not None:
+            self._upstream.write(line)
+        else:
+            logger.warning(f"Hub not connected, dropping notification: {message}")
+
+    def _try_become_hub(self) -> bool:
+        lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    async def _run(self):
+        while not self._closing:
+            if self._try_become_hub():
+                await self._serve()
+                return
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            self._upstream = writer
+            logger.info(f"Connected to room hub at {self.path}")
+            await self._consume(reader)
+            self._upstream = None
+            logger.warning("Lost connection to room hub, reconnecting")
+
+    async def _serve(self):
+        try:
+            os.unlink(self.path)  # 이전 허브가 남긴 소켓 파일 정리 (락을 잡았으므로 안전)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._accept, path=self.path)
+        self.is_hub = True
+        logger.info(f"Serving room hub at {self.path}")
+        await asyncio.Event().wait()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._peers.append(writer)
+        try:
+            while line := await reader.readline():
+                self._relay(line, writer)
+                await self._dispatch(line)
+        finally:
+            self._peers.remove(writer)
+            writer.close()
+
+    def _relay(self, line: bytes, origin: Optional[asyncio.StreamWriter]):
+        for peer in self._peers:
+            if peer is not origin:
+                peer.write(line)
+
+    async def _consume(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            await self._dispatch(line)
+
+    async def _dispatch(self, line: bytes):
+        try:
+            await self.handler(json.loads(line))
+        except Exception:
+            logger.exception("Failed to handle room notification")
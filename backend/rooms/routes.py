@@ -1,17 +1,117 @@
 # rooms/routes.py
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 import logging
 import asyncio
+import json
+import os
+import time
+import uuid
 
+from core import metrics
+from core.metrics import timed_lock
+from core.delta import diff
+from core.models import ROOM, ROOM_RESPONSE, ROOM_SUMMARIES, Room, RoomResponse, json_response
+from core.ratelimit import RateLimiter, player_actions
+from core.timers import Timer, timers
+from database import event_writer, players_table, rooms_table
+from eventlog import CREATED, JOINED, STATE, event_log
+from games.registry import GameActionError, GamePlugin, get_game, on_game_loaded
+from .broadcaster import RoomBroadcaster
+from .codec import JSON_CODEC, Codec, Outbound, negotiate
+from .connection import SLOW_CONSUMER_POLICIES, ClientConnection
+from .lobby import LobbyIndex
+from .matchmaking import MatchQueue, Ticket
+from .store import create_room_store
+
+# 방 상태의 원본은 store에 있고, 아래 dict들은 이 워커의 캐시/연결 정보
+store = create_room_store("rooms")
 connections: Dict[str, List[WebSocket]] = {}
-rooms: Dict[str, Dict] = {}
-rooms_lock = asyncio.Lock()
+rooms: Dict[str, Room] = {}  # 버전마다 한 번 검증한 타입 모델 (저장소의 원본은 dict)
+room_locks: Dict[str, asyncio.Lock] = {}  # 방 단위 락: 상태/연결 목록 변경 보호
+rooms_lock = asyncio.Lock()  # 레지스트리 락: 방 생성/삭제만 보호
+room_versions: Dict[str, int] = {}
+room_frames: Dict[str, "RoomFrame"] = {}  # 버전별로 한 번만 직렬화한 방 상태
+broadcasters: Dict[str, RoomBroadcaster] = {}
+# 아래 dict들은 (room_id, 보기)별: 플레이어마다, 관전자는 관전자끼리 다른 상태를 받으므로 delta 체인도 따로
+room_snapshots: Dict[Tuple[str, str], "RoomSnapshot"] = {}  # 마지막으로 클라이언트에 보낸 상태 (delta 기준점)
+room_deltas: Dict[Tuple[str, str], Deque["RoomDelta"]] = {}  # 재접속 클라이언트용 최근 delta 링 버퍼
+view_frames: Dict[Tuple[str, str], "RoomFrame"] = {}  # REST 응답용으로 보기별로 한 번만 직렬화한 방 상태
+room_views: Dict[str, Set[str]] = {}  # 방별로 위 dict에 항목이 있는 보기 (방을 지울 때 정리용)
+view_subscribers: Dict[str, Dict[str, int]] = {}  # room_id → 보기 → 연결 수
+client_connections: Dict[WebSocket, ClientConnection] = {}  # 방 소켓별 송신 큐
+lobby = LobbyIndex()  # 로비 목록용 방 요약 + status/game_type 인덱스
+lobby_connections: List[WebSocket] = []
+lobby_lock = asyncio.Lock()  # 로비 스냅샷 전송과 이벤트 전송 순서 보장
+lobby_events: Optional[asyncio.Queue] = None
+lobby_task: Optional[asyncio.Task] = None
+lobby_joining = 0  # 스냅샷을 받는 중인 로비 구독자 수 (그동안의 이벤트도 큐에 쌓아야 함)
+room_activity: Dict[str, float] = {}  # 방별 마지막 상태 변경/연결 시각 (timers.now() 기준, 다른 워커의 연결 포함)
+room_idle_timers: Dict[str, Timer] = {}
+socket_seen: Dict[WebSocket, float] = {}  # 소켓별 마지막으로 메시지를 받은 시각
+heartbeat_timers: Dict[WebSocket, Timer] = {}
+socket_codecs: Dict[WebSocket, Codec] = {}  # 서브프로토콜 협상 결과 (없으면 JSON 텍스트)
+match_waiters: Dict[str, asyncio.Future] = {}  # player_name → 매칭된 방을 기다리는 요청
+match_timers: Dict[str, Timer] = {}  # player_name → 다음 매칭 범위 확장 타이머
+inbound_batch: List[Tuple[str, WebSocket, Union[str, bytes]]] = []  # 이번 루프 tick에 받은 플레이어 메시지
+inbound_flush: Optional[asyncio.Handle] = None  # inbound_batch를 한꺼번에 처리할 콜백 (tick당 하나)
+
+SEND_TIMEOUT = 2.0  # 클라이언트 한 곳에 대한 전송 제한 시간(초), 초과 시 연결 제거
+BROADCAST_WINDOW = 0.02  # 이 시간(초) 안에 들어온 변경은 한 번의 브로드캐스트로 합침
+RESUME_BUFFER_SIZE = 64  # 방마다 보관하는 최근 delta 개수
+LOBBY_PAGE_SIZE = 100  # GET /room/ 기본 페이지 크기
+ROOM_IDLE_TTL = float(os.getenv("ROOM_IDLE_TTL", "1800"))  # 연결도 변경도 없는 방을 지우기까지의 시간(초)
+# 유휴 확인 간격: 연결을 가진 워커가 TTL 안에 적어도 한 번은 다른 워커에 활동을 알리도록 TTL의 절반
+IDLE_CHECK_INTERVAL = ROOM_IDLE_TTL / 2
+HEARTBEAT_INTERVAL = float(os.getenv("HEARTBEAT_INTERVAL", "20"))  # 조용한 소켓에 ping을 보내는 간격(초)
+HEARTBEAT_TIMEOUT = 2 * HEARTBEAT_INTERVAL  # 이 시간 동안 아무 메시지(pong 포함)도 없으면 연결 제거
+PING_MESSAGE = Outbound({"type": "ping"})
+PLAYER, SPECTATOR = "player", "spectator"  # 방 WebSocket 역할 (?role=)
+ROLES = (PLAYER, SPECTATOR)
+SEND_QUEUE_LIMIT = int(os.getenv("SEND_QUEUE_LIMIT", "32"))  # 연결별로 쌓아 둘 수 있는 프레임 수
+SLOW_CONSUMER_POLICY = os.getenv("SLOW_CONSUMER_POLICY", "latest")  # 큐가 가득 찬 연결: latest | disconnect
+if SLOW_CONSUMER_POLICY not in SLOW_CONSUMER_POLICIES:
+    raise ValueError(f"SLOW_CONSUMER_POLICY must be one of {SLOW_CONSUMER_POLICIES}")
+WS_MESSAGE_RATE = float(os.getenv("WS_MESSAGE_RATE", "20"))  # 방 WebSocket 연결 하나가 보낼 수 있는 초당 메시지 수
+WS_MESSAGE_BURST = float(os.getenv("WS_MESSAGE_BURST", "40"))  # 한 번에 몰아 보낼 수 있는 메시지 수
+WS_RATE_LIMIT_STRIKES = int(os.getenv("WS_RATE_LIMIT_STRIKES", "100"))  # 제한을 넘긴 메시지가 연속 이만큼이면 연결 종료
+RATE_LIMIT_CLOSE_CODE = 1008  # policy violation
+MATCH_WAIT_TIMEOUT = float(os.getenv("MATCH_WAIT_TIMEOUT", "60"))  # 매칭 요청이 상대를 기다리는 최대 시간(초)
+
+# 워커마다 따로 가지는 대기열 (여러 워커면 같은 워커로 들어온 플레이어끼리만 매칭)
+matchmaking = MatchQueue(
+    bracket_size=int(os.getenv("MATCH_BRACKET_SIZE", "10")),
+    widen_interval=float(os.getenv("MATCH_WIDEN_INTERVAL", "5")),
+    max_widen=int(os.getenv("MATCH_MAX_WIDEN", "3")),
+    clock=timers.now,
+)
+
+connection_limits = RateLimiter(WS_MESSAGE_RATE, WS_MESSAGE_BURST)
 
 router = APIRouter()
 logger = logging.getLogger("room")
+hot_logger = logging.getLogger("room.hot")  # 연결/메시지마다 찍히는 로그 (샘플링됨)
+
+metrics.REGISTRY.callback_gauge(
+    "room_websocket_connections", "Open room WebSocket connections",
+    lambda: sum(len(room_connections) for room_connections in connections.values()),
+)
+metrics.REGISTRY.callback_gauge("rooms_cached", "Rooms cached by this worker", lambda: len(rooms))
+metrics.REGISTRY.callback_gauge(
+    "room_spectators", "Open spectator WebSocket connections",
+    lambda: sum(views.get(SPECTATOR, 0) for views in view_subscribers.values()),
+)
+metrics.REGISTRY.callback_gauge(
+    "room_send_queue_frames", "Frames waiting in room WebSocket send queues",
+    lambda: sum(len(client.queue) for client in client_connections.values()),
+)
+metrics.REGISTRY.callback_gauge("lobby_websocket_connections", "Open lobby WebSocket connections", lambda: len(lobby_connections))
+metrics.REGISTRY.callback_gauge("timer_wheel_pending", "Timers waiting in the timing wheel", lambda: timers.pending)
+metrics.REGISTRY.callback_gauge("matchmaking_waiting", "Players waiting in the matchmaking queue", lambda: len(matchmaking))
+metrics.REGISTRY.callback_gauge("matchmaking_matched", "Pairs matched by the matchmaking queue", lambda: matchmaking.matched)
 
 class CreateRoomRequest(BaseModel):
     room_id: str
@@ -21,157 +121,970 @@ class CreateRoomRequest(BaseModel):
 class JoinRoomRequest(BaseModel):
     player_name: str
 
-@router.websocket("/{room_id}/ws")  # 변경: prefix /room이 있으므로 실제 경로는 /room/{room_id}/ws
-async def room_websocket(websocket: WebSocket, room_id: str):
-    logger.debug(f"Attempting WebSocket connection for room {room_id}")
+class MatchRequest(BaseModel):
+    player_name: str
+    game_type: str
+    chips: int  # 칩 구간을 나누는 기준
+
+class RoomFrame(NamedTuple):
+    version: int
+    text: str
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+def encode_message(message: Dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+def get_room_frame(room_id: str) -> Optional[RoomFrame]:
+    """
+    현재 버전의 직렬화 결과를 반환, 버전이 바뀐 경우에만 다시 인코딩
+    """
+    room_state = rooms.get(room_id)
+    if room_state is None:
+        return None
+    version = room_versions.get(room_id, 0)
+    frame = room_frames.get(room_id)
+    if frame is None or frame.version != version:
+        body = ROOM.dump_json(room_state)
+        frame = RoomFrame(version, body.decode("utf-8"), body)
+        room_frames[room_id] = frame
+    return frame
+
+class RoomSnapshot(NamedTuple):
+    seq: int
+    state: Dict
+    message: Outbound  # 스냅샷 메시지 (느린 연결의 재동기화에도 같은 인코딩 결과를 공유)
+
+class RoomDelta(NamedTuple):
+    base: int
+    seq: int
+    message: Outbound
+
+def player_view(player_name: Optional[str]) -> str:
+    """
+    보기 이름: 자리에 앉은 플레이어는 "player:이름", 이름을 밝히지 않은 연결/요청은 관전자와 같은 보기
+    """
+    return f"{PLAYER}:{player_name}" if player_name is not None else SPECTATOR
 
+def viewer_of(view: str) -> Optional[str]:
+    return view.split(":", 1)[1] if view.startswith(f"{PLAYER}:") else None
+
+def view_state(state: Dict, view: str) -> Dict:
+    """
+    게임이 제공하는 보는 사람별 game_state로 바꿈 (플레이어 자신의 카드, 관전자에게는 모든 비공개 카드를 가림)
+    """
+    game = get_game(state["game_type"])
+    if game is None or game.private_view is None:
+        return state
+    return {**state, "game_state": game.private_view(state["game_state"], viewer_of(view))}
+
+def room_view(room: Room, player_name: Optional[str]) -> Room:
+    """
+    REST 응답(방 생성/참여/매칭)에 담을 방 상태: 요청한 플레이어의 보기
+    """
+    return ROOM.validate_python(view_state(ROOM.dump_python(room), player_view(player_name)))
+
+def get_view_frame(room_id: str, view: str) -> Optional[RoomFrame]:
+    """
+    GET /room/{room_id}용: 현재 버전을 그 보기로 가린 직렬화 결과 (버전이 바뀐 경우에만 다시 인코딩)
+    """
+    frame = get_room_frame(room_id)
+    if frame is None:
+        return None
+    key = (room_id, view)
+    cached = view_frames.get(key)
+    if cached is None or cached.version != frame.version:
+        text = encode_message(view_state(json.loads(frame.text), view))
+        cached = view_frames[key] = RoomFrame(frame.version, text, text.encode("utf-8"))
+        room_views.setdefault(room_id, set()).add(view)
+    return cached
+
+def take_snapshot(room_id: str, view: str, frame: RoomFrame) -> RoomSnapshot:
+    state = view_state(json.loads(frame.text), view)
+    snapshot = RoomSnapshot(frame.version, state, Outbound({"type": "snapshot", "seq": frame.version, "state": state}))
+    room_snapshots[(room_id, view)] = snapshot
+    room_views.setdefault(room_id, set()).add(view)
+    return snapshot
+
+def record_delta(room_id: str, view: str, frame: RoomFrame) -> Optional[RoomDelta]:
+    """
+    마지막으로 보낸 상태와 현재 상태의 차이를 계산해 링 버퍼에 넣음 (방 락 안에서 호출)
+    """
+    key = (room_id, view)
+    previous = room_snapshots[key]
+    if previous.seq == frame.version:
+        return None
+    current = take_snapshot(room_id, view, frame)
+    ops = diff(previous.state, current.state)
+    if not ops:
+        # 실제 변경이 없으면 기준점을 옮기지 않아 클라이언트의 seq 체인이 끊기지 않게 함
+        room_snapshots[key] = previous
+        return None
+    delta = RoomDelta(previous.seq, current.seq, Outbound(
+        {"type": "patch", "base": previous.seq, "seq": current.seq, "ops": ops}
+    ))
+    buffer = room_deltas.get(key)
+    if buffer is None:
+        buffer = room_deltas[key] = deque(maxlen=RESUME_BUFFER_SIZE)
+    buffer.append(delta)
+    return delta
+
+def next_broadcast_message(room_id: str, view: str, frame: RoomFrame) -> Optional[Outbound]:
+    if (room_id, view) not in room_snapshots:
+        return take_snapshot(room_id, view, frame).message
+    delta = record_delta(room_id, view, frame)
+    return delta.message if delta is not None else None
+
+def catch_up_messages(room_id: str, view: str, since: Optional[int]) -> List[Outbound]:
+    """
+    since 이후 놓친 delta 목록, 버퍼가 그 구간을 덮지 못하면 전체 스냅샷 하나
+    """
+    key = (room_id, view)
+    frame = get_room_frame(room_id)
+    if key not in room_snapshots:
+        take_snapshot(room_id, view, frame)
+    elif not view_subscribers.get(room_id, {}).get(view):
+        # 이 보기의 구독자가 없어 전송되지 않은 변경을 기준점에 반영
+        # (구독자가 있으면 예약된 브로드캐스트가 모두에게 delta로 전달)
+        record_delta(room_id, view, frame)
+    snapshot = room_snapshots[key]
+    if since == snapshot.seq:
+        return []
+    if since is not None:
+        missed = []
+        for delta in room_deltas.get(key, ()):
+            if missed or delta.base == since:
+                missed.append(delta.message)
+        if missed:
+            return missed
+    return [snapshot.message]
+
+def latest_snapshot(room_id: str, view: str) -> Optional[Outbound]:
+    snapshot = room_snapshots.get((room_id, view))
+    return snapshot.message if snapshot is not None else None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def get_room_lock(room_id: str) -> Optional[asyncio.Lock]:
+    return room_locks.get(room_id)
+
+# /{room_id}/ws보다 먼저 선언해야 "lobby"가 room_id로 잡히지 않음
+@router.websocket("/lobby/ws")
+async def lobby_websocket(websocket: WebSocket):
+    """
+    접속 시 전체 방 요약을 한 번 보내고, 이후에는 room-added/room-changed/room-removed 이벤트만 전송
+    """
+    global lobby_joining
     await websocket.accept()
-    async with rooms_lock:
-        if room_id not in rooms:
-            logger.debug(f"Room {room_id} does not exist. Closing WebSocket.")
-            await websocket.close(code=1008, reason="Room does not exist")
-            return
+    # 스냅샷을 만든 뒤(또는 락을 기다리는 동안) 생긴 이벤트가 버려지지 않도록 먼저 구독 중으로 표시
+    # (스냅샷에 이미 들어간 변경이 이벤트로 한 번 더 올 수 있지만 같은 방 요약을 덮어쓸 뿐)
+    lobby_joining += 1
+    try:
+        async with lobby_lock:
+            try:
+                snapshot = encode_message({"type": "lobby-snapshot", "rooms": list(lobby.summaries.values())})
+                await send_with_deadline(websocket, snapshot)
+            except Exception as e:
+                logger.error(f"Failed to send lobby snapshot: {e!r}")
+                await close_quietly(websocket)
+                return
+            lobby_connections.append(websocket)
+    finally:
+        lobby_joining -= 1
+    start_heartbeat(None, websocket)
+
+    try:
+        while True:
+            await websocket.receive_text()  # 클라이언트 메시지는 pong 등 연결 유지 확인용
+            socket_seen[websocket] = timers.now()
+    except (WebSocketDisconnect, RuntimeError):  # RuntimeError: 서버가 먼저 닫은 소켓 (heartbeat 만료 등)
+        async with lobby_lock:
+            if websocket in lobby_connections:
+                lobby_connections.remove(websocket)
+    finally:
+        stop_heartbeat(websocket)
 
-        if room_id not in connections:
-            connections[room_id] = []
-        connections[room_id].append(websocket)
-    
-    logger.info(f"WebSocket connection established for room {room_id}")
+def notify_lobby(message: Dict):
+    global lobby_events, lobby_task
+    if not lobby_connections and not lobby_joining:
+        return  # 구독자가 없으면 버림 (다음 접속자는 스냅샷으로 받음)
+    if lobby_events is None:
+        lobby_events = asyncio.Queue()
+    lobby_events.put_nowait(message)
+    if lobby_task is None:
+        lobby_task = asyncio.get_running_loop().create_task(run_lobby_feed())
+
+async def run_lobby_feed():
+    """
+    로비 이벤트를 순서대로 인코딩 한 번 → 모든 로비 구독자에게 전송
+    """
+    global lobby_task
+    try:
+        while not lobby_events.empty():
+            message = encode_message(lobby_events.get_nowait())
+            async with lobby_lock:
+                targets = list(lobby_connections)
+                stale = await fan_out("lobby", targets, message) if targets else []
+                for websocket in stale:
+                    lobby_connections.remove(websocket)
+            await asyncio.gather(*(close_quietly(websocket) for websocket in stale))
+    finally:
+        lobby_task = None
+
+@router.websocket("/{room_id}/ws")  # 변경: prefix /room이 있으므로 실제 경로는 /room/{room_id}/ws
+async def room_websocket(
+    websocket: WebSocket, room_id: str, since: Optional[int] = None, role: str = PLAYER, player: Optional[str] = None,
+):
+    """
+    role=spectator: 관전 (게임이 가리는 비공개 정보 없이 상태만 받고, 행동은 보낼 수 없음)
+    player=이름: 그 플레이어의 보기를 받고 그 플레이어로만 행동할 수 있음
+    (이름 없이 접속한 플레이어 연결은 관전자와 같은 가린 상태를 받고 행동도 보낼 수 없음)
+    """
+    hot_logger.debug("Attempting WebSocket connection for room %s", room_id)
+
+    # Sec-WebSocket-Protocol로 gom.msgpack(.deflate).v1을 고른 클라이언트는 바이너리, 나머지는 JSON 텍스트
+    codec = negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=codec.subprotocol if codec is not None else None)
+    codec = codec or JSON_CODEC
+    socket_codecs[websocket] = codec
+    if role not in ROLES:
+        await websocket.close(code=1008, reason="Unknown role")
+        return
+    view = player_view(player if role == PLAYER else None)
+    lock = get_room_lock(room_id) or await load_room(room_id)
+    if lock is None:
+        logger.debug(f"Room {room_id} does not exist. Closing WebSocket.")
+        await websocket.close(code=1008, reason="Room does not exist")
+        return
+
+    client = None
+    reason = "Room does not exist"
+    async with timed_lock(lock):
+        room = rooms.get(room_id)
+        if room is not None and viewer_of(view) not in (None, *(seat.player_name for seat in room.players)):
+            reason = "Player not in room"
+        elif room is not None:
+            client = register_client(room_id, websocket, view, codec, since)
+    if client is None:
+        await websocket.close(code=1008, reason=reason)
+        return
+
+    hot_logger.info("WebSocket connection established for room %s (%s)", room_id, role)
+    start_heartbeat(room_id, websocket)
+    touch_room(room_id)  # 다른 워커의 유휴 확인이 곧 돌아와도 새 연결이 있는 방을 지우지 않도록
 
     try:
         while True:
-            message = await websocket.receive_text()
-            logger.debug(f"Received message from room {room_id}: {message}")
-            # 필요 시 메시지 처리 로직 추가
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for room {room_id}")
-        async with rooms_lock:
-            if room_id in connections:
-                connections[room_id].remove(websocket)
-                if not connections[room_id]:
-                    del connections[room_id]
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            socket_seen[websocket] = timers.now()
+            # 디코딩 전에 연결 버킷부터 확인 (넘친 메시지는 파싱도 로그도 하지 않음)
+            if not client.inbound.take(time.monotonic()):
+                if throttle_client(client):
+                    logger.info(f"Closing WebSocket in room {room_id}: rate limit exceeded {client.strikes} times in a row")
+                    metrics.rate_limited.inc("disconnected")
+                    await remove_connections(room_id, [websocket])
+                    await close_quietly(websocket, RATE_LIMIT_CLOSE_CODE, "Rate limit exceeded")
+                    return
+                continue
+            client.strikes = 0
+            data = message.get("text")
+            if data is None:
+                data = message.get("bytes")
+            hot_logger.debug("Received message from room %s: %s", room_id, data)
+            if role == PLAYER:
+                queue_inbound(room_id, websocket, data)
+    except (WebSocketDisconnect, RuntimeError):  # RuntimeError: 서버가 먼저 닫은 소켓 (heartbeat 만료 등)
+        hot_logger.info("WebSocket disconnected for room %s", room_id)
+        await remove_connections(room_id, [websocket])
+    finally:
+        stop_heartbeat(websocket)
+        socket_codecs.pop(websocket, None)
 
-async def broadcast_room_state(room_id: str):
-    async with rooms_lock:
-        if room_id not in connections:
+def register_client(room_id: str, websocket: WebSocket, view: str, codec: Codec, since: Optional[int] = None) -> ClientConnection:
+    """
+    송신 큐와 writer 태스크를 만들고 방 연결 목록에 추가 (방 락 안에서 호출)
+    """
+    client = ClientConnection(
+        websocket, room_id, view, codec,
+        latest=lambda: latest_snapshot(room_id, view),
+        on_failure=lambda client: evict_socket(room_id, client.websocket),
+        limit=SEND_QUEUE_LIMIT, policy=SLOW_CONSUMER_POLICY, send_timeout=SEND_TIMEOUT,
+        inbound=connection_limits.bucket(),
+    )
+    client.start()
+    # 이후 브로드캐스트보다 먼저 나가도록 따라잡기 메시지는 등록 전에 큐에 넣음
+    for message in catch_up_messages(room_id, view, since):
+        client.push(message, replaceable=True)
+    client_connections[websocket] = client
+    connections.setdefault(room_id, []).append(websocket)
+    views = view_subscribers.setdefault(room_id, {})
+    views[view] = views.get(view, 0) + 1
+    return client
+
+def start_heartbeat(room_id: Optional[str], websocket: WebSocket):
+    socket_seen[websocket] = timers.now()
+    heartbeat_timers[websocket] = timers.schedule(HEARTBEAT_INTERVAL, heartbeat_due, room_id, websocket)
+
+def stop_heartbeat(websocket: WebSocket):
+    socket_seen.pop(websocket, None)
+    timers.cancel(heartbeat_timers.pop(websocket, None))
+
+def heartbeat_due(room_id: Optional[str], websocket: WebSocket):
+    """
+    타이밍 휠 콜백: 최근에 메시지를 받은 소켓은 ping 없이 다시 예약, 조용한 소켓에는 ping,
+    HEARTBEAT_TIMEOUT 동안 응답이 없으면 연결 제거 (room_id가 None이면 로비 소켓)
+    """
+    heartbeat_timers.pop(websocket, None)
+    seen = socket_seen.get(websocket)
+    if seen is None:
+        return
+    quiet = timers.now() - seen
+    if quiet >= HEARTBEAT_TIMEOUT:
+        hot_logger.info("Heartbeat timed out for socket in room %s", room_id)
+        asyncio.get_running_loop().create_task(evict_socket(room_id, websocket))
+        return
+    if quiet < HEARTBEAT_INTERVAL:
+        heartbeat_timers[websocket] = timers.schedule(HEARTBEAT_INTERVAL - quiet, heartbeat_due, room_id, websocket)
+        return
+    heartbeat_timers[websocket] = timers.schedule(HEARTBEAT_INTERVAL, heartbeat_due, room_id, websocket)
+    asyncio.get_running_loop().create_task(send_ping(room_id, websocket))
+
+async def send_ping(room_id: Optional[str], websocket: WebSocket):
+    client = client_connections.get(websocket)
+    if client is not None:
+        client.push(PING_MESSAGE)  # 방 소켓은 writer 태스크만 전송
+        return
+    try:
+        await send_with_deadline(websocket, PING_MESSAGE)
+    except Exception:
+        await evict_socket(room_id, websocket)
+
+async def evict_socket(room_id: Optional[str], websocket: WebSocket):
+    stop_heartbeat(websocket)
+    metrics.evicted_sockets.inc()
+    if room_id is None:
+        async with lobby_lock:
+            if websocket in lobby_connections:
+                lobby_connections.remove(websocket)
+    else:
+        await remove_connections(room_id, [websocket])
+    await close_quietly(websocket)
+
+def error_message(detail: str, **fields) -> Outbound:
+    return Outbound({"type": "error", "detail": detail, **fields})
+
+def throttle_client(client: ClientConnection) -> bool:
+    """
+    연결 버킷이 빈 상태에서 온 메시지: 연속된 첫 메시지에만 retry_after를 담은 에러를 보내고,
+    WS_RATE_LIMIT_STRIKES개째면 True (연결을 닫아야 함)
+    """
+    client.strikes += 1
+    metrics.rate_limited.inc("connection")
+    if client.strikes == 1:
+        retry_after = client.inbound.retry_after(time.monotonic())
+        client.push(error_message("Rate limit exceeded", retry_after=round(retry_after, 3)))
+    return client.strikes >= WS_RATE_LIMIT_STRIKES
+
+def queue_inbound(room_id: str, websocket: WebSocket, message: Union[str, bytes]):
+    """
+    받은 메시지는 바로 처리하지 않고 모아 두었다가, 이번 tick에 받은 것 전체를 flush_inbound()에서 한 번에 처리
+    """
+    global inbound_flush
+    inbound_batch.append((room_id, websocket, message))
+    if inbound_flush is None:
+        inbound_flush = asyncio.get_running_loop().call_soon(flush_inbound)
+
+def flush_inbound():
+    """
+    한 tick 동안 받은 메시지를 디코딩·검증하고 플레이어별 버킷을 확인한 뒤, 통과한 행동을 한 태스크에서 엔진에 제출
+    """
+    global inbound_batch, inbound_flush
+    batch, inbound_batch, inbound_flush = inbound_batch, [], None
+    metrics.inbound_batch_size.observe(len(batch))
+    actions = []
+    for room_id, websocket, message in batch:
+        client = client_connections.get(websocket)
+        if client is None:
+            continue  # 그 사이 끊긴 연결
+        try:
+            action = parse_action(client.codec, message)
+        except ValueError as e:
+            client.push(error_message(str(e)))
+            continue
+        if action is None:
+            continue
+        player = action[0]
+        viewer = viewer_of(client.view)
+        if viewer is None:
+            # 관전자나 플레이어를 지정하지 않은 연결은 어느 자리로도 행동할 수 없음
+            client.push(error_message("Only players can act, connect with role=player&player=<name>"))
+            continue
+        if viewer != player:
+            client.push(error_message("Cannot act for another player"))
+            continue
+        if not player_actions.allow((room_id, player)):
+            metrics.rate_limited.inc("player")
+            retry_after = player_actions.retry_after((room_id, player))
+            client.push(error_message("Rate limit exceeded", retry_after=round(retry_after, 3)))
+            continue
+        actions.append((room_id, client, *action))
+    if actions:
+        asyncio.get_running_loop().create_task(submit_actions(actions))
+
+def parse_action(codec: Codec, message: Union[str, bytes]) -> Optional[Tuple[str, str, int]]:
+    """
+    {"type": "action", "player": 이름, "action": "bet", "amount": 3} → (player, action, amount)
+    행동이 아닌 메시지(pong 등)나 디코딩할 수 없는 메시지는 None, 금액이 잘못되면 ValueError
+    """
+    try:
+        data = codec.decode(message)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("type") != "action":
+        return None
+    try:
+        amount = int(data.get("amount") or 0)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid amount")
+    return str(data.get("player")), str(data.get("action")), amount
+
+async def submit_actions(actions: List[Tuple[str, ClientConnection, str, str, int]]):
+    # 받은 순서대로 각 테이블 큐에 들어감
+    await asyncio.gather(*(submit_action(*action) for action in actions))
+
+async def submit_action(room_id: str, client: ClientConnection, player: str, action: str, amount: int):
+    """
+    결과 상태는 방 브로드캐스트로 전달되고, 실패한 경우에만 보낸 클라이언트에게 에러를 보냄
+    """
+    room = rooms.get(room_id)
+    game = get_game(room.game_type) if room is not None else None
+    try:
+        if game is None:
+            raise GameActionError("Game not started")
+        result = await game.engine.submit_by_name(room_id, player, action, amount)
+        error = result.error
+    except GameActionError as e:
+        error = str(e)
+    if error:
+        client.push(error_message(error))
+
+async def remove_connections(room_id: str, websockets: List[WebSocket]):
+    lock = get_room_lock(room_id)
+    if lock is None:
+        return
+    async with timed_lock(lock):
+        room_connections = connections.get(room_id)
+        if room_connections is None:
             return
-        room_state = rooms.get(room_id)
-        if not room_state:
+        for websocket in websockets:
+            if websocket in room_connections:
+                room_connections.remove(websocket)
+                unregister_client(room_id, websocket)
+        if not room_connections:
+            del connections[room_id]
+
+def unregister_client(room_id: str, websocket: WebSocket):
+    client = client_connections.pop(websocket, None)
+    if client is None:
+        return
+    client.stop()
+    views = view_subscribers[room_id]
+    views[client.view] -= 1
+    if not views[client.view]:
+        del views[client.view]
+        if not views:
+            del view_subscribers[room_id]
+
+async def send_with_deadline(websocket: WebSocket, message: Union[str, Outbound]):
+    """
+    Outbound는 연결이 협상한 코덱으로 인코딩 (같은 코덱끼리는 인코딩 결과를 공유)
+    """
+    if isinstance(message, Outbound):
+        payload = message.encode(socket_codecs.get(websocket, JSON_CODEC))
+        send = websocket.send_bytes(payload) if isinstance(payload, bytes) else websocket.send_text(payload)
+    else:
+        send = websocket.send_text(message)
+    await asyncio.wait_for(send, timeout=SEND_TIMEOUT)
+
+async def close_quietly(websocket: WebSocket, code: int = 1011, reason: Optional[str] = None):
+    try:
+        await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=SEND_TIMEOUT)
+    except Exception:
+        pass
+
+async def fan_out(room_id: str, websockets: List[WebSocket], message: Union[str, Outbound]) -> List[WebSocket]:
+    """
+    락 밖에서 모든 소켓으로 동시에 전송하고, 실패하거나 제한 시간을 넘긴 소켓 목록을 반환
+    """
+    results = await asyncio.gather(
+        *(send_with_deadline(websocket, message) for websocket in websockets),
+        return_exceptions=True,
+    )
+    failed = []
+    for websocket, result in zip(websockets, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to send to client in room {room_id}: {result!r}")
+            failed.append(websocket)
+    return failed
+
+async def broadcast_room_state(room_id: str):
+    """
+    보기(플레이어/관전자)마다 메시지를 한 번 만들고 각 연결의 송신 큐에 넣기만 함
+    (전송은 연결별 writer 태스크가 하므로 느린 소켓이 방 락이나 다른 연결을 붙잡지 않음)
+    """
+    lock = get_room_lock(room_id)
+    if lock is None:
+        return
+    async with timed_lock(lock):
+        frame = get_room_frame(room_id)
+        if frame is None:
             logger.warning(f"No state found for room {room_id}")
             return
+        targets = connections.get(room_id)
+        if not targets:
+            return
+        started = time.perf_counter()
+        messages = {view: next_broadcast_message(room_id, view, frame) for view in view_subscribers.get(room_id, ())}
+        for websocket in targets:
+            client = client_connections.get(websocket)
+            message = messages.get(client.view) if client is not None else None
+            if message is not None:
+                client.push(message, replaceable=True)
+        metrics.broadcast_duration.observe(time.perf_counter() - started)
+        metrics.broadcast_fanout_size.observe(len(targets))
 
-        disconnected_clients = []
-        for websocket in connections[room_id]:
-            try:
-                await websocket.send_json(room_state)
-            except Exception as e:
-                logger.error(f"Failed to send state to client: {e}")
-                disconnected_clients.append(websocket)
+def update_room_state(room_id: str, new_state: Dict, version: int):
+    if version <= room_versions.get(room_id, 0):
+        return  # 다른 워커의 알림이 늦게 도착한 경우 더 오래된 상태로 덮어쓰지 않음
+    room = rooms[room_id] = validate_room(new_state)
+    room_versions[room_id] = version
+    room_activity[room_id] = timers.now()
+    if room_id not in room_idle_timers:
+        room_idle_timers[room_id] = timers.schedule(IDLE_CHECK_INTERVAL, check_idle_room, room_id)
+    changed = lobby.upsert(room)
+    if changed is not None:
+        event, summary = changed
+        notify_lobby({"type": event, "room": summary})
+    room_locks.setdefault(room_id, asyncio.Lock())
+    broadcaster = broadcasters.get(room_id)
+    if broadcaster is None:
+        broadcaster = broadcasters[room_id] = RoomBroadcaster(room_id, broadcast_room_state, BROADCAST_WINDOW)
+    broadcaster.mark_dirty()
 
-        for websocket in disconnected_clients:
-            connections[room_id].remove(websocket)
-        if room_id in connections and not connections[room_id]:
-            del connections[room_id]
+def validate_room(state: Dict) -> Room:
+    """
+    방 캐시에 넣을 모델: game_state는 그 game_type의 플러그인이 등록한 모델로 검증 (없으면 dict 그대로)
+    """
+    room = ROOM.validate_python(state)
+    game = get_game(room.game_type)
+    if game is not None and game.state_model is not None:
+        room.game_state = game.state_model.validate_python(room.game_state)
+    return room
+
+async def load_room(room_id: str) -> Optional[asyncio.Lock]:
+    """
+    캐시에 없는 방을 저장소에서 읽어옴 (다른 워커가 만든 방의 알림보다 요청이 먼저 온 경우)
+    """
+    stored = await store.get(room_id)
+    if stored is None:
+        return None
+    update_room_state(room_id, stored.state, stored.version)
+    return get_room_lock(room_id)
+
+async def publish_game_state(room_id: str, game_state: Dict, base: Dict) -> Optional[Dict]:
+    """
+    게임 엔진이 행동을 적용한 뒤 호출 → 방 상태에 반영하고 브로드캐스트
+    저장된 game_state가 엔진이 행동을 적용한 기준(base)과 다르면(다른 워커의 테이블이 먼저 바꿈) 쓰지 않고 그 상태를 반환
+    """
+    current = None
 
-def update_room_state(room_id: str, new_state: Dict):
-    rooms[room_id] = new_state
-    asyncio.create_task(broadcast_room_state(room_id))
+    def apply(room: Dict):
+        nonlocal current
+        if room["game_state"] != base:
+            current = room["game_state"]
+            return False
+        room["game_state"] = game_state
+
+    stored = await store.mutate(room_id, apply)
+    if stored is None:
+        return None  # 방 없이 /game_1 API로만 연 테이블
+    if current is not None:
+        update_room_state(room_id, stored.state, stored.version)  # 변경 알림보다 먼저 알게 된 경우
+        return current
+    event_log.record_state(room_id, STATE, stored.state, stored.version)
+    update_room_state(room_id, stored.state, stored.version)
+    store.publish(room_id, "changed")
+    return None
+
+def load_game_state(room_id: str) -> Optional[Dict]:
+    room = rooms.get(room_id)
+    if room is None or not room.game_started:
+        return None
+    return ROOM.dump_python(room)["game_state"]
+
+async def room_exists(room_id: str) -> bool:
+    return room_id in rooms or await store.get(room_id) is not None
+
+def bind_game(game: GamePlugin):
+    # 게임이 로드되면 엔진의 결과를 방 브로드캐스트로 발행하고, 테이블이 없을 때 방 상태에서 복원하도록 연결
+    game.engine.bind_rooms(publish_game_state, load_game_state, room_exists)
+
+on_game_loaded(bind_game)
+
+async def on_store_change(room_id: str, event: str):
+    """
+    다른 워커에서 일어난 변경 → 이 워커의 캐시를 갱신하고 이 워커에 붙은 소켓에 전송
+    """
+    if event == "deleted":
+        await drop_room(room_id)
+        return
+    if event == "active":
+        if room_id in rooms:
+            room_activity[room_id] = timers.now()  # 다른 워커에 연결이 남아 있는 방
+        return
+    stored = await store.get(room_id)
+    if stored is None:
+        await drop_room(room_id)
+        return
+    if stored.version <= room_versions.get(room_id, 0):
+        return  # 이 워커가 이미 더 새 버전을 반영함
+    update_room_state(room_id, stored.state, stored.version)
+    game = get_game(stored.state["game_type"])
+    if game is not None and stored.state["game_started"]:
+        # 이 워커의 테이블이 다른 워커에서 진행된 행동을 모른 채 다음 행동을 발행하지 않도록
+        game.engine.sync_table(room_id, stored.state["game_state"])
+
+async def start_room_store(recovered: Optional[Dict[str, Dict]] = None):
+    """
+    recovered: 이벤트 로그에서 복원한 방 상태 → 저장소에 없는 방만 다시 만듦 (메모리 저장소로 재시작한 경우)
+    공유 저장소(sqlite)는 재시작해도 남아 있고, 다른 워커가 지운 방의 삭제 기록은 그 워커의 로그에만 있으므로 복원하지 않음
+    버전 카운터는 로그에 기록된 버전보다 위에서 시작 (재시작 전의 ETag나 재접속 seq가 다른 상태를 가리키지 않도록)
+    """
+    await store.start(on_change=on_store_change)
+    await store.seed(event_log.max_version)
+    if not store.durable:
+        for room_id, state in (recovered or {}).items():
+            if await store.get(room_id) is None and await store.create(room_id, state) is not None:
+                logger.info(f"Room {room_id} recovered from event log")
+    for room_id, stored in (await store.load_all()).items():
+        update_room_state(room_id, stored.state, stored.version)
+
+async def stop_room_store():
+    await store.close()
 
 @router.post("/")
 async def create_room(request: CreateRoomRequest):
+    room = await open_room(request.room_id, request.game_type, [request.player_name], player=request.player_name)
+    return json_response(ROOM_RESPONSE, RoomResponse("Room created successfully.", room_view(room, request.player_name)))
+
+async def open_room(room_id: str, game_type: str, player_names: List[str], **event_data) -> Room:
+    """
+    방 생성 (매칭처럼 정원이 찬 채로 만들면 게임도 바로 시작)
+    """
+    # 이 game_type의 방이 처음 만들어질 때 게임 패키지를 import
+    game = get_game(game_type)
+    if game is None:
+        raise HTTPException(status_code=400, detail=f"Unknown game type: {game_type}")
+    full = len(player_names) == game.max_players
+    room = {
+        "room_id": room_id,
+        "game_type": game_type,
+        "players": [{"player_name": name} for name in player_names],
+        "game_started": full,
+        "game_state": game.initialize(player_names),
+        "status": "playing" if full else "waiting",
+    }
     async with rooms_lock:
-        if request.room_id in rooms:
+        version = await store.create(room_id, room)
+        if version is None:
             raise HTTPException(status_code=400, detail="Room already exists")
+        update_room_state(room_id, room, version)
+
+    event_log.record_state(room_id, CREATED, room, version, **event_data)
+    logger.info(f"Room {room_id} created by {player_names[0]}")
+    if full:
+        game.engine.restore_table(room_id, room["game_state"])
+    store.publish(room_id, "changed")
+    event_writer.submit(rooms_table, {"room_id": room_id, "game_type": game_type, "created_by": player_names[0]})
+    for name in player_names:
+        event_writer.submit(players_table, {"room_id": room_id, "player_name": name})
+    return rooms[room_id]
+
+@router.post("/match")
+async def match_player(request: MatchRequest):
+    """
+    같은 game_type, 비슷한 칩 구간의 상대를 찾을 때까지 기다렸다가 두 사람이 앉은 방을 반환
+    (MATCH_WAIT_TIMEOUT 안에 상대가 없으면 408)
+    """
+    if get_game(request.game_type) is None:
+        raise HTTPException(status_code=400, detail=f"Unknown game type: {request.game_type}")
+    if request.player_name in match_waiters:
+        raise HTTPException(status_code=400, detail="Player already in matchmaking queue")
+    ticket, partner = matchmaking.enqueue(request.player_name, request.game_type, request.chips)
+
+    player_name = request.player_name
+    future = asyncio.get_running_loop().create_future()
+    match_waiters[player_name] = future
+    try:
+        if partner is not None:
+            await start_match(partner, ticket)
+        else:
+            match_timers[player_name] = timers.schedule(matchmaking.widen_interval, widen_match, ticket)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), MATCH_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            if match_waiters.get(player_name) is future:
+                raise HTTPException(status_code=408, detail="No match found")
+            result = await future  # 시간 초과 직전에 매칭됨 → 방이 만들어질 때까지 기다림
+    finally:
+        if match_waiters.get(player_name) is future:
+            cancel_match(player_name)
+    return json_response(ROOM_RESPONSE, RoomResponse(result.message, room_view(result.room, player_name)))
+
+@router.delete("/match/{player_name}")
+async def leave_matchmaking(player_name: str):
+    future = match_waiters.get(player_name)
+    if future is None:
+        raise HTTPException(status_code=404, detail="Player not in matchmaking queue")
+    cancel_match(player_name)
+    future.set_exception(HTTPException(status_code=409, detail="Matchmaking cancelled"))
+    return {"message": f"Player {player_name} left matchmaking"}
+
+def cancel_match(player_name: str):
+    match_waiters.pop(player_name, None)
+    matchmaking.cancel(player_name)
+    timers.cancel(match_timers.pop(player_name, None))
 
-        rooms[request.room_id] = {
-            "room_id": request.room_id,
-            "game_type": request.game_type,
-            "players": [{"player_name": request.player_name}],
-            "game_started": False,
-            "game_state": initialize_game([{"player_name": request.player_name}]),
-            "status": "waiting",
-        }
+def widen_match(ticket: Ticket):
+    """
+    타이밍 휠 콜백: 기다린 시간만큼 넓어진 칩 구간으로 다시 상대를 찾고, 없으면 다음 확장 때 다시 확인
+    """
+    match_timers.pop(ticket.player_name, None)
+    if matchmaking.waiting.get(ticket.player_name) is not ticket:
+        return
+    partner = matchmaking.rematch(ticket)
+    if partner is not None:
+        first, second = sorted((ticket, partner), key=lambda waiting: waiting.seq)
+        asyncio.get_running_loop().create_task(start_match(first, second))
+    elif matchmaking.widen(ticket, timers.now()) < matchmaking.max_widen:
+        match_timers[ticket.player_name] = timers.schedule(matchmaking.widen_interval, widen_match, ticket)
 
-        logger.info(f"Room {request.room_id} created by {request.player_name}")
+async def start_match(first: Ticket, second: Ticket):
+    """
+    매칭된 두 플레이어로 방을 만들고 기다리던 요청에 결과를 전달 (먼저 기다린 플레이어가 방장)
+    """
+    waiters = [match_waiters.pop(ticket.player_name, None) for ticket in (first, second)]
+    for ticket in (first, second):
+        timers.cancel(match_timers.pop(ticket.player_name, None))
 
-    update_room_state(request.room_id, rooms[request.room_id])
-    return {"message": "Room created successfully.", "room": rooms[request.room_id]}
+    room_id = f"match-{uuid.uuid4().hex[:12]}"
+    try:
+        room = await open_room(
+            room_id, first.game_type, [first.player_name, second.player_name], player=first.player_name, matched=True,
+        )
+    except Exception as e:
+        logger.exception(f"Failed to open matched room for {first.player_name} and {second.player_name}")
+        for waiter in waiters:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(e)
+        return
+
+    logger.info(f"Matched {first.player_name} ({first.chips}) with {second.player_name} ({second.chips}) in room {room_id}")
+    result = RoomResponse("Match found", room)
+    for waiter in waiters:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(result)
 
 @router.get("/")
-async def get_rooms():
-    async with rooms_lock:
-        room_list = [
-            {
-                "room_id": room["room_id"],
-                "game_type": room["game_type"],
-                "status": room["status"],
-                "players": [player["player_name"] for player in room["players"]],
-            }
-            for room in rooms.values()
-        ]
-        logger.info(f"Returning all rooms: {room_list}")
-        return room_list
+async def get_rooms(
+    status: Optional[str] = None,
+    game_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(LOBBY_PAGE_SIZE, ge=1, le=500),
+):
+    """
+    room_id 순서의 페이지 단위 방 목록 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)
+    """
+    # await가 없으므로 이벤트 루프 안에서 원자적으로 실행됨 → 전역 락 불필요
+    room_list, next_cursor = lobby.page(status=status, game_type=game_type, cursor=cursor, limit=limit)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    logger.debug("Returning %d rooms", len(room_list))
+    return json_response(ROOM_SUMMARIES, room_list, headers=headers)
 
 @router.post("/{room_id}/join")
 async def join_room(room_id: str, request: JoinRoomRequest):
     player_name = request.player_name
-    async with rooms_lock:
-        if room_id not in rooms:
-            raise HTTPException(status_code=404, detail="Room not found")
-
-        room = rooms[room_id]
-        if len(room["players"]) >= 2:
-            raise HTTPException(status_code=400, detail="Room is full")
+    joined = False
+    game: Optional[GamePlugin] = None
 
+    def join(room: Dict):
+        nonlocal joined, game
         if player_name in [p["player_name"] for p in room["players"]]:
-            return {"message": "Player already in the room", "room": room}
+            return False
+
+        game = get_game(room["game_type"])
+        if game is None:
+            raise HTTPException(status_code=400, detail=f"Unknown game type: {room['game_type']}")
+        if len(room["players"]) >= game.max_players:
+            raise HTTPException(status_code=400, detail="Room is full")
 
         room["players"].append({"player_name": player_name})
-        room["status"] = "playing" if len(room["players"]) == 2 else "waiting"
+        full = len(room["players"]) == game.max_players
+        room["status"] = "playing" if full else "waiting"
 
-        if not room["game_started"] and len(room["players"]) == 2:
-            room["game_state"] = initialize_game(room["players"])
+        if not room["game_started"] and full:
+            room["game_state"] = game.initialize([p["player_name"] for p in room["players"]])
             room["game_started"] = True
+        joined = True
+
+    # 저장소가 읽기-수정-쓰기를 원자적으로 처리하므로 워커가 여러 개여도 정원 초과가 생기지 않음
+    stored = await store.mutate(room_id, join)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    if not joined:
+        room = room_view(ROOM.validate_python(stored.state), player_name)
+        return json_response(ROOM_RESPONSE, RoomResponse("Player already in the room", room))
 
     logger.info(f"Player {player_name} joined room {room_id}")
-    update_room_state(room_id, room)
+    event_log.record_state(room_id, JOINED, stored.state, stored.version, player=player_name)
+    update_room_state(room_id, stored.state, stored.version)
+    if stored.state["game_started"]:
+        game.engine.restore_table(room_id, stored.state["game_state"])
+    store.publish(room_id, "changed")
+    event_writer.submit(players_table, {"room_id": room_id, "player_name": player_name})
 
-    return {"message": f"Player {player_name} joined room {room_id}", "room": room}
+    room = room_view(rooms[room_id], player_name)
+    return json_response(ROOM_RESPONSE, RoomResponse(f"Player {player_name} joined room {room_id}", room))
 
 @router.get("/{room_id}")
-def get_room_state(room_id: str):
+async def get_room_state(room_id: str, request: Request, player: Optional[str] = None):
+    """
+    기본은 관전자 보기 (진행 중인 판의 카드를 가림), player=이름이면 그 플레이어의 보기
+    """
     if room_id not in rooms:
+        await load_room(room_id)
+    room = rooms.get(room_id)
+    if room is None:
         raise HTTPException(status_code=404, detail="Room not found")
-    return rooms[room_id]
+    if player is not None and player not in [seat.player_name for seat in room.players]:
+        raise HTTPException(status_code=400, detail="Player not in room")
+    frame = get_view_frame(room_id, player_view(player))
+    # no-cache: 브라우저가 항상 If-None-Match로 재검증 → 변경이 없으면 304
+    headers = {"ETag": frame.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), frame.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=frame.body, media_type="application/json", headers=headers)
+
+@router.get("/{room_id}/replay")
+async def replay_room(room_id: str, version: Optional[int] = None):
+    """
+    모든 워커의 이벤트 로그로 저장소 버전 version(ETag와 같은 값, 기본: 마지막) 시점의 방 상태를 다시 만듦 (분쟁 확인, 분석용)
+    """
+    state, applied = await event_log.replay_version_async(room_id, version)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Room not found at this version")
+    return {"room_id": room_id, "version": applied, "state": view_state(state, SPECTATOR)}
 
 @router.delete("/{room_id}")
 async def delete_room(room_id: str):
+    if not await remove_room(room_id):
+        raise HTTPException(status_code=404, detail="Room not found")
+    logger.info(f"Room {room_id} deleted")
+    return {"message": f"Room {room_id} deleted"}
+
+async def remove_room(room_id: str) -> bool:
+    """
+    저장소에서 방을 지우고 모든 워커에 알림 (DELETE 요청과 유휴 방 정리가 공유)
+    """
     async with rooms_lock:
-        if room_id not in rooms:
-            raise HTTPException(status_code=404, detail="Room not found")
+        if not await store.delete(room_id):
+            return False
 
-        await broadcast_room_deleted(room_id)
-        del rooms[room_id]
-        logger.info(f"Room {room_id} deleted")
+    event_log.record_deleted(room_id)
+    await drop_room(room_id)
+    store.publish(room_id, "deleted")
+    return True
 
-    return {"message": f"Room {room_id} deleted"}
+def check_idle_room(room_id: str):
+    """
+    타이밍 휠 콜백: 연결이 남아 있거나 ROOM_IDLE_TTL 안에 변경이 있었으면 다시 예약하고, 아니면 방을 지움
+    (변경마다 타이머를 다시 걸지 않고 확인 시점에만 마지막 활동 시각을 봄)
+    이 워커에 연결이 있으면 다른 워커에도 활동을 알림: 연결이 없는 워커가 다른 워커의 플레이어가 있는 방을 지우지 않도록
+    """
+    room_idle_timers.pop(room_id, None)
+    if room_id not in rooms:
+        return
+    now = timers.now()
+    if connections.get(room_id):
+        touch_room(room_id)
+    idle = now - room_activity.get(room_id, now)
+    if idle < ROOM_IDLE_TTL:
+        delay = min(ROOM_IDLE_TTL - idle, IDLE_CHECK_INTERVAL)
+        room_idle_timers[room_id] = timers.schedule(delay, check_idle_room, room_id)
+        return
+    asyncio.get_running_loop().create_task(evict_idle_room(room_id))
+
+def touch_room(room_id: str):
+    """
+    이 워커에 연결이 있는 방의 활동 시각을 갱신하고 다른 워커에도 알림 (상태는 바꾸지 않으므로 버전은 그대로)
+    """
+    room_activity[room_id] = timers.now()
+    store.publish(room_id, "active")
 
-async def broadcast_room_deleted(room_id: str):
+async def evict_idle_room(room_id: str):
+    if await remove_room(room_id):
+        logger.info(f"Room {room_id} evicted after being idle for {ROOM_IDLE_TTL:.0f}s")
+    else:
+        await drop_room(room_id)  # 다른 워커가 이미 지운 방
+
+async def drop_room(room_id: str):
+    """
+    이 워커의 캐시에서 방을 지우고 연결된 클라이언트에 삭제를 알림
+    """
     async with rooms_lock:
-        if room_id in connections:
-            for websocket in connections[room_id]:
-                try:
-                    await websocket.send_json({"type": "room_deleted", "room_id": room_id})
-                except Exception as e:
-                    logger.error(f"Failed to notify client about room deletion: {e}")
-            del connections[room_id]
+        lock = get_room_lock(room_id)
+        if lock is None:
+            return
 
-def initialize_game(players: List[Dict]) -> Dict:
-    return {
-        "players": {player["player_name"]: {"chips": 30, "card": None} for player in players},
-        "current_turn": players[0]["player_name"],
-        "pot": 0,
-        "round_completed": False,
-        "game_round": 1,
-        "winner": None,
-    }
+        # 진행 중인 방 단위 작업이 끝난 뒤 레지스트리에서 제거
+        async with lock:
+            room = rooms.pop(room_id, None)
+            del room_locks[room_id]
+            room_versions.pop(room_id, None)
+            room_frames.pop(room_id, None)
+            for view in room_views.pop(room_id, ()):
+                room_snapshots.pop((room_id, view), None)
+                room_deltas.pop((room_id, view), None)
+                view_frames.pop((room_id, view), None)
+            targets = connections.pop(room_id, [])
+            for websocket in targets:
+                unregister_client(room_id, websocket)  # 삭제 알림은 아래에서 직접 전송
+            broadcaster = broadcasters.pop(room_id, None)
+            room_activity.pop(room_id, None)
+            timers.cancel(room_idle_timers.pop(room_id, None))
+            if lobby.remove(room_id) is not None:
+                notify_lobby({"type": "room-removed", "room_id": room_id})
+
+    game = get_game(room.game_type) if room is not None else None
+    if game is not None:
+        game.engine.close_table(room_id)
+    if broadcaster is not None:
+        await broadcaster.close()
+
+    await broadcast_room_deleted(room_id, targets)
+
+async def broadcast_room_deleted(room_id: str, websockets: List[WebSocket]):
+    if not websockets:
+        return
+    message = Outbound({"type": "room_deleted", "room_id": room_id})
+    stale = await fan_out(room_id, websockets, message)
+    await asyncio.gather(*(close_quietly(websocket) for websocket in stale))
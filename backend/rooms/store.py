@@ -0,0 +1,235 @@
+# rooms/store.py
+"""
+방/게임 상태 저장소.
+
+- InMemoryRoomStore: 단일 워커용 (기본값)
+- SqliteRoomStore: 여러 uvicorn 워커가 database.py의 SQLite(WAL) 파일을 공유,
+  변경 알림은 pubsub.LocalHub로 다른 워커에 전달
+
+저장소는 상태의 원본과 버전만 관리하고, 소켓/락/직렬화 캐시는 각 워커가 따로 가집니다.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+import itertools
+import json
+import os
+
+from sqlalchemy import Column, Integer, String, Table, Text
+
+from database import engine, metadata, write_transaction
+from .pubsub import LocalHub
+
+Mutator = Callable[[Dict], Any]
+ChangeHandler = Callable[[str, str], Awaitable[None]]  # (room_id, "changed" | "deleted" | "active")
+
+class StoredRoom(NamedTuple):
+    version: int
+    state: Dict
+
+class RoomStore(ABC):
+    """
+    mutate()는 읽기-수정-쓰기를 원자적으로 수행합니다.
+    mutator가 예외를 던지면 아무것도 저장되지 않고 예외가 그대로 전파되며,
+    False를 반환하면 변경 없음으로 보고 버전을 올리지 않습니다.
+    """
+    namespace: str
+    durable = False  # 재시작해도 상태가 남는 저장소
+
+    async def start(self, on_change: Optional[ChangeHandler] = None):
+        pass
+
+    async def close(self):
+        pass
+
+    def publish(self, room_id: str, event: str):
+        """
+        다른 워커에 변경을 알림 (단일 프로세스 저장소에서는 할 일 없음)
+        """
+
+    @abstractmethod
+    async def seed(self, version: int):
+        """
+        다음 버전이 version보다 크도록 카운터를 올림 (이미 크면 그대로)
+        """
+
+    @abstractmethod
+    async def get(self, room_id: str) -> Optional[StoredRoom]: ...
+
+    @abstractmethod
+    async def load_all(self) -> Dict[str, StoredRoom]: ...
+
+    @abstractmethod
+    async def create(self, room_id: str, state: Dict) -> Optional[int]:
+        """
+        새 방을 저장하고 버전을 반환, 이미 있으면 None
+        """
+
+    @abstractmethod
+    async def mutate(self, room_id: str, mutator: Mutator) -> Optional[StoredRoom]:
+        """
+        mutator(state)를 적용하고 새 버전을 반환, 방이 없으면 None
+        """
+
+    @abstractmethod
+    async def delete(self, room_id: str) -> bool: ...
+
+class InMemoryRoomStore(RoomStore):
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.rooms: Dict[str, StoredRoom] = {}
+        # 방을 지웠다 같은 ID로 다시 만들어도 버전(ETag)이 겹치지 않도록 전역 카운터 사용
+        self._versions = itertools.count(1)
+
+    async def seed(self, version: int):
+        # 지금까지 나간 버전 = 현재 카운터 - 1, 그보다 큰 쪽에서 다시 시작
+        issued = next(self._versions)
+        self._versions = itertools.count(max(issued, version + 1))
+
+    async def get(self, room_id: str) -> Optional[StoredRoom]:
+        return self.rooms.get(room_id)
+
+    async def load_all(self) -> Dict[str, StoredRoom]:
+        return dict(self.rooms)
+
+    async def create(self, room_id: str, state: Dict) -> Optional[int]:
+        if room_id in self.rooms:
+            return None
+        version = next(self._versions)
+        self.rooms[room_id] = StoredRoom(version, state)
+        return version
+
+    async def mutate(self, room_id: str, mutator: Mutator) -> Optional[StoredRoom]:
+        stored = self.rooms.get(room_id)
+        if stored is None:
+            return None
+        # await 없이 실행되므로 이벤트 루프 안에서 원자적
+        if mutator(stored.state) is False:
+            return stored
+        stored = self.rooms[room_id] = StoredRoom(next(self._versions), stored.state)
+        return stored
+
+    async def delete(self, room_id: str) -> bool:
+        return self.rooms.pop(room_id, None) is not None
+
+class SqliteRoomStore(RoomStore):
+    durable = True
+
+    def __init__(self, namespace: str, hub_path: str):
+        self.namespace = namespace
+        self.engine = engine
+        self.metadata = metadata
+        self.hub_path = hub_path
+        self.hub: Optional[LocalHub] = None
+        self.on_change: Optional[ChangeHandler] = None
+        self.states = room_state_table(metadata)
+        self.counter = room_version_table(metadata)
+
+    async def start(self, on_change: Optional[ChangeHandler] = None):
+        await self._create_tables()
+        self.on_change = on_change
+        if on_change is not None:
+            self.hub = LocalHub(f"{self.hub_path}.{self.namespace}", self._handle_notification)
+            await self.hub.start()
+
+    async def close(self):
+        if self.hub is not None:
+            await self.hub.close()
+
+    def publish(self, room_id: str, event: str):
+        if self.hub is not None:
+            self.hub.publish({"room_id": room_id, "event": event, "pid": os.getpid()})
+
+    async def _handle_notification(self, message: Dict):
+        await self.on_change(message["room_id"], message["event"])
+
+    async def _create_tables(self):
+        # 워커들이 동시에 시작하므로 테이블 생성도 쓰기 트랜잭션 안에서 직렬화
+        async with write_transaction() as conn:
+            await conn.run_sync(self.metadata.create_all, tables=[self.states, self.counter])
+            if (await conn.execute(self.counter.select())).first() is None:
+                await conn.execute(self.counter.insert().values(id=1, value=0))
+
+    def write(self):
+        return write_transaction()
+
+    async def seed(self, version: int):
+        async with self.write() as conn:
+            await conn.execute(self.counter.update().where(self.counter.c.value < version).values(value=version))
+
+    async def _next_version(self, conn) -> int:
+        result = await conn.execute(
+            self.counter.update().values(value=self.counter.c.value + 1).returning(self.counter.c.value)
+        )
+        return result.scalar_one()
+
+    def _where(self, room_id: str):
+        return (self.states.c.namespace == self.namespace) & (self.states.c.room_id == room_id)
+
+    async def get(self, room_id: str) -> Optional[StoredRoom]:
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(
+                self.states.select().with_only_columns(self.states.c.version, self.states.c.state).where(self._where(room_id))
+            )).first()
+        return StoredRoom(row.version, json.loads(row.state)) if row else None
+
+    async def load_all(self) -> Dict[str, StoredRoom]:
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(self.states.select().where(self.states.c.namespace == self.namespace))).all()
+        return {row.room_id: StoredRoom(row.version, json.loads(row.state)) for row in rows}
+
+    async def create(self, room_id: str, state: Dict) -> Optional[int]:
+        async with self.write() as conn:
+            exists = (await conn.execute(self.states.select().where(self._where(room_id)))).first()
+            if exists:
+                return None
+            version = await self._next_version(conn)
+            await conn.execute(self.states.insert().values(
+                namespace=self.namespace, room_id=room_id, version=version, state=json.dumps(state),
+            ))
+        return version
+
+    async def mutate(self, room_id: str, mutator: Mutator) -> Optional[StoredRoom]:
+        async with self.write() as conn:
+            row = (await conn.execute(
+                self.states.select().with_only_columns(self.states.c.version, self.states.c.state).where(self._where(room_id))
+            )).first()
+            if row is None:
+                return None
+            state = json.loads(row.state)
+            if mutator(state) is False:
+                return StoredRoom(row.version, state)
+            version = await self._next_version(conn)
+            await conn.execute(self.states.update().where(self._where(room_id)).values(version=version, state=json.dumps(state)))
+        return StoredRoom(version, state)
+
+    async def delete(self, room_id: str) -> bool:
+        async with self.write() as conn:
+            return (await conn.execute(self.states.delete().where(self._where(room_id)))).rowcount > 0
+
+def room_state_table(metadata) -> Table:
+    if "room_states" in metadata.tables:
+        return metadata.tables["room_states"]
+    return Table(
+        "room_states", metadata,
+        Column("namespace", String, primary_key=True),
+        Column("room_id", String, primary_key=True),
+        Column("version", Integer, nullable=False),
+        Column("state", Text, nullable=False),
+    )
+
+def room_version_table(metadata) -> Table:
+    if "room_version_counter" in metadata.tables:
+        return metadata.tables["room_version_counter"]
+    return Table(
+        "room_version_counter", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("value", Integer, nullable=False),
+    )
+
+def create_room_store(namespace: str) -> RoomStore:
+    """
+    ROOM_STORE=sqlite 이면 워커 간 공유 저장소, 아니면 메모리 저장소
+    """
+    if os.getenv("ROOM_STORE", "memory") == "sqlite":
+        return SqliteRoomStore(namespace, os.getenv("ROOM_HUB_PATH", "/tmp/gom-room-hub.sock"))
+    return InMemoryRoomStore(namespace)
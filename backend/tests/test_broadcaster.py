@@ -0,0 +1,141 @@
+# tests/test_broadcaster.py
+import asyncio
+
+from rooms.broadcaster import RoomBroadcaster
+
+
+class Room:
+    """
+    브로드캐스터가 전송 시점에 읽는 방 상태와 실제로 전송된 상태 기록
+    """
+    def __init__(self, send_delay: float = 0.0):
+        self.state = 0
+        self.sent = []
+        self.send_delay = send_delay
+        self.sending = asyncio.Event()  # 전송이 시작되면 세워짐
+        self.release = asyncio.Event()  # 세워질 때까지 전송이 끝나지 않음
+        self.release.set()
+
+    async def send(self, room_id: str):
+        state = self.state  # 실제 broadcast_room_state처럼 전송 시점의 최신 상태를 읽음
+        self.sending.set()
+        await self.release.wait()
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.sent.append(state)
+
+    def update(self, broadcaster: RoomBroadcaster):
+        self.state += 1
+        broadcaster.mark_dirty()
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_burst_is_coalesced_into_one_send():
+    async def scenario():
+        room = Room()
+        broadcaster = RoomBroadcaster("r1", room.send)
+        for _ in range(10):
+            room.update(broadcaster)
+        await settle()
+        await broadcaster.close()
+        return room, broadcaster
+
+    room, broadcaster = asyncio.run(scenario())
+    assert room.sent == [10]
+    assert broadcaster.stats() == {"updates": 10, "sent": 1, "coalesced": 9, "dropped": 0}
+
+
+def test_window_merges_updates_and_delivers_latest_state():
+    async def scenario():
+        room = Room()
+        broadcaster = RoomBroadcaster("r1", room.send, window=0.05)
+        room.update(broadcaster)
+        await asyncio.sleep(0.01)
+        room.update(broadcaster)
+        room.update(broadcaster)
+        await asyncio.sleep(0.1)
+        await broadcaster.close()
+        return room, broadcaster
+
+    room, broadcaster = asyncio.run(scenario())
+    assert room.sent == [3]
+    assert broadcaster.sent == 1
+    assert broadcaster.coalesced == 2
+
+
+def test_updates_during_send_trigger_another_send_in_order():
+    async def scenario():
+        room = Room()
+        broadcaster = RoomBroadcaster("r1", room.send)
+        room.release.clear()
+        room.update(broadcaster)
+        await room.sending.wait()  # 첫 전송이 상태 1을 읽고 멈춤
+        for _ in range(5):
+            room.update(broadcaster)  # 전송 도중 들어온 변경
+        room.release.set()
+        await settle()
+        await broadcaster.close()
+        return room, broadcaster
+
+    room, broadcaster = asyncio.run(scenario())
+    assert room.sent == [1, 6]  # 중간 상태는 건너뛰고 마지막 상태는 반드시 전달
+    assert broadcaster.stats() == {"updates": 6, "sent": 2, "coalesced": 4, "dropped": 0}
+
+
+def test_sent_states_are_monotonic_and_final_state_arrives():
+    async def scenario():
+        room = Room(send_delay=0.001)
+        broadcaster = RoomBroadcaster("r1", room.send)
+        for _ in range(200):
+            room.update(broadcaster)
+            if room.state % 7 == 0:
+                await asyncio.sleep(0.0005)
+        while broadcaster.sent == 0 or room.sent[-1] != room.state:
+            await asyncio.sleep(0.001)
+        await broadcaster.close()
+        return room, broadcaster
+
+    room, broadcaster = asyncio.run(scenario())
+    assert room.sent == sorted(set(room.sent))
+    assert room.sent[-1] == 200
+    assert broadcaster.updates == broadcaster.sent + broadcaster.coalesced
+
+
+def test_failed_send_does_not_stop_later_broadcasts():
+    async def scenario():
+        sent = []
+
+        async def send(room_id: str):
+            if not sent:
+                sent.append("failed")
+                raise RuntimeError("socket gone")
+            sent.append("ok")
+
+        broadcaster = RoomBroadcaster("r1", send)
+        broadcaster.mark_dirty()
+        await settle()
+        broadcaster.mark_dirty()
+        await settle()
+        await broadcaster.close()
+        return sent
+
+    assert asyncio.run(scenario()) == ["failed", "ok"]
+
+
+def test_close_counts_pending_updates_as_dropped():
+    async def scenario():
+        room = Room()
+        broadcaster = RoomBroadcaster("r1", room.send, window=1.0)
+        room.update(broadcaster)
+        room.update(broadcaster)
+        await asyncio.sleep(0)
+        await broadcaster.close()
+        return room, broadcaster
+
+    room, broadcaster = asyncio.run(scenario())
+    assert room.sent == []
+    assert broadcaster.dropped == 2
@@ -0,0 +1,48 @@
+# tests/test_simulator.py
+import numpy as np
+import pytest
+
+from games.game_1.logic import CARD_MAX, CARD_MIN, handle_action, reveal_winner
+from games.game_1.simulator import CARDS, STRATEGIES, deal, equity_table, simulate, simulate_scalar
+from games.game_1.state import Seat, TableState
+
+
+def respond_through_engine(visible: int, own: int, bet: int, action: str) -> int:
+    """
+    선 플레이어(카드 visible)가 bet 한 뒤 후 플레이어(카드 own)가 call / fold 했을 때 후 플레이어의 손익
+    (무승부로 넘어간 팟은 절반을 돌려받는 것으로 계산)
+    """
+    bettor, responder = Seat("A", 30, visible), Seat("B", 30, own)
+    state = TableState(seats=[bettor, responder])
+    assert handle_action(state, 0, "bet", bet) is None
+    assert handle_action(state, 1, action) is None
+    carried = 0
+    if state.winner is None and reveal_winner(state) is None:
+        carried = state.pot // 2
+    return responder.chips - 30 + carried
+
+
+@pytest.mark.parametrize("bet", [1, 2, 5, 30])
+def test_equity_table_matches_engine(bet):
+    table = equity_table()
+    for row, visible in enumerate(CARDS):
+        calls = [respond_through_engine(int(visible), own, bet, "call") for own in range(CARD_MIN, CARD_MAX + 1)]
+        folds = [respond_through_engine(int(visible), own, bet, "fold") for own in range(CARD_MIN, CARD_MAX + 1)]
+        assert table["ev_call"][row, bet] == pytest.approx(np.mean(calls))
+        assert table["ev_fold"][row] == pytest.approx(np.mean(folds))
+
+
+def test_equity_probabilities():
+    table = equity_table()
+    assert np.allclose(table["win"] + table["tie"] + table["lose"], 1)
+    assert table["win"][0] == 0.9 and table["lose"][-1] == 0.9
+    assert np.allclose(table["tie"], 0.1)
+
+
+@pytest.mark.parametrize("first", sorted(STRATEGIES))
+@pytest.mark.parametrize("second", sorted(STRATEGIES))
+def test_vectorized_simulation_matches_engine(first, second):
+    cards = deal(np.random.default_rng(0), 2000)
+    vectorized = simulate(STRATEGIES[first](), STRATEGIES[second](), 2000, cards=cards)["net"]
+    scalar = simulate_scalar(STRATEGIES[first](), STRATEGIES[second](), 2000, cards=cards)
+    assert vectorized.tolist() == scalar
@@ -0,0 +1,330 @@
+# tests/test_timers.py
+import asyncio
+import json
+
+import pytest
+
+from core.timers import TimerWheel
+from games.game_1 import engine
+from games.game_1.engine import TURN_TIMEOUT, TableActor
+from games.game_1.logic import initialize_game
+from rooms import routes
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def wheel(clock):
+    return TimerWheel(clock=clock)
+
+
+def run(wheel, clock, seconds):
+    """
+    가상 시계를 seconds초 앞으로 옮기고 휠을 돌림
+    """
+    clock.now += seconds
+    return wheel.advance()
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+# TimerWheel
+
+def test_timers_fire_in_expiry_order_on_their_tick(wheel, clock):
+    fired = []
+    for name, delay in [("c", 0.35), ("a", 0.05), ("d", 2.0), ("b", 0.2)]:
+        wheel.schedule(delay, lambda name: fired.append((name, wheel.current)), name)
+
+    assert run(wheel, clock, 0.1) == 1
+    assert fired == [("a", 1)]
+    run(wheel, clock, 5)
+    assert fired == [("a", 1), ("b", 2), ("c", 4), ("d", 20)]
+    assert wheel.pending == 0
+
+
+def test_timers_never_fire_early(wheel, clock):
+    fired = []
+    wheel.schedule(1.0, fired.append, "x")
+
+    run(wheel, clock, 0.95)
+    assert fired == []
+    run(wheel, clock, 0.05)
+    assert fired == ["x"]
+
+
+def test_cancelled_timer_does_not_fire(wheel, clock):
+    fired = []
+    keep = wheel.schedule(0.5, fired.append, "keep")
+    drop = wheel.schedule(0.5, fired.append, "drop")
+    wheel.cancel(drop)
+    wheel.cancel(drop)  # 두 번 취소해도 pending은 한 번만 줄어듦
+
+    assert wheel.pending == 1
+    run(wheel, clock, 1)
+    assert fired == ["keep"]
+    assert keep.cancelled
+    assert wheel.pending == 0
+
+
+def test_long_timers_cascade_down_to_their_exact_tick(wheel, clock):
+    # 0단(25.6초), 1단(27분), 2단(29시간)과 그보다 먼 타이머
+    delays = [30.0, 25.7, 1800.0, 7 * 3600.0, 40 * 3600.0]
+    fired = []
+    for delay in delays:
+        wheel.schedule(delay, lambda delay: fired.append((delay, wheel.current)), delay)
+
+    for _ in range(50):
+        run(wheel, clock, 3600)
+    assert fired == [(delay, round(delay / wheel.tick)) for delay in sorted(delays)]
+
+
+def test_cancelled_timer_is_dropped_during_cascade(wheel, clock):
+    fired = []
+    timer = wheel.schedule(1800.0, fired.append, "late")
+    run(wheel, clock, 900)
+    wheel.cancel(timer)
+    run(wheel, clock, 1800)
+    assert fired == []
+    assert wheel.pending == 0
+
+
+def test_failing_callback_does_not_stop_the_tick(wheel, clock):
+    fired = []
+    wheel.schedule(0.1, lambda: 1 / 0)
+    wheel.schedule(0.1, fired.append, "after")
+    assert run(wheel, clock, 0.1) == 2
+    assert fired == ["after"]
+
+
+# TableActor 차례 제한 시간
+
+@pytest.fixture
+def table_timers(monkeypatch, wheel):
+    monkeypatch.setattr(engine, "timers", wheel)
+    return wheel
+
+
+def open_actor(published):
+    async def publish(room_id, state, base):
+        published.append(state)
+    return TableActor("timer-table", initialize_game(["a", "b"]), publish)
+
+
+def test_turn_timeout_checks_when_pot_is_empty(table_timers, clock):
+    async def scenario():
+        published = []
+        actor = open_actor(published)
+        actor.arm_turn_timer()
+
+        run(table_timers, clock, TURN_TIMEOUT - 1)
+        await settle()
+        assert actor.state.current_turn == 0
+
+        run(table_timers, clock, 1)
+        await settle()
+        assert actor.state.current_turn == 1
+        assert actor.state.pot == 0
+        assert actor.timeouts == 1
+        assert len(published) == 1
+        assert actor.turn_timer is not None  # 다음 차례의 제한 시간
+    asyncio.run(scenario())
+
+
+def test_turn_timeout_folds_when_pot_has_bets(table_timers, clock):
+    async def scenario():
+        published = []
+        actor = open_actor(published)
+        assert (await actor.submit(0, "bet", 2)).error is None
+
+        run(table_timers, clock, TURN_TIMEOUT)
+        await settle()
+        assert actor.state.winner == "a"
+        assert actor.state.round_completed
+        assert actor.turn_timer is None  # 판이 끝나면 다음 판까지 제한 시간 없음
+    asyncio.run(scenario())
+
+
+def test_turn_timeout_is_ignored_once_the_turn_moved_on(table_timers, clock):
+    async def scenario():
+        actor = open_actor([])
+        round_, turn = actor.state.game_round, actor.state.current_turn
+        await actor.submit(0, "check", 0)
+
+        actor.turn_expired(round_, turn)  # 이미 지나간 차례
+        actor.turn_expired(round_ + 1, actor.state.current_turn)  # 다른 판
+        await settle()
+        assert actor.state.current_turn == 1
+        assert actor.timeouts == 0
+    asyncio.run(scenario())
+
+
+def test_turn_timer_stops_after_every_seat_timed_out(table_timers, clock):
+    async def scenario():
+        actor = open_actor([])
+        actor.arm_turn_timer()
+        for _ in range(len(actor.state.seats)):
+            run(table_timers, clock, TURN_TIMEOUT)
+            await settle()
+        assert actor.timeouts == 2
+        assert actor.turn_timer is None
+        assert table_timers.pending == 0
+    asyncio.run(scenario())
+
+
+# 유휴 방 정리와 heartbeat
+
+@pytest.fixture
+def room_timers(monkeypatch, wheel):
+    monkeypatch.setattr(routes, "timers", wheel)
+    return wheel
+
+
+async def open_room(room_id):
+    state = {
+        "room_id": room_id,
+        "game_type": "idle-test",
+        "players": [{"player_name": "a"}],
+        "game_started": False,
+        "game_state": {},
+        "status": "waiting",
+    }
+    version = await routes.store.create(room_id, state)
+    routes.update_room_state(room_id, state, version)
+    return state, version
+
+
+def test_idle_room_is_evicted_after_ttl(room_timers, clock):
+    async def scenario():
+        await open_room("idle-room")
+        run(room_timers, clock, routes.ROOM_IDLE_TTL - 1)
+        await settle()
+        assert "idle-room" in routes.rooms
+
+        run(room_timers, clock, 1)
+        await settle()
+        assert "idle-room" not in routes.rooms
+        assert "idle-room" not in routes.room_idle_timers
+        assert await routes.store.get("idle-room") is None
+    asyncio.run(scenario())
+
+
+def test_idle_timer_is_rescheduled_after_activity(room_timers, clock):
+    async def scenario():
+        state, version = await open_room("busy-room")
+        run(room_timers, clock, routes.ROOM_IDLE_TTL / 2)
+        routes.update_room_state("busy-room", state, version + 1)
+
+        run(room_timers, clock, routes.ROOM_IDLE_TTL / 2)
+        await settle()
+        assert "busy-room" in routes.rooms  # 마지막 변경에서 TTL만큼 남은 시간으로 다시 예약
+        assert "busy-room" in routes.room_idle_timers
+
+        run(room_timers, clock, routes.ROOM_IDLE_TTL / 2)
+        await settle()
+        assert "busy-room" not in routes.rooms
+    asyncio.run(scenario())
+
+
+def test_room_with_connections_is_kept(room_timers, clock):
+    async def scenario():
+        await open_room("watched-room")
+        routes.connections["watched-room"] = [object()]
+        try:
+            run(room_timers, clock, routes.ROOM_IDLE_TTL * 3)
+            await settle()
+            assert "watched-room" in routes.rooms
+        finally:
+            routes.connections.pop("watched-room", None)
+        run(room_timers, clock, routes.ROOM_IDLE_TTL)
+        await settle()
+        assert "watched-room" not in routes.rooms
+    asyncio.run(scenario())
+
+
+def test_connected_worker_reports_activity(room_timers, clock, monkeypatch):
+    async def scenario():
+        published = []
+        monkeypatch.setattr(routes.store, "publish", lambda room_id, event: published.append((room_id, event)))
+        await open_room("shared-room")
+        routes.connections["shared-room"] = [object()]
+        try:
+            run(room_timers, clock, routes.ROOM_IDLE_TTL)
+            await settle()
+        finally:
+            routes.connections.pop("shared-room", None)
+        assert published.count(("shared-room", "active")) == 2  # TTL 안에 적어도 한 번은 알림
+        await routes.remove_room("shared-room")
+    asyncio.run(scenario())
+
+
+def test_room_connected_on_another_worker_is_kept(room_timers, clock):
+    async def scenario():
+        await open_room("remote-room")
+        for _ in range(6):
+            run(room_timers, clock, routes.IDLE_CHECK_INTERVAL)
+            await routes.on_store_change("remote-room", "active")  # 연결을 가진 다른 워커의 알림
+            await settle()
+            assert "remote-room" in routes.rooms
+
+        run(room_timers, clock, routes.ROOM_IDLE_TTL)
+        await settle()
+        assert "remote-room" not in routes.rooms
+    asyncio.run(scenario())
+
+
+class QuietSocket:
+    def __init__(self):
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+def test_heartbeat_pings_quiet_socket_then_evicts_it(room_timers, clock):
+    async def scenario():
+        socket = QuietSocket()
+        routes.start_heartbeat(None, socket)
+
+        run(room_timers, clock, routes.HEARTBEAT_INTERVAL)
+        await settle()
+        assert [json.loads(message) for message in socket.sent] == [{"type": "ping"}]
+        assert socket.close_code is None
+
+        run(room_timers, clock, routes.HEARTBEAT_INTERVAL)
+        await settle()
+        assert socket not in routes.socket_seen
+        assert socket not in routes.heartbeat_timers
+        assert socket.close_code is not None
+    asyncio.run(scenario())
+
+
+def test_heartbeat_skips_ping_for_active_socket(room_timers, clock):
+    async def scenario():
+        socket = QuietSocket()
+        routes.start_heartbeat(None, socket)
+        for _ in range(4):
+            run(room_timers, clock, routes.HEARTBEAT_INTERVAL / 2)
+            routes.socket_seen[socket] = room_timers.now()  # 메시지를 받을 때마다 갱신되는 시각
+            await settle()
+        assert socket.sent == []
+        routes.stop_heartbeat(socket)
+        assert room_timers.pending == 0
+    asyncio.run(scenario())
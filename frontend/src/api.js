@@ -1,4 +1,5 @@
 // src/api.js
+import { ROOM_PROTOCOLS, decodeFrame } from "./msgpack";
 
 const API_URL = "http://127.0.0.1:8000";
 
@@ -19,15 +20,58 @@ async function safeFetch(url, options = {}) {
 }
 
 // 방 목록 가져오기
-export async function fetchRooms() {
+// (서버는 페이지 단위로 응답하고 다음 페이지 커서를 X-Next-Cursor 헤더로 알려줌)
+export async function fetchRooms(filters = {}) {
   try {
-    return await safeFetch(`${API_URL}/room/`);
+    const rooms = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams(filters);
+      if (cursor) params.set("cursor", cursor);
+      const response = await fetch(`${API_URL}/room/?${params}`);
+      if (!response.ok) throw new Error(`HTTP error: ${response.status}`);
+      rooms.push(...(await response.json()));
+      cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+    return rooms;
   } catch (err) {
     console.error("Failed to fetch rooms:", err.message);
     throw err;
   }
 }
 
+// 로비 구독: 접속 시 전체 목록을 받고 이후에는 변경분만 받아 onRooms(방 목록)를 호출
+export function connectToLobby(onRooms, onClose) {
+  const rooms = new Map();
+  const socket = new WebSocket(`ws://127.0.0.1:8000/room/lobby/ws`);
+
+  socket.onmessage = (event) => {
+    const data = JSON.parse(event.data);
+    if (data.type === "ping") {
+      socket.send(JSON.stringify({ type: "pong" }));
+      return;
+    }
+    if (data.type === "lobby-snapshot") {
+      rooms.clear();
+      for (const room of data.rooms) rooms.set(room.room_id, room);
+    } else if (data.type === "room-added" || data.type === "room-changed") {
+      rooms.set(data.room.room_id, data.room);
+    } else if (data.type === "room-removed") {
+      rooms.delete(data.room_id);
+    } else {
+      return;
+    }
+    onRooms([...rooms.values()]);
+  };
+
+  socket.onclose = (event) => {
+    console.log("Lobby WebSocket closed:", event.reason);
+    if (onClose) onClose(event);
+  };
+
+  return socket;
+}
+
 // 방 생성하기
 export async function createRoom(data) {
   try {
@@ -42,6 +86,30 @@ export async function createRoom(data) {
   }
 }
 
+// 자동 매칭: 비슷한 칩의 상대를 찾을 때까지 기다렸다가 두 사람이 앉은 방을 반환 (시간 초과 시 408)
+export async function findMatch(playerName, gameType, chips) {
+  try {
+    return await safeFetch(`${API_URL}/room/match`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ player_name: playerName, game_type: gameType, chips }),
+    });
+  } catch (err) {
+    console.error("Failed to find a match:", err.message);
+    throw err;
+  }
+}
+
+// 매칭 대기 취소
+export async function cancelMatch(playerName) {
+  try {
+    return await safeFetch(`${API_URL}/room/match/${encodeURIComponent(playerName)}`, { method: "DELETE" });
+  } catch (err) {
+    console.error("Failed to cancel matchmaking:", err.message);
+    throw err;
+  }
+}
+
 // 방에 참여하기
 export async function joinRoom(roomId, playerName) {
   try {
@@ -56,10 +124,11 @@ export async function joinRoom(roomId, playerName) {
   }
 }
 
-// 특정 방의 상태 가져오기
-export async function getRoomState(roomId) {
+// 특정 방의 상태 가져오기 (playerName을 주면 그 플레이어의 보기, 아니면 진행 중인 판의 카드가 가려진 관전자 보기)
+export async function getRoomState(roomId, playerName = null) {
   try {
-    return await safeFetch(`${API_URL}/room/${roomId}`);
+    const query = playerName ? `?player=${encodeURIComponent(playerName)}` : "";
+    return await safeFetch(`${API_URL}/room/${roomId}${query}`);
   } catch (err) {
     console.error(`Failed to fetch state for room ${roomId}:`, err.message);
     throw err;
@@ -78,43 +147,122 @@ export async function deleteRoom(roomId) {
   }
 }
 
-// 게임 시작하기
-export async function startGame() {
+// 게임 시작하기 (roomId 없이 호출하면 기존 단일 테이블 "game_1")
+export async function startGame(roomId = "game_1") {
   return await safeFetch(`${API_URL}/game_1/start_game`, {
     method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ room_id: roomId }),
   });
 }
 
 // 플레이어의 행동 (check, bet, fold 등)
-export async function playerAction(action, betAmount = 0) {
+export async function playerAction(action, betAmount = 0, roomId = "game_1", playerIndex = 0) {
   return await safeFetch(`${API_URL}/game_1/player_action`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ action, bet_amount: betAmount }),
+    body: JSON.stringify({ room_id: roomId, player_index: playerIndex, action, bet_amount: betAmount }),
   });
 }
 
 // 라운드 후 카드 공개
-export async function revealCards() {
+export async function revealCards(roomId = "game_1") {
   return await safeFetch(`${API_URL}/game_1/reveal_cards`, {
     method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ room_id: roomId }),
   });
 }
 
+// 방 WebSocket으로 게임 행동 보내기 (결과는 방 상태 브로드캐스트로 도착)
+export function sendRoomAction(socket, playerName, action, amount = 0) {
+  socket.send(JSON.stringify({ type: "action", player: playerName, action, amount }));
+}
+
+// 방마다 마지막으로 받은 seq와 상태 (재접속 시 놓친 delta만 받기 위해 유지)
+const roomStreams = {};
+
+// JSON Patch(add / remove / replace) 적용
+function applyPatch(state, ops) {
+  for (const op of ops) {
+    const keys = op.path
+      .split("/")
+      .slice(1)
+      .map((key) => key.replace(/~1/g, "/").replace(/~0/g, "~"));
+    if (keys.length === 0) {
+      state = op.value;
+      continue;
+    }
+    let target = state;
+    for (const key of keys.slice(0, -1)) {
+      target = target[key];
+    }
+    const last = keys[keys.length - 1];
+    if (op.op === "remove") {
+      if (Array.isArray(target)) target.splice(Number(last), 1);
+      else delete target[last];
+    } else {
+      target[last] = op.value;
+    }
+  }
+  return state;
+}
+
 // WebSocket 연결 함수
-export function connectToRoom(roomId, onMessage, onOpen, onClose, onError) {
-  const socket = new WebSocket(`ws://127.0.0.1:8000/room/${roomId}/ws`);
+// 서버는 snapshot / patch 메시지를 보내고, onMessage에는 항상 전체 방 상태를 전달
+// role이 "spectator"면 관전자로 접속 (행동을 보낼 수 없고, 라운드가 끝나기 전에는 카드가 가려짐)
+// playerName으로 접속하면 그 플레이어의 보기 (자기 카드만 가려짐), 이름 없이 접속하면 관전자와 같은 상태를 받음
+export function connectToRoom(roomId, onMessage, onOpen, onClose, onError, role = "player", playerName = null) {
+  const key = `${roomId}:${role}:${playerName ?? ""}`; // 보기마다 seq가 따로 매겨짐
+  const stream = roomStreams[key];
+  const params = new URLSearchParams();
+  if (stream) params.set("since", stream.seq);
+  if (role !== "player") params.set("role", role);
+  if (playerName && role === "player") params.set("player", playerName);
+  const query = params.size ? `?${params}` : "";
+  // 서버가 msgpack 프로토콜을 고르면 바이너리 프레임, 아니면 기존처럼 JSON 텍스트를 받음
+  const socket = new WebSocket(`ws://127.0.0.1:8000/room/${roomId}/ws${query}`, ROOM_PROTOCOLS);
+  socket.binaryType = "arraybuffer";
+  let inbox = Promise.resolve(); // 압축 해제가 비동기라 도착 순서대로 처리하도록 이어 붙임
 
   socket.onopen = () => {
-    console.log("Connected to WebSocket for room:", roomId);
+    console.log("Connected to WebSocket for room:", roomId, socket.protocol || "json");
     if (onOpen) onOpen(socket);
   };
 
   socket.onmessage = (event) => {
-    const data = JSON.parse(event.data);
-    if (onMessage) onMessage(data);
+    inbox = inbox
+      .then(() => decodeFrame(event.data))
+      .then(handleMessage)
+      .catch((err) => console.error("Failed to handle room message:", err));
   };
 
+  function handleMessage(data) {
+    if (data.type === "ping") {
+      socket.send(JSON.stringify({ type: "pong" })); // 서버 heartbeat 응답
+      return;
+    }
+    if (data.type === "snapshot") {
+      roomStreams[key] = { seq: data.seq, state: data.state };
+    } else if (data.type === "patch") {
+      const current = roomStreams[key];
+      if (!current || current.seq !== data.base) {
+        // 중간 delta를 놓침 → 재접속해서 다시 따라잡기
+        socket.close();
+        return;
+      }
+      roomStreams[key] = {
+        seq: data.seq,
+        state: applyPatch(structuredClone(current.state), data.ops),
+      };
+    } else {
+      if (data.type === "room_deleted") delete roomStreams[key];
+      if (onMessage) onMessage(data);
+      return;
+    }
+    if (onMessage) onMessage(roomStreams[key].state);
+  }
+
   socket.onclose = (event) => {
     console.log("WebSocket connection closed:", event.reason);
     if (onClose) onClose(event);
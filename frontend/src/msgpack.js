@@ -0,0 +1,81 @@
+// src/msgpack.js
+// 방 WebSocket 바이너리 프로토콜 디코더 (서버 rooms/codec.py 참고)
+// 프레임 = 플래그 1바이트(0: 그대로, 1: raw deflate) + msgpack
+
+// 압축 해제를 지원하는 브라우저만 deflate 프로토콜을 요청
+export const ROOM_PROTOCOLS =
+  typeof DecompressionStream !== "undefined"
+    ? ["gom.msgpack.deflate.v1", "gom.msgpack.v1", "gom.json.v1"]
+    : ["gom.msgpack.v1", "gom.json.v1"];
+
+const textDecoder = new TextDecoder();
+
+// 텍스트 프레임은 JSON, 바이너리 프레임은 msgpack
+export async function decodeFrame(data) {
+  if (typeof data === "string") return JSON.parse(data);
+  let body = new Uint8Array(data, 1);
+  if (new Uint8Array(data, 0, 1)[0] === 1) {
+    const stream = new Blob([body]).stream().pipeThrough(new DecompressionStream("deflate-raw"));
+    body = new Uint8Array(await new Response(stream).arrayBuffer());
+  }
+  return unpack(body);
+}
+
+export function unpack(bytes) {
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  let offset = 0;
+
+  function str(length) {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+    offset += length;
+    return value;
+  }
+  function array(length) {
+    const value = new Array(length);
+    for (let i = 0; i < length; i++) value[i] = read();
+    return value;
+  }
+  function map(length) {
+    const value = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      value[key] = read();
+    }
+    return value;
+  }
+  function read() {
+    const type = bytes[offset++];
+    if (type <= 0x7f) return type; // positive fixint
+    if (type <= 0x8f) return map(type & 0x0f);
+    if (type <= 0x9f) return array(type & 0x0f);
+    if (type <= 0xbf) return str(type & 0x1f);
+    if (type >= 0xe0) return type - 0x100; // negative fixint
+    let value;
+    switch (type) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xca: value = view.getFloat32(offset); offset += 4; return value;
+      case 0xcb: value = view.getFloat64(offset); offset += 8; return value;
+      case 0xcc: return bytes[offset++];
+      case 0xcd: value = view.getUint16(offset); offset += 2; return value;
+      case 0xce: value = view.getUint32(offset); offset += 4; return value;
+      case 0xcf: value = Number(view.getBigUint64(offset)); offset += 8; return value;
+      case 0xd0: value = view.getInt8(offset); offset += 1; return value;
+      case 0xd1: value = view.getInt16(offset); offset += 2; return value;
+      case 0xd2: value = view.getInt32(offset); offset += 4; return value;
+      case 0xd3: value = Number(view.getBigInt64(offset)); offset += 8; return value;
+      case 0xd9: return str(bytes[offset++]);
+      case 0xda: value = view.getUint16(offset); offset += 2; return str(value);
+      case 0xdb: value = view.getUint32(offset); offset += 4; return str(value);
+      case 0xdc: value = view.getUint16(offset); offset += 2; return array(value);
+      case 0xdd: value = view.getUint32(offset); offset += 4; return array(value);
+      case 0xde: value = view.getUint16(offset); offset += 2; return map(value);
+      case 0xdf: value = view.getUint32(offset); offset += 4; return map(value);
+      default:
+        throw new Error(`Unsupported msgpack type 0x${type.toString(16)}`);
+    }
+  }
+
+  return read();
+}